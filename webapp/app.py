@@ -9,7 +9,7 @@ from config.database import config
 from routes.main_routes import main_bp
 from routes.api_routes import api_bp
 from routes.export_routes import export_bp
-from services.database_service import start_scheduled_reload
+from services.database_service import start_scheduled_reload, release_request_snapshot
 
 def create_app(config_name='default'):
     """Application factory pattern"""
@@ -24,6 +24,9 @@ def create_app(config_name='default'):
     app.register_blueprint(api_bp)
     app.register_blueprint(export_bp)
     
+    # Unpin the cache snapshot a request read from, so superseded versions can be freed
+    app.teardown_request(release_request_snapshot)
+    
     return app
 
 # Create application instance
@@ -38,15 +41,29 @@ if __name__ == '__main__':
     print("   🔌 API endpoints: /api/...")
     print("   📤 Export endpoints: /api/export-...")
 
+    # Warm start: restore the last on-disk cache snapshot (seconds instead of a full DB pull)
+    from services.database_service import restore_snapshot
+    try:
+        restored = restore_snapshot()
+    except Exception as e:
+        print(f"⚠️ Snapshot restore failed: {e}")
+        restored = False
+
     # Optional: Load database cache on startup (AUTO_LOAD_ON_STARTUP=1)
+    # After a snapshot restore the database refresh always follows.
     # Runs in background thread so server starts immediately
-    if os.getenv('AUTO_LOAD_ON_STARTUP', '0').strip().lower() in ('1', 'true', 'yes'):
+    if restored or os.getenv('AUTO_LOAD_ON_STARTUP', '0').strip().lower() in ('1', 'true', 'yes'):
         import threading
-        from services.database_service import load_dataframes
+        from config.database import INCREMENTAL_RELOAD
+        from services.database_service import load_dataframes, refresh_dataframes_incremental
         def _startup_load():
             try:
-                print("📊 Auto-load on startup: loading database cache...")
-                load_dataframes()
+                if restored and INCREMENTAL_RELOAD:
+                    print("📊 Refreshing restored snapshot from the database...")
+                    refresh_dataframes_incremental()
+                else:
+                    print("📊 Auto-load on startup: loading database cache...")
+                    load_dataframes()
                 print("✅ Startup load completed")
             except Exception as e:
                 print(f"⚠️ Startup load failed: {e}")
@@ -0,0 +1,6 @@
+# Offline benchmarks against a local SQLite stand-in for InterBase
+#
+#   python -m bench generate --allitem-rows 1M           # build bench_data/standin.db
+#   python -m bench loaders                              # throughput and peak memory per loader strategy
+#
+# Run from the webapp folder. See bench/__main__.py for every option.
@@ -0,0 +1,173 @@
+"""Command line for the offline benchmarks (run from the webapp folder).
+
+    python -m bench generate [--allitem-rows 1M] [--seed 42] [--end-date 2025-06-30] [--db PATH]
+    python -m bench loaders [--db PATH] [--strategies columnar,fetchall] [--tables ALLITEM,ITEMS]
+                            [--repeat 3] [--tracemalloc] [--json results.json]
+    python -m bench reports [--scales 200k,1M] [--reports ciment,sales-int] [--repeat 5] [--no-memory]
+                            [--baseline PATH] [--save-baseline] [--threshold 20] [--json results.json]
+    python -m bench replay [JOURNAL] [--url http://server:5000] [--snapshot-dir DIR | --db PATH]
+                           [--concurrency 8] [--repeat 1] [--endpoints ...] [--no-report-cache] [--json out]
+
+`reports` exits with status 1 when a report failed (non-200), got slower than the baseline by more
+than --threshold %, or its output changed; a run with failed reports is never saved as the baseline.
+
+The default database is SQLITE_DATABASE (bench_data/standin.db).
+"""
+
+import argparse
+import json
+import sys
+from datetime import date
+
+
+def _row_count(text):
+    """'500k', '1M', '50M' or a plain number -> int"""
+    text = text.strip().lower().replace('_', '').replace(',', '')
+    for suffix, factor in (('k', 1_000), ('m', 1_000_000)):
+        if text.endswith(suffix):
+            return int(float(text[:-1]) * factor)
+    return int(text)
+
+
+def _row_counts(text):
+    return [_row_count(part) for part in text.split(',') if part.strip()]
+
+
+def _names(text):
+    return [name.strip() for name in text.split(',') if name.strip()] if text else None
+
+
+def main(argv=None):
+    from config.database import SQLITE_DATABASE, REQUEST_JOURNAL_FILE
+
+    parser = argparse.ArgumentParser(prog='python -m bench', description='Offline loader benchmarks')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    generate = commands.add_parser('generate', help='build the synthetic stand-in database')
+    generate.add_argument('--db', default=SQLITE_DATABASE)
+    generate.add_argument('--allitem-rows', type=_row_count, default=1_000_000,
+                          help='ALLITEM rows (1M-50M); other tables scale with it')
+    generate.add_argument('--seed', type=int, default=42)
+    generate.add_argument('--end-date', type=date.fromisoformat, default=None,
+                          help='last day of generated history (default: today)')
+
+    loaders = commands.add_parser('loaders', help='throughput and peak memory per loader strategy')
+    loaders.add_argument('--db', default=SQLITE_DATABASE)
+    loaders.add_argument('--strategies', type=_names, default=None)
+    loaders.add_argument('--tables', type=_names, default=None, help='tables for per-table strategies')
+    loaders.add_argument('--repeat', type=int, default=3)
+    loaders.add_argument('--tracemalloc', action='store_true',
+                         help='one more run per strategy under tracemalloc (Python allocations; slow)')
+    loaders.add_argument('--json', default=None, help='also write the results to this file')
+
+    reports = commands.add_parser('reports', help='compute/serialize time and peak memory of every report')
+    reports.add_argument('--scales', type=_row_counts, default=None, help='ALLITEM rows per scale (default 200k,1M)')
+    reports.add_argument('--reports', type=_names, default=None)
+    reports.add_argument('--seed', type=int, default=42)
+    reports.add_argument('--end-date', type=date.fromisoformat, default=None)
+    reports.add_argument('--repeat', type=int, default=5)
+    reports.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    reports.add_argument('--baseline', default=None, help='default bench/report_baseline.json')
+    reports.add_argument('--save-baseline', action='store_true', help='store this run as the baseline')
+    reports.add_argument('--threshold', type=float, default=None, help='allowed slowdown in %% (default 20)')
+    reports.add_argument('--json', default=None, help='also write the results to this file')
+
+    replay = commands.add_parser('replay', help='replay the request journal: latency percentiles per endpoint')
+    replay.add_argument('journal', nargs='?', default=REQUEST_JOURNAL_FILE)
+    replay.add_argument('--url', default=None, help='replay against this running server instead of in-process')
+    replay.add_argument('--snapshot-dir', default=None, help='frozen cache snapshot (default SNAPSHOT_DIR)')
+    replay.add_argument('--db', default=None, help='serve from this stand-in database instead of a snapshot')
+    replay.add_argument('--concurrency', type=int, default=8, help='concurrent requests (Waitress threads)')
+    replay.add_argument('--repeat', type=int, default=1, help='replay the journal this many times')
+    replay.add_argument('--endpoints', type=_names, default=None, help='e.g. autonomy-report,ciment-report')
+    replay.add_argument('--limit', type=int, default=None, help='only the newest N journal entries')
+    replay.add_argument('--no-report-cache', action='store_true', help='in-process: REPORT_CACHE_ENTRIES=0')
+    replay.add_argument('--json', default=None, help='also write the results to this file')
+
+    child = commands.add_parser('_child')
+    child_commands = child.add_subparsers(dest='benchmark', required=True)
+    loader_child = child_commands.add_parser('loader')
+    loader_child.add_argument('--strategy', required=True)
+    loader_child.add_argument('--tables', type=_names, required=True)
+    loader_child.add_argument('--trace', action='store_true')
+    reports_child = child_commands.add_parser('reports')
+    reports_child.add_argument('--repeat', type=int, required=True)
+    reports_child.add_argument('--reports', type=_names, default=None)
+    reports_child.add_argument('--trace', action='store_true')
+    replay_child = child_commands.add_parser('replay')
+    replay_child.add_argument('--journal', required=True)
+    replay_child.add_argument('--concurrency', type=int, required=True)
+    replay_child.add_argument('--repeat', type=int, required=True)
+    replay_child.add_argument('--source', choices=('snapshot', 'database'), required=True)
+    replay_child.add_argument('--endpoints', type=_names, default=None)
+    replay_child.add_argument('--limit', type=int, default=None)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'generate':
+        from bench.synthetic import generate as generate_database
+        generate_database(args.db, args.allitem_rows, args.seed, args.end_date)
+    elif args.command == 'loaders':
+        from bench.loader_bench import run_benchmark, format_results
+        results = run_benchmark(args.db, args.strategies, args.tables, args.repeat, args.tracemalloc)
+        print()
+        print(format_results(results))
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(results, f, indent=2)
+    elif args.command == 'reports':
+        from bench import report_bench
+        baseline_path = args.baseline or report_bench.DEFAULT_BASELINE
+        threshold = report_bench.DEFAULT_THRESHOLD_PCT if args.threshold is None else args.threshold
+        result = report_bench.run_benchmark(args.scales or report_bench.DEFAULT_SCALES, args.seed,
+                                            args.end_date or report_bench.DEFAULT_END_DATE, args.repeat,
+                                            not args.no_memory, args.reports)
+        baseline = None if args.save_baseline else report_bench.load_baseline(baseline_path)
+        print(report_bench.format_results(result, baseline))
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(result, f, indent=2)
+        failures = report_bench.failed_reports(result)
+        if failures:
+            print(f"\n❌ {len(failures)} report(s) failed, so their timings mean nothing:")
+            for label, name, status, error in failures:
+                print(f"   {label} {name}: status {status}{' ' + error if error else ''}")
+            return 1
+        if args.save_baseline:
+            report_bench.save_baseline(result, baseline_path)
+            print(f"\n💾 Baseline saved to {baseline_path}")
+        elif baseline is None:
+            print(f"\nℹ️ No baseline at {baseline_path} (store one with --save-baseline)")
+        else:
+            regressions = report_bench.compare(result, baseline, threshold)
+            if regressions:
+                print(f"\n❌ {len(regressions)} regression(s) beyond {threshold:g}% against {baseline_path}:")
+                for label, name, metric, old, new in regressions:
+                    print(f"   {label} {name}: {metric} {old} -> {new}")
+                return 1
+            print(f"\n✅ No report regressed beyond {threshold:g}% against the baseline ({baseline['created']})")
+    elif args.command == 'replay':
+        from bench.replay import run_replay, format_results as format_replay
+        result = run_replay(args.journal, args.url, args.snapshot_dir, args.db, args.concurrency, args.repeat,
+                            args.endpoints, args.limit, not args.no_report_cache)
+        print(format_replay(result))
+        if args.json:
+            with open(args.json, 'w') as f:
+                json.dump(result, f, indent=2)
+    else:
+        from bench.runner import RESULT_PREFIX
+        if args.benchmark == 'loader':
+            from bench.loader_bench import run_child
+            result = run_child(args.strategy, args.tables, args.trace)
+        elif args.benchmark == 'replay':
+            from bench.replay import run_child
+            result = run_child(args.journal, args.concurrency, args.repeat, args.source, args.endpoints, args.limit)
+        else:
+            from bench.report_bench import run_child
+            result = run_child(args.repeat, args.trace, args.reports)
+        print(RESULT_PREFIX + json.dumps(result))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
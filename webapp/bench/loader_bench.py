@@ -0,0 +1,151 @@
+"""Loader benchmark: throughput and peak memory of each loading strategy against the stand-in database.
+
+Every strategy runs in its own Python process (configuration is read at import, and peak
+memory must not include an earlier strategy's leftovers). Each run reports the process peak
+RSS; an optional extra run under tracemalloc separates Python allocations (much slower).
+"""
+
+import os
+import tempfile
+import time as time_module
+import tracemalloc
+from statistics import median
+
+from bench.runner import spawn, peak_rss_mb, wait_for_hooks
+
+# name -> (kind, environment overrides, description)
+# 'table' strategies load each table on its own; 'full' strategies run a cold load and a reload
+STRATEGIES = {
+    'columnar': ('table', {}, 'connect_and_load_table: projected columns, streamed column by column'),
+    'columnar-all-columns': ('table', {'LOAD_COLUMN_PROJECTION': '0'}, 'connect_and_load_table with SELECT *'),
+    'fetchall': ('table', {}, 'cursor.fetchall() into pd.DataFrame (pre-columnar loader)'),
+    'full-parallel': ('full', {'LOAD_PARALLEL': '1'}, 'load_dataframes, LOAD_MAX_WORKERS tables at a time'),
+    'full-sequential': ('full', {'LOAD_PARALLEL': '0'}, 'load_dataframes, one table after another'),
+    'full-budgeted': ('full', {'RELOAD_MEMORY_BUDGET_MB': '1000000'},
+                      'load_dataframes replacing the cache table by table (memory budget mode)'),
+}
+
+
+def _fetchall_load(ds, table_name):
+    """The loader before streaming: all rows as driver tuples, then one DataFrame"""
+    import pandas as pd
+
+    with ds.sqlite_pool.connection(ds.POOL_ACQUIRE_TIMEOUT) as conn:
+        cursor = conn.cursor()
+        cursor.execute(ds._build_select(table_name, None, ds._resolve_columns(cursor, table_name)))
+        columns = [desc[0] for desc in cursor.description]
+        rows = cursor.fetchall()
+        cursor.close()
+    df = pd.DataFrame.from_records(rows, columns=columns)
+    del rows
+    return ds.normalize_table_schema(df)
+
+
+def run_child(strategy, tables, trace):
+    """Body of one benchmark process (python -m bench _child loader). Returns the result dict."""
+    # The app registers the columns its reports read (column projection depends on them)
+    import app  # noqa: F401
+    from services import database_service as ds
+    from services.memory_service import frame_bytes
+
+    kind = STRATEGIES[strategy][0]
+    result = {'strategy': strategy, 'kind': kind, 'traced': trace}
+    if trace:
+        tracemalloc.start()
+
+    if kind == 'table':
+        load = (lambda t: _fetchall_load(ds, t)) if strategy == 'fetchall' else ds.connect_and_load_table
+        per_table = {}
+        for table_name in tables:
+            started = time_module.perf_counter()
+            df = load(table_name)
+            seconds = time_module.perf_counter() - started
+            if df is None:
+                raise RuntimeError(f"{table_name} failed to load")
+            per_table[table_name] = {'seconds': round(seconds, 3), 'rows': int(len(df)),
+                                     'columns': int(df.shape[1]), 'mb': round(frame_bytes(df) / 2**20, 1)}
+            del df
+        result['tables'] = per_table
+        result['seconds'] = round(sum(t['seconds'] for t in per_table.values()), 3)
+        result['rows'] = sum(t['rows'] for t in per_table.values())
+    else:
+        started = time_module.perf_counter()
+        ds.load_dataframes()
+        result['cold_seconds'] = round(time_module.perf_counter() - started, 3)
+        wait_for_hooks()
+        if trace:
+            result['cold_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+            tracemalloc.reset_peak()
+        started = time_module.perf_counter()
+        tables_loaded = ds.load_dataframes(force=True)
+        result['seconds'] = round(time_module.perf_counter() - started, 3)
+        result['rows'] = sum(len(df) for df in tables_loaded.values())
+        result['cache_mb'] = round(sum(frame_bytes(df) for df in tables_loaded.values()) / 2**20, 1)
+
+    result['rows_per_sec'] = round(result['rows'] / result['seconds']) if result['seconds'] else None
+    result['peak_rss_mb'] = peak_rss_mb()
+    if trace:
+        # For full strategies: the reload's peak, cache included (what the OS has to find)
+        result['traced_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+        tracemalloc.stop()
+    wait_for_hooks()
+    return result
+
+
+def _spawn(strategy, database, tables, trace, work_dir):
+    child_args = ['loader', '--strategy', strategy, '--tables', ','.join(tables)] + (['--trace'] if trace else [])
+    return spawn(child_args, database, STRATEGIES[strategy][1], work_dir)
+
+
+def run_benchmark(database, strategies=None, tables=None, repeat=3, trace=False):
+    """Run each strategy `repeat` times (median seconds and peak RSS kept), optionally once more traced.
+
+    Args:
+        database: stand-in database path (see bench.synthetic.generate)
+        strategies: names from STRATEGIES (default: all)
+        tables: tables loaded by 'table' strategies (default: all eight)
+        repeat: timing runs per strategy
+        trace: also run under tracemalloc for the peak of Python allocations (several times slower)
+
+    Returns:
+        list: one result dict per strategy
+    """
+    from services.database_service import TABLES
+
+    if not os.path.exists(database):
+        raise FileNotFoundError(f"{database} not found — create it with: python -m bench generate")
+    tables = tables or list(TABLES.values())
+    results = []
+    with tempfile.TemporaryDirectory(prefix='bench-') as work_dir:
+        for strategy in strategies or list(STRATEGIES):
+            if strategy not in STRATEGIES:
+                raise ValueError(f"Unknown strategy: {strategy} (choose from {', '.join(STRATEGIES)})")
+            print(f"⏱️ {strategy}: {STRATEGIES[strategy][2]}")
+            runs = [_spawn(strategy, database, tables, False, work_dir) for _ in range(max(1, repeat))]
+            result = dict(runs[len(runs) // 2])
+            result['seconds'] = median(run['seconds'] for run in runs)
+            result['runs_seconds'] = [run['seconds'] for run in runs]
+            result['rows_per_sec'] = round(result['rows'] / result['seconds']) if result['seconds'] else None
+            rss = [run['peak_rss_mb'] for run in runs if run.get('peak_rss_mb') is not None]
+            result['peak_rss_mb'] = median(rss) if rss else None
+            if trace:
+                traced = _spawn(strategy, database, tables, True, work_dir)
+                result['traced_peak_mb'] = traced['traced_peak_mb']
+                if 'cold_peak_mb' in traced:
+                    result['cold_peak_mb'] = traced['cold_peak_mb']
+            results.append(result)
+            print(f"   {result['seconds']:.2f}s, {result['rows_per_sec'] or 0:,} rows/s"
+                  + (f", peak RSS {result['peak_rss_mb']:,.0f} MB" if result['peak_rss_mb'] is not None else '')
+                  + (f", traced peak {result['traced_peak_mb']:,.0f} MB" if trace else ''))
+    return results
+
+
+def format_results(results):
+    """Plain-text table of run_benchmark results"""
+    lines = [f"{'strategy':<22}{'seconds':>10}{'rows/s':>14}{'RSS MB':>10}{'traced MB':>11}{'cache MB':>10}"]
+    for result in results:
+        cells = [result.get(key) for key in ('peak_rss_mb', 'traced_peak_mb', 'cache_mb')]
+        rss, traced, cache = ('-' if value is None else value for value in cells)
+        lines.append(f"{result['strategy']:<22}{result['seconds']:>10.2f}{result['rows_per_sec'] or 0:>14,}"
+                     f"{rss:>10}{traced:>11}{cache:>10}")
+    return '\n'.join(lines)
@@ -0,0 +1,198 @@
+"""Replay a request journal (REQUEST_JOURNAL=1) as a load test: p50/p95/p99 latency and throughput
+per endpoint.
+
+In-process (default), a child process restores a frozen cache snapshot (SNAPSHOT_DIR or --snapshot-dir;
+or loads the stand-in database with --db) and serves the journal's requests through the Flask test
+client from `concurrency` threads, as Waitress would. Nothing refreshes the cache meanwhile and no
+report is pushed down to the database. With --url the requests go to a running server instead.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time as time_module
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from bench.runner import spawn, wait_for_hooks
+
+# The served cache stays exactly what was restored or loaded
+REPLAY_ENV = {
+    'PUSHDOWN_MODE': 'off',
+    'CACHE_MAX_AGE_HOURS': '100000',
+    'REPORT_WARMUP_COUNT': '0',
+    'REQUEST_JOURNAL': '0',
+}
+
+
+def load_requests(journal, endpoints=None, limit=None):
+    """(method, path, body, recorded ms) per journal entry, oldest first"""
+    from services.journal_service import read_journal
+
+    entries = [entry for entry in read_journal(journal) if entry.get('p')]
+    if endpoints:
+        # '/api/ciment-report' or just 'ciment-report'
+        entries = [entry for entry in entries if entry['p'] in endpoints or entry['p'].rsplit('/', 1)[-1] in endpoints]
+    requests = [(entry.get('m', 'POST'), entry['p'], entry.get('b'), entry.get('ms')) for entry in entries]
+    return requests[-limit:] if limit else requests
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def _latency_stats(milliseconds):
+    values = sorted(milliseconds)
+    return {f'p{pct}_ms': round(percentile(values, pct), 1) if values else None for pct in (50, 95, 99)}
+
+
+def summarize(samples, wall_seconds, requests=()):
+    """Per endpoint (and '*' for all): requests, errors, p50/p95/p99/max ms, throughput, recorded latency.
+
+    samples: (path, status, seconds) per replayed request; requests: the journal entries replayed
+    (their recorded latency is shown next to the replayed one).
+    """
+    by_path = defaultdict(list)
+    for path, status, seconds in samples:
+        by_path[path].append((status, seconds))
+    recorded = defaultdict(list)
+    for _method, path, _body, ms in requests:
+        if ms is not None:
+            recorded[path].append(ms)
+    summary = {}
+    for path, runs in sorted(by_path.items(), key=lambda item: -len(item[1])) + [('*', [
+            (status, seconds) for path_runs in by_path.values() for status, seconds in path_runs])]:
+        statuses = defaultdict(int)
+        for status, _ in runs:
+            statuses[status] += 1
+        latencies = [seconds * 1000 for _, seconds in runs]
+        summary[path] = {
+            'requests': len(runs),
+            'errors': sum(count for status, count in statuses.items() if status == 0 or status >= 500),
+            'statuses': {str(status): count for status, count in sorted(statuses.items())},
+            **_latency_stats(latencies),
+            'max_ms': round(max(latencies), 1) if latencies else None,
+            'throughput_rps': round(len(runs) / wall_seconds, 2) if wall_seconds else None,
+            'recorded_p95_ms': _latency_stats(
+                [ms for ms_list in recorded.values() for ms in ms_list] if path == '*' else recorded[path]
+            )['p95_ms'],
+        }
+    return summary
+
+
+def _replay(requests, send, concurrency, repeat):
+    """Issue the requests (repeat times, in journal order) from `concurrency` threads"""
+    def timed(entry):
+        method, path, body, _ms = entry
+        started = time_module.perf_counter()
+        status = send(method, path, body)
+        return path, status, time_module.perf_counter() - started
+
+    started = time_module.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='replay') as pool:
+        samples = list(pool.map(timed, list(requests) * max(1, repeat)))
+    return samples, time_module.perf_counter() - started
+
+
+def _client_sender(flask_app):
+    local = threading.local()
+
+    def send(method, path, body):
+        if not hasattr(local, 'client'):
+            local.client = flask_app.test_client()
+        if method == 'GET':
+            return local.client.get(path, query_string=body or None).status_code
+        return local.client.open(path, method=method, json=body).status_code
+    return send
+
+
+def _http_sender(base_url, timeout=300):
+    def send(method, path, body):
+        data = json.dumps(body).encode() if method != 'GET' and body is not None else None
+        req = urllib.request.Request(base_url.rstrip('/') + path, data=data, method=method,
+                                     headers={'Content-Type': 'application/json'})
+        try:
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+        except (urllib.error.URLError, OSError):
+            return 0
+    return send
+
+
+def run_child(journal, concurrency, repeat, source, endpoints=None, limit=None):
+    """Body of the in-process replay (python -m bench _child replay)."""
+    import app
+    from services.database_service import restore_snapshot, load_dataframes, get_cache_version
+
+    requests = load_requests(journal, endpoints, limit)
+    if source == 'snapshot':
+        if not restore_snapshot():
+            raise RuntimeError("No cache snapshot to restore (see SNAPSHOT_DIR / --snapshot-dir)")
+    else:
+        load_dataframes()
+    wait_for_hooks()
+    version = get_cache_version()
+    samples, wall = _replay(requests, _client_sender(app.app), concurrency, repeat)
+    if get_cache_version() != version:
+        raise RuntimeError("The cache changed during the replay")
+    return {'wall_seconds': round(wall, 2), 'endpoints': summarize(samples, wall, requests)}
+
+
+def run_replay(journal, url=None, snapshot_dir=None, database=None, concurrency=8, repeat=1,
+               endpoints=None, limit=None, report_cache=True):
+    """Replay the journal in-process against a frozen snapshot (or the stand-in database), or against url.
+
+    Returns:
+        dict: parameters, wall_seconds and endpoints {path or '*': latency percentiles, throughput, ...}
+    """
+    result = {'journal': journal, 'target': url or ('database ' + database if database else 'snapshot'),
+              'concurrency': concurrency, 'repeat': repeat}
+    if url:
+        requests = load_requests(journal, endpoints, limit)
+        samples, wall = _replay(requests, _http_sender(url), concurrency, repeat)
+        result.update(wall_seconds=round(wall, 2), endpoints=summarize(samples, wall, requests))
+        return result
+
+    from config.database import SNAPSHOT_DIR, SQLITE_DATABASE
+    env = dict(REPLAY_ENV)
+    if not report_cache:
+        env['REPORT_CACHE_ENTRIES'] = '0'
+    if database:
+        source = 'database'
+    else:
+        source = 'snapshot'
+        env.update(CACHE_SNAPSHOT='1', SNAPSHOT_DIR=os.path.abspath(snapshot_dir or SNAPSHOT_DIR))
+    child_args = ['replay', '--journal', os.path.abspath(journal), '--concurrency', str(concurrency),
+                  '--repeat', str(repeat), '--source', source]
+    if endpoints:
+        child_args += ['--endpoints', ','.join(endpoints)]
+    if limit:
+        child_args += ['--limit', str(limit)]
+    with tempfile.TemporaryDirectory(prefix='bench-') as work_dir:
+        result.update(spawn(child_args, os.path.abspath(database or SQLITE_DATABASE), env, work_dir))
+    return result
+
+
+def format_results(result):
+    lines = [f"{result['target']}, {result['concurrency']} concurrent, {result['wall_seconds']}s wall",
+             f"{'endpoint':<40}{'requests':>9}{'errors':>8}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+             f"{'max ms':>9}{'req/s':>8}{'recorded p95':>14}"]
+    for path, stats in result['endpoints'].items():
+        cells = [stats[key] if stats[key] is not None else '-' for key in
+                 ('p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'throughput_rps', 'recorded_p95_ms')]
+        lines.append(f"{path:<40}{stats['requests']:>9}{stats['errors']:>8}" + ''.join(
+            f"{cell:>9}" for cell in cells[:4]) + f"{cells[4]:>8}{cells[5]:>14}")
+    unreachable = result['endpoints'].get('*', {}).get('statuses', {}).get('0')
+    if unreachable:
+        lines.append(f"⚠️ {unreachable} request(s) got no response (server not reachable or timed out)")
+    return '\n'.join(lines)
@@ -0,0 +1,285 @@
+"""Report benchmark: compute and serialization time and peak memory of every report endpoint,
+at several synthetic data scales, compared with a stored baseline.
+
+Each scale runs in its own process against its own stand-in database (bench_data/standin-<scale>.db,
+generated once and reused). The app loads it like production does, then every report is requested
+through the Flask test client with report caching, warm-up and SQL pushdown off, so each request
+runs the full pandas path. Serialization is the time Flask spends encoding the JSON response;
+building the response rows counts as compute. Each report's rows are also digested (numbers to 9
+significant digits), so a run against a baseline also flags reports whose output changed. The
+StockAnalyzer equivalence with its pre-vectorisation logic is tested in tests/test_stock_analysis.py.
+"""
+
+import hashlib
+import json
+import numbers
+import os
+import platform
+import tempfile
+import time as time_module
+import tracemalloc
+from datetime import date, datetime, timedelta
+from statistics import median
+
+import pandas as pd
+from flask.json.provider import DefaultJSONProvider
+
+from bench.runner import spawn, wait_for_hooks
+from bench.synthetic import ensure_database, read_info
+
+# Fixed history end so a baseline and later runs see the same data
+DEFAULT_END_DATE = date(2025, 6, 30)
+DEFAULT_SCALES = (200_000, 1_000_000)
+
+# A report is slower than baseline when it exceeds it by the threshold AND by these absolute
+# amounts (sub-noise differences on fast reports are not regressions)
+DEFAULT_THRESHOLD_PCT = 20
+MIN_SECONDS_DELTA = 0.02
+MIN_MB_DELTA = 2.0
+
+# Every report request reads the cache only, uncached, with nothing running in the background
+REPORT_ENV = {
+    'REPORT_CACHE_ENTRIES': '0',
+    'REPORT_WARMUP_COUNT': '0',
+    'PUSHDOWN_MODE': 'off',
+    'CACHE_MAX_AGE_HOURS': '100000',
+}
+
+BENCH_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bench_data')
+# Committed with the code (bench_data only holds the generated databases)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'report_baseline.json')
+
+
+def _month(end, found):
+    return {'from_date': (end - timedelta(days=29)).isoformat(), 'to_date': end.isoformat()}
+
+
+# name -> (endpoint or None for a direct StockAnalyzer call, body(end_date, found), pick)
+# pick = (found key, column): take that column of the first row for the requests that follow;
+# found['sales_day'] holds the last day with sales per SID prefix (small scales have gaps)
+REPORTS = {
+    'stock-analyzer': (None, _month, None),
+    'autonomy': ('/api/autonomy-report', _month, None),
+    'stock-by-site': ('/api/stock-by-site-report', lambda end, found: {'as_of_date': end.isoformat()}, None),
+    'stock-by-site-past': ('/api/stock-by-site-report',
+                           lambda end, found: {'as_of_date': (end - timedelta(days=182)).isoformat()}, None),
+    'ciment': ('/api/ciment-report', _month, None),
+    'sales-kinshasa': ('/api/sales-report',
+                       lambda end, found: {'site_type': 'kinshasa', 'report_date': found['sales_day']['5301']}, None),
+    'sales-int': ('/api/sales-report',
+                  lambda end, found: {'site_type': 'int', 'report_date': found['sales_day']['5302']}, None),
+    'sales-by-item': ('/api/sales-by-item-report', _month, None),
+    'bureau-clients': ('/api/kinshasa-bureau-client-report', _month, ('client_sid', 'SID')),
+    'bureau-client-items': ('/api/kinshasa-bureau-client-items',
+                            lambda end, found: {**_month(end, found), 'client_sid': found.get('client_sid')}, None),
+    'bureau-items': ('/api/kinshasa-bureau-items-report', _month, ('item_code', 'ITEM_CODE')),
+    'bureau-item-clients': ('/api/kinshasa-bureau-item-clients',
+                            lambda end, found: {**_month(end, found), 'item_code': found.get('item_code')}, None),
+}
+
+
+class _TimedJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider that adds up the time spent encoding responses"""
+    seconds = 0.0
+
+    def dumps(self, obj, **kwargs):
+        started = time_module.perf_counter()
+        try:
+            return super().dumps(obj, **kwargs)
+        finally:
+            self.seconds += time_module.perf_counter() - started
+
+
+def output_digest(rows):
+    """Short hash of report rows; numbers are compared to 9 significant digits (summation order noise)"""
+    def canonical(value):
+        if value is None or isinstance(value, (bool, str)):
+            return value
+        if isinstance(value, numbers.Number):
+            number = float(value)
+            return None if number != number else float(f"{number:.9g}")
+        if isinstance(value, dict):
+            return {str(key): canonical(item) for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [canonical(item) for item in value]
+        return str(value)
+    return hashlib.sha1(json.dumps(canonical(rows), sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _last_sales_days(invoices, end):
+    """Last day with FTYPE 1 invoices per sales report SID prefix (Kinshasa 5301, INT 5302), default end"""
+    sales = invoices[invoices['FTYPE'] == 1]
+    sids = sales['SID'].astype(str)
+    days = {}
+    for prefix in ('5301', '5302'):
+        last = sales.loc[sids.str.startswith(prefix), 'FDATE'].max()
+        days[prefix] = (last.date() if pd.notna(last) else end).isoformat()
+    return days
+
+
+def failed_reports(result):
+    """(scale, report, status, error) of every report that did not answer 200: not a timing"""
+    return [(label, name, report['status'], report.get('error'))
+            for label, scale in result['scales'].items() for name, report in scale['reports'].items()
+            if report['status'] != 200]
+
+
+def scale_label(rows):
+    """1000000 -> '1M', 200000 -> '200k'"""
+    if rows % 1_000_000 == 0:
+        return f"{rows // 1_000_000}M"
+    if rows % 1_000 == 0:
+        return f"{rows // 1_000}k"
+    return str(rows)
+
+
+def _run_report(client, provider, name, body):
+    """One request (or StockAnalyzer call): (compute seconds, serialize seconds, status, payload)"""
+    endpoint = REPORTS[name][0]
+    provider.seconds = 0.0
+    started = time_module.perf_counter()
+    if endpoint is None:
+        from models.stock_analysis import StockAnalyzer
+        df = StockAnalyzer().calculate_stock_and_sales(**body)
+        total = time_module.perf_counter() - started
+        return total, 0.0, 200 if df is not None else 500, {'data': [] if df is None else df.to_dict('records')}
+    response = client.post(endpoint, json=body)
+    total = time_module.perf_counter() - started
+    serialize = provider.seconds
+    return total - serialize, serialize, response.status_code, response.get_json(silent=True) or {}
+
+
+def run_child(repeat, trace, names=None):
+    """Body of one scale's process (python -m bench _child reports). Returns {report: measurements}."""
+    import app
+    from config.database import SQLITE_DATABASE
+    from services.database_service import load_dataframes, get_dataframes
+
+    end = date.fromisoformat(read_info(SQLITE_DATABASE)['end_date'])
+    started = time_module.perf_counter()
+    load_dataframes()
+    wait_for_hooks()
+    load_seconds = time_module.perf_counter() - started
+
+    flask_app = app.app
+    provider = flask_app.json = _TimedJSONProvider(flask_app)
+    client = flask_app.test_client()
+    found = {'sales_day': _last_sales_days(get_dataframes()['invoice_headers'], end)}
+    reports = {}
+    for name in names or list(REPORTS):
+        _endpoint, make_body, pick = REPORTS[name]
+        body = make_body(end, found)
+        runs = [_run_report(client, provider, name, body) for _ in range(max(1, repeat))]
+        compute, serialize, status, payload = runs[-1]
+        data = payload.get('data')
+        reports[name] = {
+            'status': status,
+            'compute_seconds': round(median(run[0] for run in runs), 4),
+            'serialize_seconds': round(median(run[1] for run in runs), 4),
+            'total_seconds': round(median(run[0] + run[1] for run in runs), 4),
+            'rows': len(data) if isinstance(data, list) else None,
+            'digest': output_digest(data) if status == 200 else None,
+            'error': payload.get('error') if status != 200 else None,
+        }
+        if pick and isinstance(data, list) and data:
+            found[pick[0]] = data[0].get(pick[1])
+
+    if trace:
+        # Peak allocated while the report runs, above what was allocated before it (the cache)
+        tracemalloc.start()
+        for name in reports:
+            body = REPORTS[name][1](end, found)
+            before = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            _run_report(client, provider, name, body)
+            reports[name]['peak_mb'] = round((tracemalloc.get_traced_memory()[1] - before) / 2**20, 1)
+        tracemalloc.stop()
+    return {'load_seconds': round(load_seconds, 2), 'reports': reports}
+
+
+def run_benchmark(scales=DEFAULT_SCALES, seed=42, end_date=DEFAULT_END_DATE, repeat=5, trace=True, names=None):
+    """Time every report at each scale (ALLITEM rows).
+
+    Returns:
+        dict: run parameters and scales {label: {'load_seconds', 'reports': {name: measurements}}}
+    """
+    for name in names or ():
+        if name not in REPORTS:
+            raise ValueError(f"Unknown report: {name} (choose from {', '.join(REPORTS)})")
+    result = {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'seed': seed, 'end_date': end_date.isoformat(), 'repeat': repeat,
+        'python': platform.python_version(), 'machine': platform.node(),
+        'scales': {},
+    }
+    with tempfile.TemporaryDirectory(prefix='bench-') as work_dir:
+        for rows in scales:
+            label = scale_label(rows)
+            database = ensure_database(os.path.join(BENCH_DATA_DIR, f'standin-{label}.db'), rows, seed, end_date)
+            print(f"⏱️ Reports at {label} ALLITEM rows...")
+            child_args = ['reports', '--repeat', str(repeat)] + (['--trace'] if trace else [])
+            if names:
+                child_args += ['--reports', ','.join(names)]
+            result['scales'][label] = spawn(child_args, database, REPORT_ENV, work_dir)
+    return result
+
+
+def compare(result, baseline, threshold_pct=DEFAULT_THRESHOLD_PCT):
+    """Reports slower (or hungrier) than the baseline by more than threshold_pct, or answering differently.
+
+    Returns:
+        list: (scale, report, metric, baseline value, new value) per regression
+    """
+    if (baseline.get('seed'), baseline.get('end_date')) != (result['seed'], result['end_date']):
+        raise ValueError(f"Baseline was measured on other data (seed {baseline.get('seed')}, end date "
+                         f"{baseline.get('end_date')}); run with the same --seed/--end-date or save a new one")
+    factor = 1 + threshold_pct / 100
+    regressions = []
+    for label, scale in result['scales'].items():
+        base_reports = (baseline['scales'].get(label) or {}).get('reports', {})
+        for name, report in scale['reports'].items():
+            base = base_reports.get(name)
+            if not base:
+                continue
+            if base['status'] == 200 and report['status'] != 200:
+                regressions.append((label, name, 'status', base['status'], report['status']))
+            elif base.get('digest') and report.get('digest') and base['digest'] != report['digest']:
+                regressions.append((label, name, 'output', base['digest'], report['digest']))
+            for metric, floor in (('total_seconds', MIN_SECONDS_DELTA), ('peak_mb', MIN_MB_DELTA)):
+                old, new = base.get(metric), report.get(metric)
+                if old is not None and new is not None and new > old * factor and new - old > floor:
+                    regressions.append((label, name, metric, old, new))
+    return regressions
+
+
+def format_results(result, baseline=None):
+    """Plain-text table per scale (with the change against the baseline when given)"""
+    lines = []
+    for label, scale in result['scales'].items():
+        base_reports = ((baseline or {}).get('scales', {}).get(label) or {}).get('reports', {})
+        lines.append(f"\n{label} ALLITEM rows (cache loaded in {scale['load_seconds']}s)")
+        lines.append(f"{'report':<22}{'compute s':>11}{'serialize s':>13}{'peak MB':>9}{'rows':>8}"
+                     f"{'vs baseline':>13}  status")
+        for name, report in scale['reports'].items():
+            base = base_reports.get(name)
+            change = ''
+            if base and base.get('total_seconds'):
+                change = f"{(report['total_seconds'] - base['total_seconds']) / base['total_seconds'] * 100:+.0f}%"
+            peak = report.get('peak_mb')
+            lines.append(f"{name:<22}{report['compute_seconds']:>11.3f}{report['serialize_seconds']:>13.3f}"
+                         f"{peak if peak is not None else '-':>9}{report['rows'] if report['rows'] is not None else '-':>8}"
+                         f"{change:>13}  {report['status']}{' ' + report['error'] if report.get('error') else ''}")
+    return '\n'.join(lines)
+
+
+def load_baseline(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def save_baseline(result, path):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(result, f, indent=2)
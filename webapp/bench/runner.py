@@ -0,0 +1,67 @@
+"""Benchmark processes: each measurement runs in a fresh `python -m bench _child ...` process.
+
+Configuration is read from the environment at import, and peak memory must not include an
+earlier measurement's leftovers, so the parent only spawns children and collects the one
+result line each prints.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import threading
+import time as time_module
+
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+RESULT_PREFIX = 'BENCH_RESULT '
+
+# Environment shared by every run: stand-in backend, no disk side effects, every table eager
+BASE_ENV = {
+    'DB_BACKEND': 'sqlite',
+    'CACHE_SNAPSHOT': '0',
+    'CHANGE_DETECTION': '0',
+    'EAGER_TABLES': '*',
+}
+
+WEBAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def spawn(child_args, database, env, work_dir):
+    """Run `python -m bench _child <child_args>` against database and return its result dict."""
+    env = {**os.environ, **BASE_ENV, **env}
+    env['SQLITE_DATABASE'] = database
+    # Keep the benchmark's telemetry and memory history out of the app's files
+    env['LOAD_TELEMETRY_FILE'] = os.path.join(work_dir, 'load_telemetry.jsonl')
+    env['MEMORY_HISTORY_FILE'] = os.path.join(work_dir, 'cache_memory_history.json')
+    command = [sys.executable, '-m', 'bench', '_child', *child_args]
+    completed = subprocess.run(command, cwd=WEBAPP_DIR, env=env, capture_output=True, text=True)
+    for line in completed.stdout.splitlines():
+        if line.startswith(RESULT_PREFIX):
+            return json.loads(line[len(RESULT_PREFIX):])
+    raise RuntimeError(f"{' '.join(child_args)} failed:\n{completed.stdout[-2000:]}\n{completed.stderr[-2000:]}")
+
+
+def peak_rss_mb():
+    """Process peak resident memory in MB (peak working set on Windows), or None if unknown"""
+    if PSUTIL_AVAILABLE:
+        info = psutil.Process().memory_info()
+        if hasattr(info, 'peak_wset'):
+            return round(info.peak_wset / 2**20, 1)
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (2**20 if sys.platform == 'darwin' else 2**10), 1)
+
+
+def wait_for_hooks():
+    """Post-reload hooks run on a background thread; let them finish before the next timing"""
+    while any(t.name == 'post-reload-hooks' and t.is_alive() for t in threading.enumerate()):
+        time_module.sleep(0.05)
@@ -0,0 +1,362 @@
+"""Synthetic stand-in database: the eight InterBase tables with realistic schemas, at any scale"""
+
+import os
+import sqlite3
+import time as time_module
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+# Row counts relative to ALLITEM (the production ratios) and fixed master-data sizes
+ITEMS_PER_ALLITEM = 0.6
+ITEMS_PER_INVOICE = 12
+INVOICES_PER_PAYMENT = 4
+N_SITES = 156
+N_CATEGORIES = 159
+N_STOCK_ITEMS = 1000
+N_SITE_ACCOUNTS = 140
+N_CLIENT_ACCOUNTS = 1150
+
+# Days of history generated before the end date
+HISTORY_DAYS = 3 * 365
+
+# Rows generated and inserted per batch
+CHUNK_ROWS = 200000
+
+# Column declarations: DECIMAL and TIMESTAMP come back as Decimal and datetime, like the
+# InterBase drivers return NUMERIC and TIMESTAMP columns (see database_service)
+SCHEMAS = {
+    'ALLSTOCK': [
+        ('ID', 'VARCHAR(10)'), ('SITE', 'VARCHAR(40)'), ('STACTIVE', 'SMALLINT'), ('SIDNO', 'VARCHAR(10)'),
+        ('SID606', 'VARCHAR(10)'), ('MYCHECK', 'SMALLINT'), ('TEL', 'VARCHAR(20)'), ('MYCHECK2', 'SMALLINT'),
+        ('PLACE', 'VARCHAR(10)'), ('FREIGHT', 'DECIMAL'), ('TARGET', 'DECIMAL'), ('PERCENTAGE', 'DECIMAL'),
+        ('PERCENTAGE2', 'DECIMAL'), ('SID2', 'VARCHAR(10)'), ('MYORDER', 'INTEGER'), ('MYNAME', 'VARCHAR(40)'),
+        ('PERC', 'DECIMAL'), ('JOB', 'VARCHAR(10)'),
+    ],
+    'DETDESCR': [
+        ('ID', 'INTEGER'), ('MID', 'INTEGER'), ('DESCR', 'VARCHAR(40)'), ('MYRATE', 'DECIMAL'),
+        ('MYRATE2', 'DECIMAL'), ('ABREV', 'VARCHAR(10)'), ('SITE', 'VARCHAR(10)'), ('SID', 'INTEGER'),
+        ('SID2', 'INTEGER'), ('CATEGORY', 'VARCHAR(10)'),
+    ],
+    'STOCK': [
+        ('ITEM', 'VARCHAR(20)'), ('DESCR1', 'VARCHAR(60)'), ('DESCR2', 'VARCHAR(60)'), ('CATEGORY', 'VARCHAR(10)'),
+        ('SUBCAT1', 'VARCHAR(10)'), ('SUBCAT2', 'VARCHAR(10)'), ('WHEREIS', 'VARCHAR(20)'),
+        ('SUPPLIER', 'VARCHAR(20)'), ('PACK', 'DECIMAL'), ('BCOSTUS', 'DECIMAL'), ('BCOSTLC', 'DECIMAL'),
+        ('POSPRICE1', 'DECIMAL'), ('PRICEA', 'DECIMAL'), ('PRICEB', 'DECIMAL'), ('PRICEC', 'DECIMAL'),
+        ('BARCODE1', 'VARCHAR(20)'), ('MINSTOCK', 'DECIMAL'), ('MAXSTOCK', 'DECIMAL'), ('GWEIGHT', 'DECIMAL'),
+        ('NWEIGHT', 'DECIMAL'), ('VOLUME', 'DECIMAL'), ('SUNIT', 'VARCHAR(10)'), ('VAT', 'DECIMAL'),
+        ('QTY', 'DECIMAL'), ('CDATE', 'TIMESTAMP'), ('COSTUS', 'DECIMAL'), ('COSTLC', 'DECIMAL'),
+        ('LCOST', 'DECIMAL'), ('STYPE', 'SMALLINT'), ('USER_', 'VARCHAR(20)'), ('PROFIT', 'DECIMAL'),
+        ('MAXDISC', 'DECIMAL'),
+    ],
+    'SUB': [
+        ('SID', 'INTEGER'), ('SNAME', 'VARCHAR(60)'), ('CONTACT', 'DOUBLE'), ('TEL', 'VARCHAR(20)'),
+        ('ADDRESS', 'VARCHAR(60)'), ('CITY', 'VARCHAR(20)'), ('CREDITLIMIT', 'DECIMAL'), ('BALANCE', 'DECIMAL'),
+        ('CURRID', 'SMALLINT'), ('CDATE', 'TIMESTAMP'), ('USER_', 'VARCHAR(20)'), ('NOTES', 'VARCHAR(80)'),
+    ],
+    'INVOICE': [
+        ('ID', 'INTEGER'), ('MID', 'VARCHAR(20)'), ('FTYPE', 'SMALLINT'), ('SID', 'INTEGER'), ('SITE', 'VARCHAR(10)'),
+        ('FDATE', 'TIMESTAMP'), ('NET', 'DECIMAL'), ('SUBTOTAL', 'DECIMAL'), ('VAT', 'DECIMAL'), ('OTHER', 'DECIMAL'),
+        ('DISCOUNT', 'DECIMAL'), ('CURRVAL', 'DECIMAL'), ('CURRVALLC', 'DECIMAL'), ('PAID', 'DECIMAL'),
+        ('SALESMAN', 'VARCHAR(20)'), ('USER_', 'VARCHAR(20)'), ('NOTES', 'VARCHAR(80)'), ('JOB', 'VARCHAR(10)'),
+        ('YESNO', 'SMALLINT'), ('LOGDATE', 'TIMESTAMP'),
+    ],
+    'ITEMS': [
+        ('ID', 'INTEGER'), ('MID', 'INTEGER'), ('ITEM', 'VARCHAR(20)'), ('SITE', 'VARCHAR(10)'),
+        ('STTYPE', 'VARCHAR(5)'), ('FRAC', 'DECIMAL'), ('QTY', 'DECIMAL'), ('PACK', 'DECIMAL'), ('PRICE', 'DECIMAL'),
+        ('DISCOUNT', 'DECIMAL'), ('VAT', 'DECIMAL'), ('COSTUS', 'DECIMAL'), ('COSTLC', 'DECIMAL'),
+        ('CATREGORYID', 'INTEGER'), ('VATAMOUNT', 'DECIMAL'), ('DEBITUS', 'DECIMAL'), ('CREDITUS', 'DECIMAL'),
+        ('BARCODE', 'VARCHAR(20)'), ('BONENO', 'VARCHAR(20)'), ('DEBITQTY', 'DECIMAL'), ('CREDITQTY', 'DECIMAL'),
+        ('YESNO', 'SMALLINT'), ('TOTAL', 'DECIMAL'), ('FDATE', 'TIMESTAMP'), ('ALLQTY', 'DECIMAL'),
+        ('JOB', 'VARCHAR(10)'), ('SID', 'INTEGER'), ('SALESMAN', 'VARCHAR(20)'), ('CONTACT', 'DOUBLE'),
+        ('TSITE', 'VARCHAR(10)'), ('DEBITLC', 'DECIMAL'), ('CLC', 'DECIMAL'), ('CREDITLC', 'DECIMAL'),
+        ('STQTY', 'DECIMAL'), ('AUTOCURRFAC', 'DECIMAL'), ('FTYPE', 'SMALLINT'), ('NOVTOTAL', 'DECIMAL'),
+        ('CURRVAL', 'DECIMAL'), ('CURRVALLC', 'DECIMAL'), ('DEPENSE', 'DECIMAL'), ('CARTOON', 'DECIMAL'),
+        ('CARTOONDC', 'DECIMAL'), ('FIDATE', 'TIMESTAMP'), ('MYLINES', 'INTEGER'), ('FROMBAL', 'DECIMAL'),
+        ('TOBAL', 'DECIMAL'), ('ITCOLOR', 'DOUBLE'), ('EXTRANOTE', 'VARCHAR(80)'), ('MYORDER', 'VARCHAR(10)'),
+        ('PRICEKILO', 'DECIMAL'), ('MYCATEGORYID', 'INTEGER'), ('POID', 'INTEGER'), ('DEBITVATAMOUNT', 'DECIMAL'),
+        ('CREDITVATAMOUNT', 'DECIMAL'), ('LOGDATE', 'TIMESTAMP'),
+    ],
+    'ALLITEM': [
+        ('ID', 'INTEGER'), ('MID', 'INTEGER'), ('ITEM', 'VARCHAR(20)'), ('SITE', 'VARCHAR(10)'),
+        ('FTYPE', 'SMALLINT'), ('SID', 'INTEGER'), ('FDATE', 'TIMESTAMP'), ('DEBITQTY', 'DECIMAL'),
+        ('CREDITQTY', 'DECIMAL'), ('PRICE', 'DECIMAL'), ('COSTUS', 'DECIMAL'), ('COSTLC', 'DECIMAL'),
+        ('PACK', 'DECIMAL'), ('JOB', 'VARCHAR(10)'), ('USER_', 'VARCHAR(20)'), ('LOGDATE', 'TIMESTAMP'),
+    ],
+    'PAYM': [
+        ('ID', 'INTEGER'), ('MID', 'VARCHAR(20)'), ('FTYPE', 'SMALLINT'), ('SID', 'INTEGER'), ('SITE', 'VARCHAR(10)'),
+        ('FDATE', 'TIMESTAMP'), ('AMOUNT', 'DECIMAL'), ('AMOUNTLC', 'DECIMAL'), ('CURRID', 'SMALLINT'),
+        ('BANK', 'VARCHAR(20)'), ('CHEQUE', 'VARCHAR(20)'), ('NOTES', 'VARCHAR(80)'), ('USER_', 'VARCHAR(20)'),
+        ('LOGDATE', 'TIMESTAMP'),
+    ],
+}
+
+# Transaction types with their production share of ITEMS rows
+FTYPES = np.array([1, 22, 12, 3, 14, 15, 23, 13, 2, 4])
+FTYPE_SHARES = np.array([0.812, 0.121, 0.03, 0.013, 0.009, 0.0076, 0.0047, 0.0011, 0.001, 0.0002])
+
+CATEGORY_NAMES = ['CIMENT', 'BAR', 'T.GALV', 'CORNIERE', 'TOLE', 'JKL', 'PEINTURE', 'PLOMBERIE', 'ELECTRICITE',
+                  'QUINCAILLERIE', 'CARRELAGE', 'BOIS', 'OUTILLAGE', 'SANITAIRE', 'FER']
+
+
+def _timestamps(rng, n, end, days=HISTORY_DAYS):
+    """n random second-resolution timestamps in the `days` days up to `end` (datetime64[s])"""
+    start = np.datetime64(end - timedelta(days=days), 's')
+    return start + rng.integers(0, days * 86400, n).astype('timedelta64[s]')
+
+
+def _as_text(stamps):
+    """datetime64 -> 'YYYY-MM-DD HH:MM:SS' (orders like the timestamp, as SQLite compares text)"""
+    return np.char.replace(np.datetime_as_string(stamps, unit='s'), 'T', ' ')
+
+
+def _money(rng, n, scale, nulls=0.0):
+    values = np.round(rng.gamma(1.2, scale, n), 4).astype(object)
+    if nulls:
+        values[rng.random(n) < nulls] = None
+    return values
+
+
+def _filler(sql_type, n):
+    """Value for a column nothing reads: zeros for numbers, NULL otherwise (as in production)"""
+    if sql_type in ('DECIMAL', 'DOUBLE', 'INTEGER', 'SMALLINT'):
+        return np.zeros(n, dtype=np.int64)
+    return np.full(n, None, dtype=object)
+
+
+def _master_data(rng, end):
+    """Sites, categories, items and accounts (small, generated in one piece)"""
+    letters = np.array(list('ABCDEFGHIJKLMNOPQRSTUVWXYZ'))
+    codes = set()
+    while len(codes) < N_SITES:
+        codes.add(''.join(rng.choice(letters, 3)))
+    site_codes = np.array(sorted(codes), dtype=object)
+    sidno = np.array(['3700002'] * 90 + ['3700003'] * 52 + ['3700004'] * 12 + ['3700005'] * 2, dtype=object)
+    site_names = np.array([f"{'DEPOT ' if s == '3700004' else ''}SITE {code}" for code, s in zip(site_codes, sidno)],
+                          dtype=object)
+    sites = {
+        'ID': site_codes, 'SITE': site_names, 'STACTIVE': np.ones(N_SITES, dtype=np.int64), 'SIDNO': sidno,
+        'PLACE': np.where(sidno == '3700003', 'INT', 'KIN').astype(object),
+        'MYORDER': np.arange(N_SITES),
+    }
+
+    category_ids = np.concatenate([np.arange(1, 120), 5000 + np.arange(N_CATEGORIES - 119)])
+    categories = {
+        'ID': category_ids, 'MID': np.zeros(N_CATEGORIES, dtype=np.int64),
+        'DESCR': np.array([CATEGORY_NAMES[i % len(CATEGORY_NAMES)] + ('' if i < len(CATEGORY_NAMES) else f' {i}')
+                           for i in range(N_CATEGORIES)], dtype=object),
+    }
+
+    item_codes = np.array([f"{rng.choice(letters)}{i:03d}" if i % 3 else f"P{i:03d}_A{i % 40}-{rng.choice(letters)}INT"
+                           for i in range(N_STOCK_ITEMS)], dtype=object)
+    item_categories = rng.choice(category_ids[:60], N_STOCK_ITEMS)
+    names = [CATEGORY_NAMES[list(category_ids).index(c) % len(CATEGORY_NAMES)] for c in item_categories]
+    stock = {
+        'ITEM': item_codes,
+        'DESCR1': np.array([f"{name} {code} {rng.integers(1, 100)}KG" for name, code in zip(names, item_codes)],
+                           dtype=object),
+        'CATEGORY': item_categories.astype(str).astype(object),
+        'PACK': np.ones(N_STOCK_ITEMS, dtype=np.int64),
+        'POSPRICE1': _money(rng, N_STOCK_ITEMS, 15, nulls=0.01),
+        'BCOSTUS': _money(rng, N_STOCK_ITEMS, 12),
+        'NWEIGHT': _money(rng, N_STOCK_ITEMS, 20, nulls=0.05),
+        'SUNIT': rng.choice(np.array(['PC', 'SAC', 'KG', 'M'], dtype=object), N_STOCK_ITEMS),
+        'VAT': np.full(N_STOCK_ITEMS, 16, dtype=np.int64),
+        'CDATE': _as_text(_timestamps(rng, N_STOCK_ITEMS, end, days=10 * 365)),
+    }
+
+    site_sids = np.concatenate([53010000 + np.arange(1, 61), 53020000 + np.arange(1, N_SITE_ACCOUNTS - 59)])
+    client_sids = rng.choice(np.arange(41100001, 41129999), N_CLIENT_ACCOUNTS, replace=False)
+    sids = np.concatenate([site_sids, np.sort(client_sids)])
+    contact = rng.choice(np.array([0.0, 1.0, 2.0, None], dtype=object), len(sids), p=[0.3, 0.05, 0.05, 0.6])
+    accounts = {
+        'SID': sids, 'SNAME': np.array([f"ACCOUNT {sid}" for sid in sids], dtype=object), 'CONTACT': contact,
+        'CURRID': np.ones(len(sids), dtype=np.int64),
+    }
+    return sites, categories, stock, accounts, site_sids, client_sids
+
+
+def _insert(conn, table_name, columns, n):
+    """INSERT n rows given {column: array}; missing schema columns get filler values."""
+    schema = SCHEMAS[table_name]
+    arrays = []
+    for name, sql_type in schema:
+        values = columns.get(name)
+        if values is None:
+            values = _filler(sql_type, n)
+        arrays.append(values.tolist())
+    placeholders = ', '.join('?' for _ in schema)
+    conn.executemany(f"INSERT INTO {table_name} VALUES ({placeholders})", zip(*arrays))
+
+
+def _invoice_chunk(rng, first_id, n, end, site_codes, site_sids, client_sids):
+    ids = first_id + np.arange(n)
+    ftype = rng.choice(FTYPES, n, p=FTYPE_SHARES / FTYPE_SHARES.sum())
+    # Sales to a site account (530x) for most invoices, office clients (411x) for the rest
+    sid = np.where(rng.random(n) < 0.7, rng.choice(site_sids, n), rng.choice(client_sids, n))
+    fdate = np.sort(_timestamps(rng, n, end))
+    net = _money(rng, n, 400, nulls=0.001)
+    return {
+        'ID': ids, 'MID': np.char.add('SI', ids.astype(str)).astype(object), 'FTYPE': ftype, 'SID': sid,
+        'SITE': rng.choice(site_codes, n), 'FDATE': _as_text(fdate), 'NET': net, 'SUBTOTAL': _money(rng, n, 400),
+        'VAT': _money(rng, n, 20), 'OTHER': _money(rng, n, 2), 'SALESMAN': rng.choice(
+            np.array(['AMM', 'XL', 'AZB', 'KIM'], dtype=object), n),
+        'LOGDATE': _as_text(fdate + rng.integers(0, 3600, n).astype('timedelta64[s]')),
+    }
+
+
+def _items_chunk(rng, first_id, n, invoices, item_codes, item_weights):
+    """Invoice lines: MID is the invoice ID; SITE, SID, FTYPE, FDATE and LOGDATE are copied from it"""
+    ids = first_id + np.arange(n)
+    pick = rng.integers(0, len(invoices['ID']), n)
+    qty = np.round(rng.gamma(0.8, 60, n)).astype(object)
+    qty[rng.random(n) < 0.00001] = None
+    credit = np.where(rng.random(n) < 0.85, qty, 0).astype(object)
+    return {
+        'ID': ids, 'MID': invoices['ID'][pick], 'ITEM': rng.choice(item_codes, n, p=item_weights),
+        'SITE': invoices['SITE'][pick], 'STTYPE': np.full(n, '-', dtype=object), 'FRAC': np.zeros(n, dtype=np.int64),
+        'QTY': qty, 'PACK': np.ones(n, dtype=np.int64), 'PRICE': _money(rng, n, 8), 'DISCOUNT': _money(rng, n, 0.2),
+        'VAT': np.full(n, 16, dtype=np.int64), 'COSTUS': _money(rng, n, 6), 'VATAMOUNT': _money(rng, n, 1.5),
+        'DEBITUS': _money(rng, n, 50, nulls=0.004), 'CREDITUS': _money(rng, n, 240, nulls=0.00001),
+        'DEBITQTY': np.where(rng.random(n) < 0.1, qty, 0).astype(object), 'CREDITQTY': credit,
+        'FDATE': invoices['FDATE'][pick], 'SID': invoices['SID'][pick],
+        'CONTACT': rng.choice(np.array([0.0, 1.0, 2.0, None], dtype=object), n, p=[0.28, 0.04, 0.04, 0.64]),
+        'FTYPE': invoices['FTYPE'][pick], 'FROMBAL': _money(rng, n, 40), 'ITCOLOR': np.where(
+            rng.random(n) < 0.3, 16777215.0, None).astype(object),
+        'DEBITVATAMOUNT': _money(rng, n, 0.3), 'CREDITVATAMOUNT': _money(rng, n, 13),
+        'LOGDATE': invoices['LOGDATE'][pick],
+    }
+
+
+def _allitem_chunk(rng, first_id, n, end, site_codes, item_codes, item_weights):
+    """Stock ledger: receipts (DEBITQTY) and issues (CREDITQTY) per site and item"""
+    ids = first_id + np.arange(n)
+    fdate = np.sort(_timestamps(rng, n, end))
+    receipt = rng.random(n) < 0.35
+    qty = np.round(rng.gamma(0.8, 60, n))
+    debit = np.where(receipt, qty * 1.05, 0).astype(object)
+    debit[rng.random(n) < 0.00001] = None
+    return {
+        'ID': ids, 'MID': ids // 8, 'ITEM': rng.choice(item_codes, n, p=item_weights), 'SITE': rng.choice(site_codes, n),
+        'FTYPE': rng.choice(FTYPES, n, p=FTYPE_SHARES / FTYPE_SHARES.sum()), 'FDATE': _as_text(fdate),
+        'DEBITQTY': debit, 'CREDITQTY': np.where(receipt, 0, qty).astype(object), 'PRICE': _money(rng, n, 8),
+        'COSTUS': _money(rng, n, 6), 'PACK': np.ones(n, dtype=np.int64),
+        'LOGDATE': _as_text(fdate + rng.integers(0, 3600, n).astype('timedelta64[s]')),
+    }
+
+
+def _paym_chunk(rng, first_id, n, end, site_codes, client_sids):
+    ids = first_id + np.arange(n)
+    fdate = np.sort(_timestamps(rng, n, end))
+    return {
+        'ID': ids, 'MID': np.char.add('PA', ids.astype(str)).astype(object), 'FTYPE': np.full(n, 5, dtype=np.int64),
+        'SID': rng.choice(client_sids, n), 'SITE': rng.choice(site_codes, n), 'FDATE': _as_text(fdate),
+        'AMOUNT': _money(rng, n, 500), 'CURRID': np.ones(n, dtype=np.int64),
+        'LOGDATE': _as_text(fdate + rng.integers(0, 3600, n).astype('timedelta64[s]')),
+    }
+
+
+def _chunks(total):
+    for start in range(0, total, CHUNK_ROWS):
+        yield start, min(CHUNK_ROWS, total - start)
+
+
+def generate(path, allitem_rows=1_000_000, seed=42, end_date=None):
+    """Write a stand-in database with the eight tables to path (replaced if it exists).
+
+    ITEMS, INVOICE and PAYM are sized from allitem_rows with the production ratios; master
+    data has production size. The same seed and end_date give the same database.
+
+    Returns:
+        dict: rows per table
+    """
+    end = datetime.combine(end_date or date.today(), datetime.min.time()) + timedelta(days=1)
+    rng = np.random.default_rng(seed)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if os.path.exists(path):
+        os.remove(path)
+
+    started = time_module.time()
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    for table_name, schema in SCHEMAS.items():
+        conn.execute(f"CREATE TABLE {table_name} ({', '.join(f'{c} {t}' for c, t in schema)})")
+
+    sites, categories, stock, accounts, site_sids, client_sids = _master_data(rng, end)
+    for table_name, columns in (('ALLSTOCK', sites), ('DETDESCR', categories), ('STOCK', stock), ('SUB', accounts)):
+        _insert(conn, table_name, columns, len(next(iter(columns.values()))))
+    site_codes, item_codes = sites['ID'], stock['ITEM']
+    # A few items carry most of the volume, as in production
+    item_weights = 1.0 / np.arange(1, len(item_codes) + 1) ** 0.9
+    item_weights /= item_weights.sum()
+
+    counts = {'ALLSTOCK': N_SITES, 'DETDESCR': N_CATEGORIES, 'STOCK': N_STOCK_ITEMS, 'SUB': len(accounts['SID'])}
+    counts['ALLITEM'] = int(allitem_rows)
+    counts['ITEMS'] = int(allitem_rows * ITEMS_PER_ALLITEM)
+    counts['INVOICE'] = max(1, counts['ITEMS'] // ITEMS_PER_INVOICE)
+    counts['PAYM'] = max(1, counts['INVOICE'] // INVOICES_PER_PAYMENT)
+
+    # Invoices are kept in memory (ITEMS rows copy their header); they are 1/12 of ITEMS
+    invoice_parts = []
+    for start, n in _chunks(counts['INVOICE']):
+        chunk = _invoice_chunk(np.random.default_rng([seed, 1, start]), start + 1, n, end, site_codes,
+                               site_sids, client_sids)
+        _insert(conn, 'INVOICE', chunk, n)
+        invoice_parts.append({key: chunk[key] for key in ('ID', 'MID', 'SITE', 'SID', 'FTYPE', 'FDATE', 'LOGDATE')})
+    invoices = {key: np.concatenate([part[key] for part in invoice_parts]) for key in invoice_parts[0]}
+    del invoice_parts
+
+    for start, n in _chunks(counts['ITEMS']):
+        _insert(conn, 'ITEMS', _items_chunk(np.random.default_rng([seed, 2, start]), start + 1, n, invoices,
+                                            item_codes, item_weights), n)
+        print(f"  ITEMS {start + n:,}/{counts['ITEMS']:,}", end='\r')
+    print()
+    del invoices
+    for start, n in _chunks(counts['ALLITEM']):
+        _insert(conn, 'ALLITEM', _allitem_chunk(np.random.default_rng([seed, 3, start]), start + 1, n, end,
+                                                site_codes, item_codes, item_weights), n)
+        print(f"  ALLITEM {start + n:,}/{counts['ALLITEM']:,}", end='\r')
+    print()
+    for start, n in _chunks(counts['PAYM']):
+        _insert(conn, 'PAYM', _paym_chunk(np.random.default_rng([seed, 4, start]), start + 1, n, end,
+                                          site_codes, client_sids), n)
+
+    # Indexes the delta refresh and fingerprint queries use in production
+    for table_name in ('INVOICE', 'ITEMS', 'ALLITEM'):
+        conn.execute(f"CREATE INDEX {table_name}_ID ON {table_name} (ID)")
+        conn.execute(f"CREATE INDEX {table_name}_LOGDATE ON {table_name} (LOGDATE)")
+    conn.execute("CREATE TABLE BENCH_INFO (NAME VARCHAR(20), VAL VARCHAR(40))")
+    conn.executemany("INSERT INTO BENCH_INFO VALUES (?, ?)", [
+        ('seed', str(seed)), ('allitem_rows', str(allitem_rows)), ('end_date', (end - timedelta(days=1)).date().isoformat()),
+        ('created', datetime.now().isoformat(timespec='seconds')),
+    ])
+    conn.commit()
+    conn.close()
+    print(f"✅ Stand-in database {path}: {sum(counts.values()):,} rows in {time_module.time() - started:.0f}s"
+          f" ({os.path.getsize(path) / 2**20:,.0f} MB)")
+    return counts
+
+
+def read_info(path):
+    """BENCH_INFO of a stand-in database ({} if it is missing or not one)"""
+    if not os.path.exists(path):
+        return {}
+    conn = sqlite3.connect(path)
+    try:
+        return dict(conn.execute("SELECT NAME, VAL FROM BENCH_INFO").fetchall())
+    except sqlite3.Error:
+        return {}
+    finally:
+        conn.close()
+
+
+def ensure_database(path, allitem_rows, seed=42, end_date=None):
+    """Generate the stand-in database at path unless it already holds exactly these parameters"""
+    info = read_info(path)
+    wanted = {'seed': str(seed), 'allitem_rows': str(allitem_rows),
+              'end_date': (end_date or date.today()).isoformat()}
+    if all(info.get(key) == value for key, value in wanted.items()):
+        return path
+    generate(path, allitem_rows, seed, end_date)
+    return path
@@ -14,12 +14,117 @@ DATABASE_CONFIG = {
 # Prefer ODBC for much faster data loading (~3x). Set USE_ODBC=0 to use direct InterBase only.
 USE_ODBC = os.getenv('USE_ODBC', '1').strip().lower() in ('1', 'true', 'yes')
 
+# Database backend: 'interbase' (production: ODBC, then direct) or 'sqlite', a local stand-in file with
+# the same eight tables for offline benchmarks (create it with: python -m bench generate).
+DB_BACKEND = os.getenv('DB_BACKEND', 'interbase').strip().lower()
+SQLITE_DATABASE = os.getenv('SQLITE_DATABASE', '').strip() or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'bench_data', 'standin.db'
+)
+
 # ODBC driver name: "InterBase ODBC Driver" (free Embarcadero) or "Devart ODBC Driver for InterBase" (paid)
 ODBC_DRIVER = os.getenv('IB_ODBC_DRIVER', "InterBase ODBC Driver")
 
 # ODBC DSN: if set, connect using this Data Source Name (e.g. "INTERBASE IBA") instead of driver + host/path
 ODBC_DSN = os.getenv('IB_ODBC_DSN', "INTERBASE IBA").strip() or None
 
+# Parallel table loading: each table is pulled on its own connection by a bounded worker pool.
+# Set LOAD_PARALLEL=0 to load tables one after another (previous behaviour).
+LOAD_PARALLEL = os.getenv('LOAD_PARALLEL', '1').strip().lower() in ('1', 'true', 'yes')
+
+# Maximum number of tables loaded at the same time (= concurrent database connections)
+LOAD_MAX_WORKERS = max(1, int(os.getenv('LOAD_MAX_WORKERS', '4')))
+
+# Connection pool: open connections are reused across tables, reloads and queries.
+# DB_POOL_SIZE caps connections per driver (default: one per load worker plus one spare);
+# a connection idle longer than DB_POOL_IDLE_CHECK_SECONDS is health-checked before reuse.
+DB_POOL_SIZE = max(1, int(os.getenv('DB_POOL_SIZE', str(LOAD_MAX_WORKERS + 1))))
+DB_POOL_IDLE_CHECK_SECONDS = float(os.getenv('DB_POOL_IDLE_CHECK_SECONDS', '30'))
+
+# Incremental reload: scheduled reloads only fetch new/modified rows of the transaction tables
+# (INVOICE, ITEMS, ALLITEM). A full reload still runs when the last one is older than
+# INCREMENTAL_FULL_RELOAD_HOURS, so deletions and other drift get reconciled.
+INCREMENTAL_RELOAD = os.getenv('INCREMENTAL_RELOAD', '1').strip().lower() in ('1', 'true', 'yes')
+INCREMENTAL_FULL_RELOAD_HOURS = float(os.getenv('INCREMENTAL_FULL_RELOAD_HOURS', '24'))
+
+# Progressive publish during a full load: 'cold' (default) makes each table queryable as soon as
+# it has loaded when the cache does not hold it yet (startup / first load), 'always' also replaces
+# cached tables one by one (reports may then mix tables from two loads), 'off' publishes once at the end.
+PROGRESSIVE_PUBLISH = os.getenv('PROGRESSIVE_PUBLISH', 'cold').strip().lower()
+
+# Memory budget for reloads in MB (0 = no limit). With a budget a full load replaces the cache table
+# by table -- one table fetched at a time, each old table released right after its swap -- instead of
+# building a second complete cache next to the first. A reload whose estimated peak (cache + largest
+# table) exceeds the budget is refused; before each table the load waits up to
+# RELOAD_MEMORY_WAIT_SECONDS for requests still reading replaced tables to finish.
+RELOAD_MEMORY_BUDGET_MB = float(os.getenv('RELOAD_MEMORY_BUDGET_MB', '0'))
+RELOAD_MEMORY_WAIT_SECONDS = float(os.getenv('RELOAD_MEMORY_WAIT_SECONDS', '60'))
+
+# Per-table memory use recorded after every reload (JSON, kept across restarts; see /api/cache-memory)
+MEMORY_HISTORY_FILE = os.getenv('MEMORY_HISTORY_FILE', '').strip() or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache_memory_history.json'
+)
+
+# Loader telemetry: one JSON line per table load (phase timings, rows, bytes, backend; see /api/load-telemetry)
+LOAD_TELEMETRY_FILE = os.getenv('LOAD_TELEMETRY_FILE', '').strip() or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'load_telemetry.jsonl'
+)
+# Telemetry 'bytes' of a load: shallow by default (text columns count as pointers only); 1 measures the
+# strings too, which costs seconds per table on multi-million-row frames (counted in total_seconds).
+# Exact per-table sizes are recorded after each reload either way (/api/cache-memory)
+LOAD_TELEMETRY_DEEP_BYTES = os.getenv('LOAD_TELEMETRY_DEEP_BYTES', '0').strip().lower() in ('1', 'true', 'yes')
+
+# Request journal: with REQUEST_JOURNAL=1 every report request (endpoint, JSON body, status, latency)
+# is appended to REQUEST_JOURNAL_FILE as one compact JSON line, for replay with: python -m bench replay
+REQUEST_JOURNAL = os.getenv('REQUEST_JOURNAL', '0').strip().lower() in ('1', 'true', 'yes')
+REQUEST_JOURNAL_FILE = os.getenv('REQUEST_JOURNAL_FILE', '').strip() or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'request_journal.jsonl'
+)
+
+# Eager tables are pulled by every full load; the other tables are lazy: fetched on first use by a
+# report and kept in the cache while they are used (dropped at a full load once idle for
+# LAZY_TABLE_IDLE_HOURS). EAGER_TABLES=* loads every table eagerly.
+_eager = os.getenv('EAGER_TABLES', 'ALLSTOCK,DETDESCR,INVOICE,ITEMS,SUB,STOCK,ALLITEM').strip()
+EAGER_TABLES = None if _eager == '*' else [t.strip().upper() for t in _eager.split(',') if t.strip()]
+LAZY_TABLE_IDLE_HOURS = float(os.getenv('LAZY_TABLE_IDLE_HOURS', '24'))
+
+# Change detection: before re-pulling a table, compare COUNT(*)/MAX(ID)/MAX(LOGDATE) with the values
+# recorded at its last load and keep the cached rows when they match. Every table still gets a
+# whole reload once per INCREMENTAL_FULL_RELOAD_HOURS. Set CHANGE_DETECTION=0 to always re-pull.
+CHANGE_DETECTION = os.getenv('CHANGE_DETECTION', '1').strip().lower() in ('1', 'true', 'yes')
+
+# Column projection: load only the columns declared in the table manifest and by the reports
+# instead of SELECT *. Set LOAD_COLUMN_PROJECTION=0 to pull every column: /api/custom-report answers
+# 400 for a column that is not loaded, and /api/get-available-columns lists only loaded ones.
+LOAD_COLUMN_PROJECTION = os.getenv('LOAD_COLUMN_PROJECTION', '1').strip().lower() in ('1', 'true', 'yes')
+
+# SQL pushdown for selective reports (sales report, bureau client items): 'auto' runs them as
+# GROUP BY queries in InterBase when their table is not cached or a window of at most
+# PUSHDOWN_MAX_DAYS reaches the day of the last load (fresh intraday numbers); 'always' / 'off'.
+PUSHDOWN_MODE = os.getenv('PUSHDOWN_MODE', 'auto').strip().lower()
+PUSHDOWN_MAX_DAYS = int(os.getenv('PUSHDOWN_MAX_DAYS', '31'))
+# Pushed-down queries share the connection pool with reload workers: a request waits at most this
+# long for a free connection, then answers from the cached tables
+PUSHDOWN_ACQUIRE_TIMEOUT_SECONDS = float(os.getenv('PUSHDOWN_ACQUIRE_TIMEOUT_SECONDS', '5'))
+
+# Stale-while-revalidate: API requests are always answered from the current snapshot; once it is
+# older than CACHE_MAX_AGE_HOURS one background refresh is started, at most every
+# CACHE_REVALIDATE_MIN_INTERVAL_SECONDS so a failing database is not hammered. An empty cache is
+# only loaded by AUTO_LOAD_ON_STARTUP or an explicit request (/api/load-dataframes, /api/auto-refresh-cache).
+CACHE_MAX_AGE_HOURS = float(os.getenv('CACHE_MAX_AGE_HOURS', '1'))
+CACHE_REVALIDATE_MIN_INTERVAL_SECONDS = float(os.getenv('CACHE_REVALIDATE_MIN_INTERVAL_SECONDS', '60'))
+
+# Report results are memoised per cache snapshot (REPORT_CACHE_ENTRIES responses at most); after
+# each reload the REPORT_WARMUP_COUNT most-requested reports are recomputed in the background.
+REPORT_CACHE_ENTRIES = int(os.getenv('REPORT_CACHE_ENTRIES', '64'))
+REPORT_WARMUP_COUNT = int(os.getenv('REPORT_WARMUP_COUNT', '8'))
+
+# Cache snapshot: every successful load is written to disk and restored at startup (warm start),
+# with the database refresh following in the background. Set CACHE_SNAPSHOT=0 to disable.
+CACHE_SNAPSHOT = os.getenv('CACHE_SNAPSHOT', '1').strip().lower() in ('1', 'true', 'yes')
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', '').strip() or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'cache_snapshot'
+)
+
 
 def get_connection_string():
     """Build ODBC connection string for pyodbc. Uses DSN if ODBC_DSN is set, else driver + params."""
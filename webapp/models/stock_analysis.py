@@ -1,22 +1,32 @@
 """Stock analysis and calculation models - REWRITTEN FROM SCRATCH"""
 
+import numpy as np
 import pandas as pd
-from services.database_service import get_dataframes
+from services.database_service import get_cache_snapshot, require_columns
+from services.ledger_service import get_ledger_index, get_stock_summary, add_stock_columns
+
+# Columns read by StockAnalyzer (drives the loader's SELECT list)
+require_columns('inventory_transactions', ['SITE', 'ITEM', 'DEBITQTY', 'CREDITQTY'])
+require_columns('sales_details', ['SITE', 'ITEM', 'FTYPE', 'FDATE', 'QTY', 'QTY1'])
+require_columns('inventory_items', ['ITEM', 'DESCR1', 'CATEGORY', 'POSPRICE1', 'SUNIT'])
+require_columns('sites', ['ID', 'SITE', 'SIDNO'])
+require_columns('categories', ['ID', 'DESCR'])
 
 
 class StockAnalyzer:
     """Simplified stock analysis using exact notebook logic"""
     
     def __init__(self):
-        self.dataframes = get_dataframes()
+        self.snapshot = get_cache_snapshot()
+        self.dataframes = self.snapshot.tables
     
     def calculate_stock_and_sales(self, item_code=None, site_code=None, from_date=None, 
                                  to_date=None, as_of_date=None, site_codes=None, category_id=None):
         """
         Calculate stock and sales using EXACT notebook logic - OPTIMIZED
         """
-        print(f"\n🔍 OPTIMIZED calculate_stock_and_sales:")
-        print(f"   📊 Parameters: item_code={item_code}, site_code={site_code}, from_date={from_date}, to_date={to_date}, as_of_date={as_of_date}")
+        print(f"🔍 calculate_stock_and_sales: item_code={item_code}, site_code={site_code}, "
+              f"from_date={from_date}, to_date={to_date}, as_of_date={as_of_date}")
         
         if not self.dataframes:
             print("   ❌ No dataframes available")
@@ -33,20 +43,15 @@ class StockAnalyzer:
             print("   ❌ Required data not available")
             return None
         
-        print(f"   📊 Data available: inventory={len(inventory_df)}, sales={len(sales_df)}")
-        
-        # Calculate stock first
-        stock_results = self._calculate_stock_simple(inventory_df, item_code, site_code, site_codes, as_of_date)
+        # Stock, transaction counts and depot quantities all come from the (SITE, ITEM) stock
+        # summary, computed once per cache snapshot
+        inventory_summary = self._stock_summary(as_of_date)
+        stock_results = self._calculate_stock_simple(inventory_summary, item_code, site_code, site_codes)
         
         if stock_results.empty:
             print("   ❌ No stock data found")
             return None
         
-        print(f"   📊 Stock results: {len(stock_results)} items")
-        
-        # 🚀 PERFORMANCE OPTIMIZATION: Calculate ALL sales at once instead of item by item
-        print(f"   🚀 Calculating sales for all items at once...")
-        
         # For stock by site reports, if as_of_date is provided but from_date/to_date are not,
         # we need to calculate sales for a reasonable period (e.g., last 30 days)
         if as_of_date and (from_date is None or to_date is None):
@@ -54,13 +59,13 @@ class StockAnalyzer:
             as_of_dt = pd.to_datetime(as_of_date)
             from_date = (as_of_dt - pd.Timedelta(days=30)).strftime('%Y-%m-%d')
             to_date = as_of_date
-            print(f"   📅 Using sales period: {from_date} to {to_date} (30 days from as_of_date)")
         
         # Use sales details with FTYPE logic (1=sale, 2=return -> subtract)
         all_sales = self._calculate_all_sales_optimized(stock_results, from_date, to_date)
         
-        # Merge sales with stock results
-        stock_results = stock_results.merge(all_sales, on=['SITE', 'ITEM'], how='left')
+        # Sales rows are aligned with stock_results (one per SITE/ITEM, same order)
+        for column in all_sales.columns.drop(['SITE', 'ITEM']):
+            stock_results[column] = all_sales[column].to_numpy()
         
         # Fill missing sales values (all columns from optimized calculation)
         stock_results['TOTAL_SALES_QTY'] = stock_results['TOTAL_SALES_QTY'].fillna(0)
@@ -75,77 +80,71 @@ class StockAnalyzer:
         # Calculate average daily sales: total sales ÷ number of days
         stock_results['AVG_DAILY_SALES'] = stock_results['TOTAL_SALES_QTY'] / period_days if period_days > 0 else 0
         
-        # Calculate autonomy using average daily sales
-        def calculate_autonomy(row):
-            current_stock = row['CURRENT_STOCK']
-            avg_daily_sales = row['AVG_DAILY_SALES']
-            if current_stock <= 0:
-                return -1  # No stock
-            elif avg_daily_sales > 0:
-                return current_stock / avg_daily_sales
-            else:
-                return 9999  # Stock but no sales
-        
-        stock_results['STOCK_AUTONOMY_DAYS'] = stock_results.apply(calculate_autonomy, axis=1)
+        # Autonomy: -1 without stock, stock / average daily sales, 9999 for stock that does not sell
+        current_stock = stock_results['CURRENT_STOCK'].to_numpy(dtype='float64')
+        avg_daily_sales = np.broadcast_to(np.asarray(stock_results['AVG_DAILY_SALES'], dtype='float64'),
+                                          current_stock.shape)
+        has_sales = avg_daily_sales > 0
+        with np.errstate(divide='ignore', invalid='ignore'):
+            autonomy = np.select([current_stock <= 0, has_sales], [-1.0, current_stock / avg_daily_sales], 9999.0)
+        # Only the -1 / 9999 markers when nothing sells: whole numbers, as before
+        no_ratio = not (has_sales & ~(current_stock <= 0)).any()
+        stock_results['STOCK_AUTONOMY_DAYS'] = autonomy.astype('int64') if no_ratio else autonomy
         
         # Add master data (with proper categories, prices, and depot quantities)
-        stock_results = self._add_master_data_optimized(stock_results, items_master, sites_master, categories_master)
+        stock_results = self._add_master_data_optimized(stock_results, items_master, sites_master,
+                                                        categories_master)
         
-        print(f"   🎯 Final results: {len(stock_results)} items with sales calculated")
+        print(f"   🎯 {len(stock_results)} site/item rows (ledger {len(inventory_df)}, sales {len(sales_df)})")
         
         return stock_results
     
-    def _calculate_stock_simple(self, inventory_df, item_code, site_code, site_codes, as_of_date):
-        """Simple stock calculation using DEBITQTY and CREDITQTY like stock_by_site report"""
-        
-        print(f"   📊 Calculating stock...")
-        print(f"   📊 Available columns: {list(inventory_df.columns)}")
-        
-        # Apply basic filters
-        df = inventory_df.copy()
-        
+    def _stock_summary(self, as_of_date=None):
+        """Stock per (SITE, ITEM), sorted by SITE, ITEM: the snapshot's stock summary, or with
+        as_of_date (a parsed Timestamp, see the stock-by-site route) the totals up to the end of
+        that day (from the snapshot's ledger index).
+        """
+        if as_of_date:
+            ledger_index = get_ledger_index(self.snapshot)
+            if ledger_index is not None:
+                return add_stock_columns(ledger_index.summary_as_of(as_of_date), self.dataframes.get('sites'))
+            print(f"   ⚠️ ALLITEM has no FDATE column: stock is current, not as of {as_of_date}")
+        return get_stock_summary(self.snapshot)
+    
+    def _calculate_stock_simple(self, inventory_summary, item_code, site_code, site_codes):
+        """Stock per (SITE, ITEM) as DEBITQTY - CREDITQTY, like the stock_by_site report.
+
+        Filters apply to the (SITE, ITEM) totals: they select whole groups, so this equals
+        filtering the ledger rows first. STOCK_TRANSACTIONS and DEPOT_QUANTITY are carried along
+        for the master data step.
+        """
+        summary = inventory_summary
         if item_code:
-            df = df[df['ITEM'] == item_code]
+            summary = summary[summary['ITEM'] == item_code]
         if site_code:
-            df = df[df['SITE'] == site_code]
+            summary = summary[summary['SITE'] == site_code]
         if site_codes and isinstance(site_codes, list):
-            df = df[df['SITE'].isin(site_codes)]
+            summary = summary[summary['SITE'].isin(site_codes)]
         
-        if df.empty:
+        if summary.empty:
             return pd.DataFrame()
         
-        print(f"   📊 After filters: {len(df)} inventory records")
-        
-        # Fill NaN values with 0 for calculations (same as stock_by_site)
-        df['DEBITQTY'] = df['DEBITQTY'].fillna(0)
-        df['CREDITQTY'] = df['CREDITQTY'].fillna(0)
-        
-        # Group by SITE and ITEM, calculate stock as DEBITQTY - CREDITQTY (same as stock_by_site)
-        stock_summary = df.groupby(['SITE', 'ITEM']).agg({
-            'DEBITQTY': 'sum',
-            'CREDITQTY': 'sum'
-        }).reset_index()
-        
-        # Calculate current stock: DEBITQTY (incoming) - CREDITQTY (outgoing)
-        stock_summary['CURRENT_STOCK'] = stock_summary['DEBITQTY'] - stock_summary['CREDITQTY']
-        
-        # Add additional columns for compatibility
-        stock_summary['TOTAL_IN'] = stock_summary['DEBITQTY']
-        stock_summary['TOTAL_OUT'] = stock_summary['CREDITQTY']
-        
-        # Drop the temporary columns
-        stock_summary = stock_summary[['SITE', 'ITEM', 'CURRENT_STOCK', 'TOTAL_IN', 'TOTAL_OUT']]
+        stock_summary = pd.DataFrame({
+            'SITE': summary['SITE'],
+            'ITEM': summary['ITEM'],
+            # Current stock: DEBITQTY (incoming) - CREDITQTY (outgoing)
+            'CURRENT_STOCK': summary['CURRENT_STOCK'],
+            'TOTAL_IN': summary['DEBITQTY'],
+            'TOTAL_OUT': summary['CREDITQTY'],
+            'STOCK_TRANSACTIONS': summary['STOCK_TRANSACTIONS'],
+            'DEPOT_QUANTITY': summary['DEPOT_QUANTITY'],
+        })
 
         # Exclude rows with missing or empty ITEM (avoids "ghost" rows and JSON/merge issues)
-        item_ok = stock_summary['ITEM'].notna() & (stock_summary['ITEM'].astype(str).str.strip() != '')
-        stock_summary = stock_summary.loc[item_ok].reset_index(drop=True)
-
-        print(f"   📊 Stock summary: {len(stock_summary)} unique item/site combinations")
-        print(f"   📊 Sample stock calculations:")
-        for idx, row in stock_summary.head(3).iterrows():
-            print(f"      SITE={row['SITE']}, ITEM={row['ITEM']}, IN={row['TOTAL_IN']}, OUT={row['TOTAL_OUT']}, STOCK={row['CURRENT_STOCK']}")
-        
-        return stock_summary
+        items = stock_summary['ITEM']
+        blank_items = [item for item in items.dropna().unique() if str(item).strip() == '']
+        item_ok = items.notna() & ~items.isin(blank_items)
+        return stock_summary.loc[item_ok].reset_index(drop=True)
     
     def _calculate_period_days(self, from_date, to_date):
         """Calculate period days"""
@@ -158,9 +157,6 @@ class StockAnalyzer:
     def _calculate_all_sales_optimized(self, stock_results, from_date, to_date):
         """Calculate sales using sales_details with FTYPE handling (1=sale, 2=return -> subtract)."""
         
-        print(f"   📊 Optimized sales calculation for {len(stock_results)} items...")
-        print(f"   📊 Using sales_details with FTYPE (1 sale, 2 return) for sales calculation")
-        
         # Get unique site/item combinations from stock results
         stock_items = stock_results[['SITE', 'ITEM']].copy()
         
@@ -181,7 +177,7 @@ class StockAnalyzer:
             stock_items['MIN_DAILY_SALES'] = 0
             return stock_items
         
-        df = sales_df.copy()
+        df = sales_df
         
         # No fallback joins; rely strictly on sales_details content
         
@@ -194,10 +190,9 @@ class StockAnalyzer:
             stock_items['MIN_DAILY_SALES'] = 0
             return stock_items
         
-        # Date filter
+        # Date filter (FDATE is datetime64 since load)
         if 'FDATE' in df.columns:
             try:
-                df['FDATE'] = pd.to_datetime(df['FDATE'], errors='coerce')
                 df = df[(df['FDATE'] >= pd.to_datetime(from_date)) & (df['FDATE'] <= pd.to_datetime(to_date))]
             except Exception as e:
                 print(f"   ⚠️ Error parsing FDATE for sales filter: {e}")
@@ -220,15 +215,18 @@ class StockAnalyzer:
             stock_items['MAX_DAILY_SALES'] = 0
             stock_items['MIN_DAILY_SALES'] = 0
             return stock_items
-        df[qty_col] = df[qty_col].fillna(0)
         
         # Apply FTYPE logic strictly: include only 1 or 2; 1 = +, 2 = -
         df = df[df['FTYPE'].isin([1, 2])]
-        df['SIGNED_QTY'] = df.apply(lambda r: r[qty_col] if r['FTYPE'] == 1 else -r[qty_col], axis=1)
+        qty = df[qty_col]
+        columns = {'SITE': df['SITE'], 'ITEM': df['ITEM'], qty_col: qty,
+                   'SIGNED_QTY': qty.where(df['FTYPE'] == 1, -qty)}
+        if 'FDATE' in df.columns:
+            columns['FDATE_ONLY'] = df['FDATE'].dt.normalize()
+        df = pd.DataFrame(columns)
         
         # Compute daily sales when dates are available
-        if 'FDATE' in df.columns:
-            df['FDATE_ONLY'] = df['FDATE'].dt.date
+        if 'FDATE_ONLY' in df.columns:
             daily_sales = df.groupby(['SITE', 'ITEM', 'FDATE_ONLY']).agg({'SIGNED_QTY': 'sum'}).reset_index()
             daily_stats = daily_sales.groupby(['SITE', 'ITEM']).agg({'SIGNED_QTY': ['max', 'min']}).reset_index()
             daily_stats.columns = ['SITE', 'ITEM', 'MAX_DAILY_SALES', 'MIN_DAILY_SALES']
@@ -250,23 +248,33 @@ class StockAnalyzer:
         # Merge with stock items to include items with no sales
         result = stock_items.merge(sales_summary, on=['SITE', 'ITEM'], how='left')
         
-        print(f"   📊 Sales calculated (FTYPE-aware): {len(sales_summary)} items have sales, {len(result)} total items")
-        
-        # Debug for F858
-        f858_sales = result[(result['ITEM'] == 'F858') & (result['TOTAL_SALES_QTY'] > 0)]
-        if not f858_sales.empty:
-            for idx, row in f858_sales.iterrows():
-                print(f"   🔍 F858 FOUND: SITE={row['SITE']}, SALES={row['TOTAL_SALES_QTY']}, MAX_DAILY={row['MAX_DAILY_SALES']}")
-        
         return result
     
+    def _lookup(self, results_df, key, master, master_key):
+        """Left join of master's other columns onto results_df, each distinct key looked up once.
+
+        Returns None when the join could add or reorder rows (duplicate or missing keys, or key
+        types that differ); the caller merges instead.
+        """
+        if not master[master_key].is_unique or master[master_key].dtype != results_df[key].dtype:
+            return None
+        codes, uniques = pd.factorize(results_df[key])
+        if (codes < 0).any():
+            return None
+        matched = master.set_index(master_key).reindex(uniques)
+        looked_up = results_df.copy(deep=False)
+        for column in matched.columns:
+            looked_up[column] = matched[column].iloc[codes].to_numpy()
+        return looked_up
+    
     def _add_master_data_optimized(self, results_df, items_master, sites_master, categories_master):
         """Add item names, site names, categories, prices, and depot quantities"""
         
         # Add item names, categories, and prices
         if items_master is not None:
             items_subset = items_master[['ITEM', 'DESCR1', 'CATEGORY', 'POSPRICE1', 'SUNIT']].drop_duplicates()
-            results_df = results_df.merge(items_subset, on='ITEM', how='left')
+            looked_up = self._lookup(results_df, 'ITEM', items_subset, 'ITEM')
+            results_df = looked_up if looked_up is not None else results_df.merge(items_subset, on='ITEM', how='left')
             results_df.rename(columns={'DESCR1': 'ITEM_NAME'}, inplace=True)
         else:
             results_df['ITEM_NAME'] = 'Unknown Item'
@@ -283,17 +291,22 @@ class StockAnalyzer:
             results_df['CATEGORY'] = results_df['CATEGORY'].astype(str)
             categories_subset['CATEGORY'] = categories_subset['CATEGORY'].astype(str)
             
-            results_df = results_df.merge(categories_subset, on='CATEGORY', how='left')
+            looked_up = self._lookup(results_df, 'CATEGORY', categories_subset, 'CATEGORY')
+            results_df = looked_up if looked_up is not None else results_df.merge(categories_subset, on='CATEGORY', how='left')
         else:
             results_df['CATEGORY_NAME'] = 'General'
         
         # Add site names  
         if sites_master is not None and 'SITE' in sites_master.columns:
             sites_subset = sites_master[['ID', 'SITE']].drop_duplicates()
-            results_df = results_df.merge(sites_subset, left_on='SITE', right_on='ID', how='left')
-            results_df.rename(columns={'SITE_y': 'SITE_NAME'}, inplace=True)
-            results_df.rename(columns={'SITE_x': 'SITE'}, inplace=True)
-            results_df.drop('ID', axis=1, inplace=True, errors='ignore')
+            looked_up = self._lookup(results_df, 'SITE', sites_subset.rename(columns={'SITE': 'SITE_NAME'}), 'ID')
+            if looked_up is not None:
+                results_df = looked_up
+            else:
+                results_df = results_df.merge(sites_subset, left_on='SITE', right_on='ID', how='left')
+                results_df.rename(columns={'SITE_y': 'SITE_NAME'}, inplace=True)
+                results_df.rename(columns={'SITE_x': 'SITE'}, inplace=True)
+                results_df.drop('ID', axis=1, inplace=True, errors='ignore')
         else:
             results_df['SITE_NAME'] = results_df['SITE']
         
@@ -307,62 +320,9 @@ class StockAnalyzer:
         # Calculate stock value (current stock × price)
         results_df['STOCK_VALUE'] = results_df['CURRENT_STOCK'] * results_df['POSPRICE1']
         
-        # Calculate depot quantities using the same approach as notebook
-        if sites_master is not None and 'SIDNO' in sites_master.columns:
-            try:
-                # Get depot sites where SIDNO = '3700004' (string value)
-                depot_sites_info = sites_master[sites_master['SIDNO'] == '3700004'].copy()
-                
-                if not depot_sites_info.empty:
-                    depot_site_ids = depot_sites_info['ID'].tolist()
-                    
-                    # Get inventory transactions for depot sites only
-                    inventory_df = self.dataframes.get('inventory_transactions')
-                    if inventory_df is not None:
-                        df_depot = inventory_df[inventory_df['SITE'].isin(depot_site_ids)].copy()
-                        
-                        if not df_depot.empty:
-                            # Fill NaN values and calculate depot quantities by item
-                            df_depot['DEBITQTY'] = df_depot['DEBITQTY'].fillna(0)
-                            df_depot['CREDITQTY'] = df_depot['CREDITQTY'].fillna(0)
-                            
-                            # Calculate depot quantities by item (sum across all depot sites)
-                            depot_qty = df_depot.groupby('ITEM').agg({
-                                'DEBITQTY': 'sum',
-                                'CREDITQTY': 'sum'
-                            }).reset_index()
-                            
-                            depot_qty['DEPOT_QUANTITY'] = depot_qty['DEBITQTY'] - depot_qty['CREDITQTY']
-                            
-                            # Create dictionary for easy lookup
-                            depot_dict = dict(zip(depot_qty['ITEM'], depot_qty['DEPOT_QUANTITY']))
-                            
-                            # Add depot quantity column to results_df
-                            results_df['DEPOT_QUANTITY'] = results_df['ITEM'].map(depot_dict).fillna(0)
-                        else:
-                            results_df['DEPOT_QUANTITY'] = 0
-                    else:
-                        results_df['DEPOT_QUANTITY'] = 0
-                else:
-                    results_df['DEPOT_QUANTITY'] = 0
-            except Exception as e:
-                print(f"   ⚠️ Error calculating depot quantities: {e}")
-                results_df['DEPOT_QUANTITY'] = 0
-        else:
-            results_df['DEPOT_QUANTITY'] = 0
-        
-        # Count stock transactions (from inventory transactions)
-        try:
-            inventory_df = self.dataframes.get('inventory_transactions')
-            if inventory_df is not None:
-                # Count transactions for each SITE/ITEM combination
-                transaction_counts = inventory_df.groupby(['SITE', 'ITEM']).size().reset_index(name='STOCK_TRANSACTIONS')
-                results_df = results_df.merge(transaction_counts, on=['SITE', 'ITEM'], how='left')
-                results_df['STOCK_TRANSACTIONS'] = results_df['STOCK_TRANSACTIONS'].fillna(0)
-            else:
-                results_df['STOCK_TRANSACTIONS'] = 0
-        except Exception as e:
-            print(f"   ⚠️ Error counting transactions: {e}")
-            results_df['STOCK_TRANSACTIONS'] = 0
+        # Depot quantity per item and stock transactions per SITE/ITEM (both from the stock
+        # summary), as the last columns
+        results_df['DEPOT_QUANTITY'] = results_df.pop('DEPOT_QUANTITY')
+        results_df['STOCK_TRANSACTIONS'] = results_df.pop('STOCK_TRANSACTIONS')
         
         return results_df
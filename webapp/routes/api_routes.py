@@ -1,18 +1,51 @@
 """API routes for data operations"""
 
-from flask import Blueprint, request, jsonify
+import json
+import threading
+import time as time_module
+from collections import Counter
+from datetime import date
+from functools import wraps
+
+from flask import Blueprint, request, jsonify, current_app, make_response, url_for, g
 import pandas as pd
 import numpy as np
+from config.database import REPORT_CACHE_ENTRIES, REPORT_WARMUP_COUNT, PUSHDOWN_MODE, REQUEST_JOURNAL
 from services.database_service import (
-    load_dataframes, get_dataframes, is_cache_loading, get_cache_lock,
-    get_cache_timestamp, get_cache_age_seconds,
+    TABLES, load_dataframes, refresh_dataframes_incremental, get_dataframes, is_cache_loading, get_cache_lock,
+    get_cache_timestamp, get_cache_age_seconds, get_last_full_load, get_cache_snapshot,
+    get_retired_snapshot_count, get_pool_stats,
     start_scheduled_reload, stop_scheduled_reload, is_scheduled_reload_enabled,
-    get_scheduled_reload_times
+    get_scheduled_reload_times, require_columns, set_table_intervals, get_table_intervals,
+    get_table_refresh_times, save_scheduled_reload_config, get_change_detection_status,
+    get_cache_version, register_post_reload_hook, get_post_reload_hook_status,
+    start_load_job, get_load_job, get_load_jobs, get_load_progress, get_active_load_job_id,
+    get_cache_freshness, revalidate_if_stale, ensure_tables, get_table_usage, get_cached_column_names,
+    get_cache_memory, get_memory_report
 )
+from services.scheduler_service import get_jobs
+from services.snapshot_service import get_snapshot_info
+from services.memory_service import get_memory_history
+from services.telemetry_service import get_load_telemetry
+from services.journal_service import record_request
+from services.ledger_service import get_stock_summary
+from services.pushdown_service import should_push_down, sales_report_aggregates, client_item_quantities
 from models.stock_analysis import StockAnalyzer
 
 api_bp = Blueprint('api', __name__, url_prefix='/api')
 
+# Columns the report endpoints below read from the cache (drives the loader's SELECT list)
+require_columns('sites', ['ID', 'SITE', 'SIDNO'])
+require_columns('categories', ['ID', 'DESCR'])
+require_columns('invoice_headers', ['ID', 'FTYPE', 'SID', 'SITE', 'FDATE', 'NET', 'SUBTOTAL', 'VAT', 'OTHER'])
+require_columns('sales_details', [
+    'ITEM', 'SITE', 'SID', 'MID', 'FTYPE', 'FDATE', 'QTY', 'QTY1',
+    'CREDITQTY', 'DEBITQTY', 'CREDITUS', 'DEBITUS', 'CREDITVATAMOUNT', 'DEBITVATAMOUNT', 'DISCOUNT'
+])
+require_columns('accounts', ['SID', 'SNAME', 'CONTACT'])
+require_columns('inventory_items', ['ITEM', 'DESCR1', 'CATEGORY', 'POSPRICE1', 'VAT', 'NWEIGHT'])
+require_columns('inventory_transactions', ['SITE', 'ITEM', 'DEBITQTY', 'CREDITQTY'])
+
 
 def _sanitize_for_json(obj):
     """Convert list of dicts from DataFrame to JSON-serializable form (no NaN, no numpy types)."""
@@ -34,47 +67,333 @@ def _sanitize_for_json(obj):
     return obj
 
 
+def _frame_records(df, sanitize=False):
+    """df.to_dict('records'), built column by column (much faster on wide results).
+
+    With sanitize the values are those of _sanitize_for_json(df.to_dict('records')): None for
+    NaN/NaT, plain Python numbers, timestamps as strings.
+    """
+    if len(df.columns) == 0:
+        return [{} for _ in range(len(df))]
+    columns = []
+    for name in df.columns:
+        series = df[name]
+        values = series.tolist()
+        if series.dtype == object:
+            if sanitize:
+                missing = series.isna().to_numpy()
+                values = [None if gone else (value if isinstance(value, str) else _sanitize_for_json(value))
+                          for value, gone in zip(values, missing)]
+            else:
+                values = [value.item() if isinstance(value, np.generic) else value for value in values]
+        elif sanitize:
+            if series.dtype.kind in 'mM':
+                values = [None if pd.isna(value) else str(value) for value in values]
+            elif series.dtype.kind in 'fc' and series.isna().any():
+                values = [None if value != value else value for value in values]
+        columns.append(values)
+    return [dict(zip(df.columns, row)) for row in zip(*columns)]
+
+
+# Report responses memoised per cache snapshot. Request bodies are counted so the post-reload
+# hook can recompute the most-used reports against a new snapshot before users ask for them.
+WARMUP_HEADER = 'X-Report-Warmup'
+_report_usage = Counter()  # (path, canonical JSON body) -> requests
+_report_usage_lock = threading.Lock()
+_report_cache_lock = threading.Lock()
+
+
+def _report_cache_key(path, body):
+    # Reports default missing dates to today, so a memoised answer is valid for one day
+    return (path, body, date.today().isoformat())
+
+
+def snapshot_cached_report(view):
+    """Serve repeated POST report requests from the snapshot's memo (same body, same cache version).
+
+    Only successful in-memory results are kept: a view that answered from live database rows
+    sets g.report_execution to something other than 'memory' (e.g. 'pushdown').
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        data = request.get_json(silent=True)
+        if REPORT_CACHE_ENTRIES <= 0 or not isinstance(data, dict):
+            return view(*args, **kwargs)
+        body = json.dumps(data, sort_keys=True, default=str)
+        if not request.headers.get(WARMUP_HEADER):
+            with _report_usage_lock:
+                _report_usage[(request.path, body)] += 1
+                if len(_report_usage) > 50 * REPORT_WARMUP_COUNT + 100:
+                    top = _report_usage.most_common(10 * REPORT_WARMUP_COUNT)
+                    _report_usage.clear()
+                    _report_usage.update(dict(top))
+
+        snapshot = get_cache_snapshot()
+        if not snapshot.tables:
+            return view(*args, **kwargs)
+        responses = snapshot.derived('report_responses', dict)
+        key = _report_cache_key(request.path, body)
+        cached = responses.get(key)
+        if cached is not None:
+            return current_app.response_class(cached, mimetype='application/json')
+
+        response = make_response(view(*args, **kwargs))
+        if response.status_code == 200 and len(responses) < REPORT_CACHE_ENTRIES \
+                and g.get('report_execution', 'memory') == 'memory':
+            with _report_cache_lock:
+                responses.setdefault(key, response.get_data())
+        return response
+    return wrapper
+
+
+# Cache tables each report reads: view name -> (required keys, keys it can push down to SQL instead)
+REPORT_TABLES = {}
+
+# View names of every report (report_tables or body_table): the endpoints the request journal records
+REPORT_ENDPOINTS = set()
+
+
+def report_tables(*tables, pushdown=()):
+    """Declare the cached tables a report reads, so it can answer as soon as they are loaded.
+
+    While a load is running and one of them is not published yet, the request gets 503 with
+    Retry-After and the load progress instead of failing on a missing table. Tables listed
+    in pushdown are not waited for unless PUSHDOWN_MODE=off or the request asks for
+    "source": "cache": without them the report runs as SQL in InterBase (see should_push_down).
+    Lazy tables (outside EAGER_TABLES) are fetched before the first report that needs them.
+    """
+    def decorator(view):
+        REPORT_TABLES[view.__name__] = (tuple(tables), tuple(pushdown))
+        REPORT_ENDPOINTS.add(view.__name__)
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            data = request.get_json(silent=True)
+            pushdown_allowed = not (isinstance(data, dict) and data.get('source') == 'cache')
+            # Before get_dataframes() pins this request's snapshot, so a lazy load is visible.
+            # Warm-up replays neither count as use nor bring back a lazy table dropped as idle.
+            if not request.headers.get(WARMUP_HEADER):
+                ensure_tables(tables)
+            missing = _missing_report_tables(view.__name__, get_dataframes(), pushdown_allowed)
+            if not missing:
+                return view(*args, **kwargs)
+            if is_cache_loading():
+                progress = get_load_progress()
+                response = jsonify({
+                    'status': 'loading',
+                    'error': f"Data still loading: {', '.join(missing)}",
+                    'missing_tables': missing,
+                    'progress': {TABLES[key]: progress['tables'].get(TABLES[key]) for key in missing},
+                })
+                response.status_code = 503
+                response.headers['Retry-After'] = '5'
+                return response
+            if len(missing) < len(tables):
+                return jsonify({'error': f"Tables not loaded: {', '.join(missing)}. Please reload the data.",
+                                'missing_tables': missing}), 400
+            return view(*args, **kwargs)  # nothing loaded: the report's own message
+        return wrapper
+    return decorator
+
+
+def body_table(field):
+    """For reports whose table comes from the request body: fetch it first if it is lazy."""
+    def decorator(view):
+        REPORT_ENDPOINTS.add(view.__name__)
+
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            data = request.get_json(silent=True)
+            if isinstance(data, dict) and data.get(field) in TABLES and not request.headers.get(WARMUP_HEADER):
+                ensure_tables([data[field]])
+            return view(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _missing_report_tables(view_name, dataframes, pushdown_allowed=True):
+    tables, pushdown = REPORT_TABLES[view_name]
+    waived = set(pushdown) if pushdown_allowed and PUSHDOWN_MODE != 'off' else set()
+    return [key for key in tables if key not in waived and dataframes.get(key) is None]
+
+
+def get_report_readiness(dataframes):
+    """view name -> True when every table the report needs is published"""
+    return {name: not _missing_report_tables(name, dataframes) for name in REPORT_TABLES}
+
+
+def _warm_up_reports(app, snapshot):
+    """Post-reload hook: recompute the most-requested reports against the new snapshot."""
+    with _report_usage_lock:
+        top = [entry for entry, _ in _report_usage.most_common(REPORT_WARMUP_COUNT)]
+    client = app.test_client()
+    for path, body in top:
+        if get_cache_version() != snapshot.version:
+            return  # superseded; the next snapshot runs its own warm-up
+        client.post(path, data=body, content_type='application/json', headers={WARMUP_HEADER: '1'})
+    if top:
+        print(f"🔥 Warmed {len(top)} report(s) for cache version {snapshot.version}")
+
+
+@api_bp.after_app_request
+def _add_cache_headers(response):
+    """Tell clients which snapshot answered and how stale it was (requests that read the cache)."""
+    snapshot = g.get('cache_snapshot')
+    if snapshot is not None:
+        freshness = get_cache_freshness(snapshot)
+        response.headers['X-Cache-Version'] = str(snapshot.version)
+        response.headers['X-Cache-State'] = freshness['state']
+        if freshness['age_seconds'] is not None:
+            response.headers['X-Cache-Age'] = str(int(freshness['age_seconds']))
+        if freshness['revalidating'] or freshness['revalidation_job_id']:
+            response.headers['X-Cache-Revalidating'] = '1'
+    return response
+
+
+@api_bp.before_request
+def _start_request_clock():
+    g.request_started = time_module.perf_counter()
+
+
+@api_bp.after_request
+def _journal_report_request(response):
+    """REQUEST_JOURNAL=1: log report requests (not warm-up replays) for python -m bench replay."""
+    if REQUEST_JOURNAL and request.endpoint and request.endpoint.rsplit('.', 1)[-1] in REPORT_ENDPOINTS \
+            and not request.headers.get(WARMUP_HEADER) and 'request_started' in g:
+        record_request(request.method, request.path, request.get_json(silent=True), response.status_code,
+                       time_module.perf_counter() - g.request_started)
+    return response
+
+
+@api_bp.record_once
+def _register_report_warmup(state):
+    register_post_reload_hook('report warm-up', lambda snapshot: _warm_up_reports(state.app, snapshot))
+
+
 @api_bp.route('/load-dataframes', methods=['POST'])
 def api_load_dataframes():
-    """Load dataframes from database
+    """Start a background load job and return its id at once (202)
     
-    Thread-safe: Uses lock to prevent concurrent loads.
-    If another load is in progress, returns immediately.
+    Poll /api/load-jobs/<job_id> for per-table progress. Only one load runs at a time: while
+    a job is running its id is returned with status "loading".
+    Optional JSON body {"mode": "incremental"} fetches only new/modified transaction rows;
+    {"mode": "tables", "tables": ["INVOICE"]} reloads the listed tables;
+    {"force": true} re-pulls tables even when their fingerprint is unchanged;
+    {"wait": true} blocks until the load is done (scripts).
     """
     try:
-        print(f"📡 API load-dataframes called. Current cache_loading: {is_cache_loading()}")
+        data = request.get_json(silent=True) or {}
+        mode = data.get('mode') or 'full'
+        force = bool(data.get('force'))
+        print(f"📡 API load-dataframes called (mode={mode}). Current cache_loading: {is_cache_loading()}")
         
-        # Check if already loading (quick check without lock first)
-        if is_cache_loading():
-            print("⏳ Cache loading already in progress")
-            return jsonify({'status': 'loading', 'message': 'Cache loading already in progress'})
+        if data.get('wait'):
+            return _load_dataframes_blocking(mode, force)
         
-        # load_dataframes() will acquire lock internally and check again
-        print("🚀 Starting dataframes loading...")
-        result = load_dataframes()
+        try:
+            job, started = start_load_job(mode, force=force, tables=data.get('tables'))
+        except RuntimeError as e:
+            print("⏳ Cache loading already in progress")
+            return jsonify({'status': 'loading', 'message': str(e)})
+        except ValueError as e:
+            return jsonify({'status': 'error', 'message': str(e)}), 400
         
-        if result and len(result) > 0:
-            print(f"✅ Successfully loaded {len(result)} dataframes")
-            return jsonify({
-                'status': 'success', 
-                'message': f'Successfully loaded {len(result)} tables',
-                'tables': list(result.keys())
-            })
-        else:
-            print("❌ No dataframes were loaded")
-            return jsonify({'status': 'error', 'message': 'No tables were loaded successfully'}), 500
+        return jsonify({
+            'status': 'started' if started else 'loading',
+            'message': 'Load started' if started else 'Cache loading already in progress',
+            'job_id': job['id'],
+            'status_url': url_for('api.api_load_job', job_id=job['id'])
+        }), 202 if started else 200
             
     except Exception as e:
         error_msg = str(e)
         print(f"❌ Error in api_load_dataframes: {error_msg}")
         return jsonify({'status': 'error', 'message': error_msg}), 500
 
+def _load_dataframes_blocking(mode, force):
+    """Run the load inline (holds this request thread until it finishes)"""
+    # Check if already loading (quick check without lock first)
+    if is_cache_loading():
+        print("⏳ Cache loading already in progress")
+        return jsonify({'status': 'loading', 'message': 'Cache loading already in progress'})
+    
+    # load_dataframes() will acquire lock internally and check again
+    print("🚀 Starting dataframes loading...")
+    result = refresh_dataframes_incremental() if mode == 'incremental' else load_dataframes(force=force)
+    if result is None:
+        return jsonify({'status': 'loading', 'message': 'Cache loading already in progress'})
+    
+    if result and len(result) > 0:
+        print(f"✅ Successfully loaded {len(result)} dataframes")
+        return jsonify({
+            'status': 'success', 
+            'message': f'Successfully loaded {len(result)} tables',
+            'tables': list(result.keys())
+        })
+    else:
+        print("❌ No dataframes were loaded")
+        return jsonify({'status': 'error', 'message': 'No tables were loaded successfully'}), 500
+
+@api_bp.route('/cache-memory')
+def api_cache_memory():
+    """Deep memory use per table and column (dtype, cardinality, savings hints) and its history
+
+    Query parameters: table (InterBase name, e.g. ITEMS) to profile one table,
+    history (number of recent reloads to return, default 50; 0 = all).
+    """
+    table_name = request.args.get('table')
+    table_name = table_name.upper() if table_name else None
+    if table_name and table_name not in TABLES.values():
+        return jsonify({'status': 'error', 'message': f'Unknown table: {table_name}'}), 400
+    try:
+        history_limit = int(request.args.get('history', 50))
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'history must be an integer'}), 400
+    report = get_memory_report(table_name)
+    report['history'] = get_memory_history(history_limit)
+    return jsonify(report)
+
+@api_bp.route('/load-telemetry')
+def api_load_telemetry():
+    """Per-table load timings (connect, query, fetch, frame), rows/sec trend and load runs
+
+    Query parameters: table (InterBase name), days (default 30), limit (raw records and
+    load runs returned, default 200).
+    """
+    table_name = request.args.get('table')
+    try:
+        days = float(request.args.get('days', 30))
+        limit = int(request.args.get('limit', 200))
+    except ValueError:
+        return jsonify({'status': 'error', 'message': 'days and limit must be numbers'}), 400
+    return jsonify(get_load_telemetry(table_name.upper() if table_name else None, days, limit))
+
+@api_bp.route('/table-usage')
+def api_table_usage():
+    """Every cache table: eager or lazy, loaded, rows, how often reports used it and when last"""
+    return jsonify({'tables': get_table_usage()})
+
+@api_bp.route('/load-jobs')
+def api_load_jobs():
+    """Recent load jobs and the progress of the current load"""
+    return jsonify({'jobs': get_load_jobs(), 'progress': get_load_progress()})
+
+@api_bp.route('/load-jobs/<job_id>')
+def api_load_job(job_id):
+    """Status of a load job: queued/running/done/skipped/failed, with per-table rows, rows/sec and ETA"""
+    job = get_load_job(job_id)
+    if job is None:
+        return jsonify({'status': 'error', 'message': f'Unknown load job: {job_id}'}), 404
+    return jsonify(job)
+
 @api_bp.route('/cache-status')
 def api_cache_status():
     """Get cache status"""
-    dataframes = get_dataframes()
+    snapshot = get_cache_snapshot()
+    dataframes = snapshot.tables
     cache_age = get_cache_age_seconds()
     cache_timestamp = get_cache_timestamp()
+    last_full_load = get_last_full_load()
     
     response = {
         'cached': len(dataframes) > 0,
@@ -82,50 +401,71 @@ def api_cache_status():
         'tables': list(dataframes.keys()) if dataframes else [],
         'table_count': len(dataframes),
         'cache_age_seconds': cache_age if cache_age is not None else 0,
-        'cache_timestamp': cache_timestamp.isoformat() if cache_timestamp else None
+        'cache_timestamp': cache_timestamp.isoformat() if cache_timestamp else None,
+        'last_full_load': last_full_load.isoformat() if last_full_load else None,
+        'snapshot_created': (get_snapshot_info() or {}).get('created'),
+        'cache_version': snapshot.version,
+        'active_readers': snapshot.readers,
+        'retired_versions_in_use': get_retired_snapshot_count(),
+        'connection_pool': get_pool_stats(),
+        'load_job_id': get_active_load_job_id(),
+        'freshness': get_cache_freshness(snapshot),
+        'reports_ready': get_report_readiness(dataframes),
+        'memory': get_cache_memory(),
+        **get_change_detection_status()
     }
+    if response['loading']:
+        response['load_progress'] = get_load_progress()
     
     return jsonify(response)
 
 @api_bp.route('/auto-refresh-cache', methods=['POST'])
 def api_auto_refresh_cache():
-    """Auto-refresh cache if older than specified threshold
+    """Apply the stale-while-revalidate policy and return at once
     
-    Thread-safe: Uses lock to prevent concurrent loads.
+    When the cache is stale (older than CACHE_MAX_AGE_HOURS, or the optional max_age_hours in
+    the body) or empty, one background load job is started (status "started" with its job_id,
+    or "loading" when it is already running). The cache is never reloaded inside this request.
     """
     try:
         # silent=True: Accept requests without Content-Type: application/json (e.g. from jQuery)
         data = request.get_json(silent=True) or {}
-        max_age_hours = data.get('max_age_hours', 1)  # Default 1 hour
+        max_age_hours = data.get('max_age_hours')
+        max_age_seconds = float(max_age_hours) * 3600 if max_age_hours is not None else None
         
-        cache_age = get_cache_age_seconds()
-        max_age_seconds = max_age_hours * 3600  # Convert hours to seconds
+        freshness = revalidate_if_stale(max_age_seconds)
+        cache_age = freshness['age_seconds']
         
-        if cache_age is None or cache_age > max_age_seconds:
-            print(f"🔄 Auto-refresh triggered: cache age {cache_age}s > {max_age_seconds}s threshold")
-            
-            # Quick check without lock first
-            if is_cache_loading():
-                return jsonify({'status': 'loading', 'message': 'Cache refresh already in progress'})
-            
-            # load_dataframes() will acquire lock internally and check again
-            result = load_dataframes()
-            
-            if result and len(result) > 0:
-                return jsonify({
-                    'status': 'refreshed',
-                    'message': f'Cache auto-refreshed successfully',
-                    'tables': list(result.keys()),
-                    'trigger_reason': f'Cache was {cache_age/3600:.1f} hours old'
-                })
-            else:
-                return jsonify({'status': 'error', 'message': 'Auto-refresh failed'}), 500
-        else:
+        if freshness['state'] == 'fresh':
             return jsonify({
                 'status': 'not_needed',
                 'message': f'Cache is fresh (age: {cache_age/3600:.1f} hours)',
-                'cache_age_hours': cache_age/3600
+                'cache_age_hours': cache_age/3600,
+                'freshness': freshness
+            })
+        
+        trigger_reason = f'Cache was {cache_age/3600:.1f} hours old' if cache_age is not None else 'Cache was empty'
+        job_id = freshness['revalidation_job_id']
+        if job_id is None:
+            # A scheduled reload is refreshing it, or the last attempt was moments ago
+            return jsonify({
+                'status': 'loading' if freshness['revalidating'] else 'stale',
+                'message': 'Cache refresh already in progress' if freshness['revalidating']
+                           else 'Cache is stale; refresh retried shortly',
+                'trigger_reason': trigger_reason,
+                'freshness': freshness
             })
+        
+        started = freshness['revalidation_started']
+        print(f"🔄 Auto-refresh: {trigger_reason}, background job {job_id}")
+        return jsonify({
+            'status': 'started' if started else 'loading',
+            'message': 'Cache auto-refresh started' if started else 'Cache refresh already in progress',
+            'job_id': job_id,
+            'status_url': url_for('api.api_load_job', job_id=job_id),
+            'trigger_reason': trigger_reason,
+            'freshness': freshness
+        }), 202 if started else 200
             
     except Exception as e:
         print(f"❌ Error in auto-refresh: {e}")
@@ -136,7 +476,11 @@ def api_scheduled_reload_status():
     """Get scheduled reload status"""
     return jsonify({
         'enabled': is_scheduled_reload_enabled(),
-        'reload_times': get_scheduled_reload_times()
+        'reload_times': get_scheduled_reload_times(),
+        'table_intervals': get_table_intervals(),
+        'jobs': get_jobs(),
+        'post_reload_hooks': get_post_reload_hook_status(),
+        'table_refreshed_at': get_table_refresh_times()
     })
 
 @api_bp.route('/scheduled-reload-control', methods=['POST'])
@@ -149,16 +493,18 @@ def api_scheduled_reload_control():
         data = request.get_json() or {}
         action = data.get('action')  # 'start' or 'stop'
         reload_times = data.get('reload_times')  # Optional list of times
+        table_intervals = data.get('table_intervals')  # Optional {table: minutes}
         
         if action == 'start':
+            if table_intervals is not None:
+                set_table_intervals(table_intervals)
+                save_scheduled_reload_config()
             if reload_times:
-                # Convert string times to time objects
-                from datetime import time
-                times = []
-                for t_str in reload_times:
-                    hour, minute = map(int, t_str.split(':'))
-                    times.append(time(hour, minute))
-                start_scheduled_reload(times)
+                # 'HH:MM' daily times and/or cron expressions, e.g. '*/30 8-18 * * mon-sat'
+                try:
+                    start_scheduled_reload(reload_times)
+                except ValueError as e:
+                    return jsonify({'status': 'error', 'message': str(e)}), 400
                 # Config is automatically saved by start_scheduled_reload()
             else:
                 start_scheduled_reload()
@@ -166,7 +512,8 @@ def api_scheduled_reload_control():
             return jsonify({
                 'status': 'success', 
                 'message': 'Scheduled reload started and saved',
-                'reload_times': reload_times if reload_times else get_scheduled_reload_times()
+                'reload_times': reload_times if reload_times else get_scheduled_reload_times(),
+                'table_intervals': get_table_intervals()
             })
         
         elif action == 'stop':
@@ -247,6 +594,8 @@ def api_items():
         return jsonify([])
 
 @api_bp.route('/autonomy-report', methods=['POST'])
+@report_tables('inventory_transactions', 'sales_details', 'inventory_items', 'sites', 'categories')
+@snapshot_cached_report
 def api_autonomy_report():
     """Generate autonomy report"""
     try:
@@ -280,7 +629,7 @@ def api_autonomy_report():
             period_days = result_df['SALES_PERIOD_DAYS'].iloc[0] if not result_df.empty and 'SALES_PERIOD_DAYS' in result_df.columns else 0
         
         # Convert to JSON (sanitize NaN/numpy so jsonify never fails)
-        result_json = _sanitize_for_json(result_df.to_dict('records'))
+        result_json = _frame_records(result_df, sanitize=True)
         
         return jsonify({
             'data': result_json,
@@ -297,6 +646,8 @@ def api_autonomy_report():
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/stock-by-site-report', methods=['POST'])
+@report_tables('inventory_transactions', 'sales_details', 'inventory_items', 'sites', 'categories')
+@snapshot_cached_report
 def api_stock_by_site_report():
     """Generate stock by site report"""
     try:
@@ -307,6 +658,13 @@ def api_stock_by_site_report():
         category_id = data.get('category_id')
         as_of_date = data.get('as_of_date')
 
+        # Parsed once here: the stock engine and the ledger index only see Timestamps
+        as_of = None
+        if as_of_date:
+            as_of = pd.to_datetime(as_of_date, errors='coerce') if isinstance(as_of_date, str) else pd.NaT
+            if pd.isna(as_of):
+                return jsonify({'error': f"Invalid as_of_date: {as_of_date!r} (expected YYYY-MM-DD)"}), 400
+
         dataframes = get_dataframes()
         if not dataframes:
             return jsonify({'error': 'No data loaded. Please load dataframes first.'}), 400
@@ -317,7 +675,7 @@ def api_stock_by_site_report():
             site_code=site_code,
             site_codes=site_codes,
             category_id=category_id,
-            as_of_date=as_of_date
+            as_of_date=as_of
         )
 
         if result_df is None or result_df.empty:
@@ -332,7 +690,7 @@ def api_stock_by_site_report():
                 result_df = result_df.sort_values(['SITE_NAME', 'CURRENT_STOCK'], ascending=[True, False])
 
         # Convert to JSON
-        result_json = result_df.to_dict('records')
+        result_json = _frame_records(result_df)
 
         return jsonify({
             'data': result_json,
@@ -357,7 +715,7 @@ def api_stock_by_site_report():
 
 @api_bp.route('/get-available-columns')
 def api_get_available_columns():
-    """Get all available columns from all loaded dataframes"""
+    """Get all available columns from all loaded dataframes (and lazy tables not loaded yet)"""
     try:
         dataframes = get_dataframes()
         if not dataframes:
@@ -371,6 +729,17 @@ def api_get_available_columns():
                     'row_count': len(df)
                 }
         
+        # Lazy tables are listed too (with the columns a load will bring); custom-report loads them
+        # on first use
+        for table_name, usage in get_table_usage().items():
+            key = usage['cache_key']
+            if usage['mode'] == 'lazy' and key not in all_columns:
+                all_columns[key] = {
+                    'columns': get_cached_column_names(table_name) or [],
+                    'row_count': None,
+                    'lazy': True
+                }
+        
         return jsonify(all_columns)
         
     except Exception as e:
@@ -378,6 +747,8 @@ def api_get_available_columns():
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/custom-report', methods=['POST'])
+@body_table('table_name')
+@snapshot_cached_report
 def api_custom_report():
     """Generate custom report based on user parameters"""
     try:
@@ -394,11 +765,21 @@ def api_custom_report():
         if table_name not in dataframes:
             return jsonify({'error': f'Table {table_name} not found'}), 404
         
-        df = dataframes[table_name].copy()
+        df = dataframes[table_name]
+        
+        # Columns left out by LOAD_COLUMN_PROJECTION are not in the cache: say so instead of
+        # silently ignoring a filter or returning fewer columns
+        missing = [col for col in list(filters) + list(columns) if col not in df.columns]
+        if missing:
+            return jsonify({
+                'error': f"Columns not loaded for {table_name}: {', '.join(dict.fromkeys(missing))} "
+                         f"(set LOAD_COLUMN_PROJECTION=0 to load every column)",
+                'available_columns': df.columns.tolist()
+            }), 400
         
         # Apply filters
         for column, value in filters.items():
-            if column in df.columns and value:
+            if value:
                 if isinstance(value, str):
                     df = df[df[column].astype(str).str.contains(value, case=False, na=False)]
                 else:
@@ -406,9 +787,7 @@ def api_custom_report():
         
         # Select columns
         if columns:
-            available_columns = [col for col in columns if col in df.columns]
-            if available_columns:
-                df = df[available_columns]
+            df = df[columns]
         
         # Apply limit
         if len(df) > limit:
@@ -431,6 +810,8 @@ def api_custom_report():
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/ciment-report', methods=['POST'])
+@report_tables('inventory_transactions', 'sales_details', 'invoice_headers', 'inventory_items', 'sites', 'categories')
+@snapshot_cached_report
 def api_ciment_report():
     """
     Generate Ciment Report showing site-wise ciment category sales and stock
@@ -486,7 +867,7 @@ def api_ciment_report():
         if 'invoice_headers' not in dataframes or dataframes['invoice_headers'] is None:
             return jsonify({'error': 'Invoice data not available'}), 400
         
-        invoice_df = dataframes['invoice_headers'].copy()
+        invoice_df = dataframes['invoice_headers']
         print(f"📊 Working with {len(invoice_df)} invoice records for total sales")
         
         # Filter for valid sales transactions (FTYPE = 1) - same as sales report
@@ -496,13 +877,13 @@ def api_ciment_report():
         
         # Filter for SID starting with "530" - EXACT same logic as sales report
         if 'SID' in invoice_df.columns:
-            invoice_df = invoice_df[invoice_df['SID'].astype(str).str.startswith('530')]
+            invoice_df = invoice_df[invoice_df['SID'].str.startswith('530')]
             print(f"📊 After SID starts with '530' filter: {len(invoice_df)} invoice records")
         else:
             return jsonify({'error': 'SID column not found in invoice data'}), 400
         
         # Filter for Kinshasa sites (SID starting with "5301") - EXACT same logic as sales report
-        invoice_df = invoice_df[invoice_df['SID'].astype(str).str.startswith('5301')]
+        invoice_df = invoice_df[invoice_df['SID'].str.startswith('5301')]
         print(f"📊 After Kinshasa SID filter (5301): {len(invoice_df)} invoice records")
         
         if invoice_df.empty:
@@ -510,7 +891,6 @@ def api_ciment_report():
         
         # Filter by date range if specified
         if from_date or to_date:
-            invoice_df['FDATE'] = pd.to_datetime(invoice_df['FDATE'], errors='coerce')
             if from_date:
                 from_date_dt = pd.to_datetime(from_date)
                 invoice_df = invoice_df[invoice_df['FDATE'] >= from_date_dt]
@@ -519,9 +899,6 @@ def api_ciment_report():
                 invoice_df = invoice_df[invoice_df['FDATE'] <= to_date_dt]
             print(f"📊 After date filter: {len(invoice_df)} invoice records")
         
-        # Fill NaN values for calculations
-        invoice_df['NET'] = invoice_df['NET'].fillna(0)
-        
         # Get unique SITE values from filtered invoice data (SITE is the actual site identifier)
         kinshasa_sites_from_invoices = invoice_df['SITE'].unique()
         print(f"📍 Found {len(kinshasa_sites_from_invoices)} unique SITE values from Kinshasa invoices: {list(kinshasa_sites_from_invoices)[:10]}...")
@@ -534,11 +911,10 @@ def api_ciment_report():
         
         # Pre-filter sales data from ITEMS table to find ciment items with actual sales
         if 'sales_details' in dataframes and dataframes['sales_details'] is not None:
-            all_sales = dataframes['sales_details'].copy()
+            all_sales = dataframes['sales_details']
             
             # Filter by date range if specified
             if from_date or to_date:
-                all_sales['FDATE'] = pd.to_datetime(all_sales['FDATE'], errors='coerce')
                 if from_date:
                     from_date_dt = pd.to_datetime(from_date)
                     all_sales = all_sales[all_sales['FDATE'] >= from_date_dt]
@@ -576,23 +952,10 @@ def api_ciment_report():
         
         # Calculate stock for all ciment items at each site (same approach as autonomy stock)
         print(f"📦 Calculating stock for ciment items at each site...")
-        inventory_df = dataframes.get('inventory_transactions')
-        if inventory_df is not None:
-            # Filter inventory transactions for ciment items only
-            ciment_inventory = inventory_df[inventory_df['ITEM'].isin(ciment_items)].copy()
-            
-            # Fill NaN values with 0 for calculations
-            ciment_inventory['DEBITQTY'] = ciment_inventory['DEBITQTY'].fillna(0)
-            ciment_inventory['CREDITQTY'] = ciment_inventory['CREDITQTY'].fillna(0)
-            
-            # Calculate stock by SITE and ITEM: DEBITQTY - CREDITQTY (same as autonomy stock)
-            stock_summary = ciment_inventory.groupby(['SITE', 'ITEM']).agg({
-                'DEBITQTY': 'sum',
-                'CREDITQTY': 'sum'
-            }).reset_index()
-            
-            # Calculate current stock: DEBITQTY (incoming) - CREDITQTY (outgoing)
-            stock_summary['CURRENT_STOCK'] = stock_summary['DEBITQTY'] - stock_summary['CREDITQTY']
+        all_stock = get_stock_summary()
+        if all_stock is not None:
+            # Stock by SITE and ITEM: DEBITQTY - CREDITQTY (the snapshot's stock summary, as autonomy)
+            stock_summary = all_stock[all_stock['ITEM'].isin(ciment_items)]
             
             print(f"📊 Stock calculation: {len(stock_summary)} unique item/site combinations for ciment items")
         else:
@@ -799,6 +1162,8 @@ def api_ciment_report():
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/sales-report', methods=['POST'])
+@report_tables('invoice_headers', 'accounts', pushdown=('invoice_headers',))
+@snapshot_cached_report
 def api_sales_report():
     """
     Generate Sales Report using INVOICE table with NET, DISCOUNT, and cumulative calculations
@@ -830,114 +1195,125 @@ def api_sales_report():
             today = datetime.now()
             selected_date = today.strftime('%Y-%m-%d')
         
+        selected_date_dt = pd.to_datetime(selected_date)
+        first_of_month = selected_date_dt.replace(day=1)
+        push_down = should_push_down(data, ['invoice_headers'], first_of_month, selected_date_dt)
+        
         dataframes = get_dataframes()
-        if not dataframes:
+        if not dataframes and not push_down:
             return jsonify({'error': 'No data loaded. Please load dataframes first.'}), 400
         
-        # Get invoice data (original table name: INVOICE)
-        if 'invoice_headers' not in dataframes or dataframes['invoice_headers'] is None:
-            return jsonify({'error': 'Invoice data not available'}), 400
-        
-        invoice_df = dataframes['invoice_headers'].copy()
-        print(f"📊 Working with {len(invoice_df)} invoice records")
-        
-        # Filter for valid sales transactions (FTYPE = 1)
-        if 'FTYPE' in invoice_df.columns:
-            invoice_df = invoice_df[invoice_df['FTYPE'] == 1]
-            print(f"📊 After FTYPE=1 filter: {len(invoice_df)} records")
+        # Selective query: aggregate in InterBase (fresh rows, no table scan in memory)
+        period_sales = None
+        execution = 'memory'
+        if push_down:
+            if site_type == 'kinshasa':
+                site_type_name = 'Kinshasa'
+            elif site_type == 'int':
+                site_type_name = 'INT'
+            else:
+                return jsonify({'error': 'Invalid site_type. Must be "kinshasa" or "int"'}), 400
+            try:
+                period_sales, cumulative_sales = sales_report_aggregates(
+                    '5301' if site_type == 'kinshasa' else '5302', selected_date_dt, first_of_month
+                )
+                execution = g.report_execution = 'pushdown'
+                print(f"🗄️ Sales report pushed down to InterBase: {len(period_sales)} SIDs")
+            except Exception as e:
+                print(f"⚠️ Sales report pushdown failed ({e}) — using cached tables")
+                if dataframes.get('invoice_headers') is None:
+                    return jsonify({'error': f'Database query failed: {e}'}), 503
+            if period_sales is not None and period_sales.empty:
+                return jsonify({'error': f'No {site_type_name} sales found (SID starting with 530{"1" if site_type == "kinshasa" else "2"})'}), 404
+        
+        if period_sales is None:
+            # Get invoice data (original table name: INVOICE)
+            if 'invoice_headers' not in dataframes or dataframes['invoice_headers'] is None:
+                return jsonify({'error': 'Invoice data not available'}), 400
+        
+            invoice_df = dataframes['invoice_headers']
+            print(f"📊 Working with {len(invoice_df)} invoice records")
+        
+            # Filter for valid sales transactions (FTYPE = 1)
+            if 'FTYPE' in invoice_df.columns:
+                invoice_df = invoice_df[invoice_df['FTYPE'] == 1]
+                print(f"📊 After FTYPE=1 filter: {len(invoice_df)} records")
+        
+            # Filter for SID starting with "530"
+            if 'SID' in invoice_df.columns:
+                invoice_df = invoice_df[invoice_df['SID'].str.startswith('530')]
+                print(f"📊 After SID starts with '530' filter: {len(invoice_df)} records")
+            else:
+                return jsonify({'error': 'SID column not found in invoice data'}), 400
         
-        # Filter for SID starting with "530"
-        if 'SID' in invoice_df.columns:
-            invoice_df = invoice_df[invoice_df['SID'].astype(str).str.startswith('530')]
-            print(f"📊 After SID starts with '530' filter: {len(invoice_df)} records")
-        else:
-            return jsonify({'error': 'SID column not found in invoice data'}), 400
+            # Ensure required columns exist
+            required_cols = ['SID', 'NET', 'SUBTOTAL', 'VAT', 'OTHER', 'FDATE']
+            missing_cols = [col for col in required_cols if col not in invoice_df.columns]
+            if missing_cols:
+                return jsonify({'error': f'Missing required columns: {missing_cols}'}), 400
         
-        # Ensure required columns exist
-        required_cols = ['SID', 'NET', 'SUBTOTAL', 'VAT', 'OTHER', 'FDATE']
-        missing_cols = [col for col in required_cols if col not in invoice_df.columns]
-        if missing_cols:
-            return jsonify({'error': f'Missing required columns: {missing_cols}'}), 400
+            # Filter for the specific selected date
+            invoice_df = invoice_df[invoice_df['FDATE'].dt.date == selected_date_dt.date()]
         
-        # Convert date column and filter by selected date
-        invoice_df['FDATE'] = pd.to_datetime(invoice_df['FDATE'], errors='coerce')
-        selected_date_dt = pd.to_datetime(selected_date)
+            print(f"📊 After date filter (selected date: {selected_date}): {len(invoice_df)} records")
         
-        # Filter for the specific selected date
-        invoice_df = invoice_df[invoice_df['FDATE'].dt.date == selected_date_dt.date()]
-        
-        print(f"📊 After date filter (selected date: {selected_date}): {len(invoice_df)} records")
-        
-        # Fill NaN values for calculations
-        invoice_df['NET'] = invoice_df['NET'].fillna(0)
-        invoice_df['SUBTOTAL'] = invoice_df['SUBTOTAL'].fillna(0)
-        invoice_df['VAT'] = invoice_df['VAT'].fillna(0)
-        invoice_df['OTHER'] = invoice_df['OTHER'].fillna(0)
-        
-        # Calculate discount using the OTHER field from INVOICE table
-        invoice_df['DISCOUNT_CALC'] = invoice_df['OTHER']
-        
-        # Filter SIDs based on site type (ID pattern based)
-        if site_type == 'kinshasa':
-            # Filter for SIDs starting with "5301" (Kinshasa sites)
-            invoice_df = invoice_df[invoice_df['SID'].astype(str).str.startswith('5301')]
-            site_type_name = 'Kinshasa'
-        elif site_type == 'int':
-            # Filter for SIDs starting with "5302" (INT sites)  
-            invoice_df = invoice_df[invoice_df['SID'].astype(str).str.startswith('5302')]
-            site_type_name = 'INT'
-        else:
-            return jsonify({'error': 'Invalid site_type. Must be "kinshasa" or "int"'}), 400
+            # Calculate discount using the OTHER field from INVOICE table
+            invoice_df['DISCOUNT_CALC'] = invoice_df['OTHER']
         
-        if invoice_df.empty:
-            return jsonify({'error': f'No {site_type_name} sales found (SID starting with 530{"1" if site_type == "kinshasa" else "2"})'}), 404
+            # Filter SIDs based on site type (ID pattern based)
+            if site_type == 'kinshasa':
+                # Filter for SIDs starting with "5301" (Kinshasa sites)
+                invoice_df = invoice_df[invoice_df['SID'].str.startswith('5301')]
+                site_type_name = 'Kinshasa'
+            elif site_type == 'int':
+                # Filter for SIDs starting with "5302" (INT sites)  
+                invoice_df = invoice_df[invoice_df['SID'].str.startswith('5302')]
+                site_type_name = 'INT'
+            else:
+                return jsonify({'error': 'Invalid site_type. Must be "kinshasa" or "int"'}), 400
         
-        print(f"📍 Found {len(invoice_df)} {site_type_name} sales records")
+            if invoice_df.empty:
+                return jsonify({'error': f'No {site_type_name} sales found (SID starting with 530{"1" if site_type == "kinshasa" else "2"})'}), 404
         
-        # Calculate sales for the selected date (sum NET by SID)
-        period_sales = invoice_df.groupby('SID').agg({
-            'NET': 'sum',
-            'DISCOUNT_CALC': 'sum'
-        }).reset_index()
-        period_sales.columns = ['SID', 'SALES', 'DISCOUNT']
+            print(f"📍 Found {len(invoice_df)} {site_type_name} sales records")
         
-        # Calculate cumulative sales from INVOICE table (from 1st of month until selected_date)
-        # Calculate from 1st of the month until selected_date
-        first_of_month = selected_date_dt.replace(day=1)
+            # Calculate sales for the selected date (sum NET by SID)
+            period_sales = invoice_df.groupby('SID').agg({
+                'NET': 'sum',
+                'DISCOUNT_CALC': 'sum'
+            }).reset_index()
+            period_sales.columns = ['SID', 'SALES', 'DISCOUNT']
         
-        print(f"📊 Calculating cumulative sales from {first_of_month.strftime('%Y-%m-%d')} to {selected_date}")
+            # Calculate cumulative sales from INVOICE table (from 1st of month until selected_date)
+            print(f"📊 Calculating cumulative sales from {first_of_month.strftime('%Y-%m-%d')} to {selected_date}")
         
-        # Get fresh copy of invoice data for cumulative calculation
-        cumulative_invoice_df = dataframes['invoice_headers'].copy()
+            # Get fresh copy of invoice data for cumulative calculation
+            cumulative_invoice_df = dataframes['invoice_headers']
         
-        # Apply same base filters
-        if 'FTYPE' in cumulative_invoice_df.columns:
-            cumulative_invoice_df = cumulative_invoice_df[cumulative_invoice_df['FTYPE'] == 1]
+            # Apply same base filters
+            if 'FTYPE' in cumulative_invoice_df.columns:
+                cumulative_invoice_df = cumulative_invoice_df[cumulative_invoice_df['FTYPE'] == 1]
         
-        if 'SID' in cumulative_invoice_df.columns:
-            cumulative_invoice_df = cumulative_invoice_df[cumulative_invoice_df['SID'].astype(str).str.startswith('530')]
+            if 'SID' in cumulative_invoice_df.columns:
+                cumulative_invoice_df = cumulative_invoice_df[cumulative_invoice_df['SID'].str.startswith('530')]
             
-            # Apply site type filter
-            if site_type == 'kinshasa':
-                cumulative_invoice_df = cumulative_invoice_df[cumulative_invoice_df['SID'].astype(str).str.startswith('5301')]
-            elif site_type == 'int':
-                cumulative_invoice_df = cumulative_invoice_df[cumulative_invoice_df['SID'].astype(str).str.startswith('5302')]
-        
-        # Filter by cumulative date range (1st of month to selected_date)
-        cumulative_invoice_df['FDATE'] = pd.to_datetime(cumulative_invoice_df['FDATE'], errors='coerce')
-        cumulative_invoice_df = cumulative_invoice_df[
-            (cumulative_invoice_df['FDATE'] >= first_of_month) & 
-            (cumulative_invoice_df['FDATE'] <= selected_date_dt)
-        ]
+                # Apply site type filter
+                if site_type == 'kinshasa':
+                    cumulative_invoice_df = cumulative_invoice_df[cumulative_invoice_df['SID'].str.startswith('5301')]
+                elif site_type == 'int':
+                    cumulative_invoice_df = cumulative_invoice_df[cumulative_invoice_df['SID'].str.startswith('5302')]
         
-        # Fill NaN values and calculate cumulative sales (sum NET by SID)
-        cumulative_invoice_df['NET'] = cumulative_invoice_df['NET'].fillna(0)
+            # Filter by cumulative date range (1st of month to selected_date)
+            cumulative_invoice_df = cumulative_invoice_df[
+                (cumulative_invoice_df['FDATE'] >= first_of_month) & 
+                (cumulative_invoice_df['FDATE'] <= selected_date_dt)
+            ]
         
-        # Calculate cumulative sales by SID
-        cumulative_sales = cumulative_invoice_df.groupby('SID')['NET'].sum().reset_index()
-        cumulative_sales.columns = ['SID', 'CUMULATIVE_SALES']
+            # Calculate cumulative sales by SID
+            cumulative_sales = cumulative_invoice_df.groupby('SID')['NET'].sum().reset_index()
+            cumulative_sales.columns = ['SID', 'CUMULATIVE_SALES']
         
-        print(f"📊 Calculated cumulative sales for {len(cumulative_sales)} SIDs from INVOICE table (1st of month to selected date)")
+            print(f"📊 Calculated cumulative sales for {len(cumulative_sales)} SIDs from INVOICE table (1st of month to selected date)")
         
         # Merge period and cumulative sales
         result_df = period_sales.merge(cumulative_sales, on='SID', how='left')
@@ -946,10 +1322,9 @@ def api_sales_report():
         # Add site information using SUB table for site names
         if 'accounts' in dataframes and dataframes['accounts'] is not None:
             # Get site names from SUB table (SQL: SELECT s.sname FROM SUB s WHERE s.sid = :site_id)
-            sub_df = dataframes['accounts'].copy()
+            sub_df = dataframes['accounts']
             
-            # Ensure SID columns are strings for proper matching
-            sub_df['SID'] = sub_df['SID'].astype(str) 
+            # Ensure SID columns are strings for proper matching (SUB.SID is str since load)
             result_df['SID'] = result_df['SID'].astype(str)
             
             # Merge to get site names (SNAME from SUB table)
@@ -1000,6 +1375,7 @@ def api_sales_report():
                 'total_cumulative_sales': float(total_cumulative),
                 'selected_date': selected_date,
                 'data_source': 'INVOICE table (NET for both sales and cumulative)',
+                'execution': execution,
                 'calculation_method': {
                     'sales': 'NET from INVOICE table for specific selected date',
                     'discount': 'OTHER field from INVOICE table',
@@ -1019,6 +1395,8 @@ def api_sales_report():
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/sales-by-item-report', methods=['POST'])
+@report_tables('sales_details', 'invoice_headers', 'inventory_items', 'categories')
+@snapshot_cached_report
 def api_sales_by_item_report():
     """
     Generate Sales by Item Report using original SQL query logic
@@ -1053,8 +1431,8 @@ def api_sales_by_item_report():
         if 'invoice_headers' not in dataframes or dataframes['invoice_headers'] is None:
             return jsonify({'error': 'Invoice headers data not available'}), 400
         
-        sales_df = dataframes['sales_details'].copy()
-        invoice_df = dataframes['invoice_headers'].copy()
+        sales_df = dataframes['sales_details']
+        invoice_df = dataframes['invoice_headers']
         
         print(f"📊 Working with {len(sales_df)} sales detail records and {len(invoice_df)} invoice records")
         
@@ -1086,12 +1464,11 @@ def api_sales_by_item_report():
         
         # Filter for site sales only (SID starting with "530")
         if 'SID' in sales_df.columns:
-            sales_df = sales_df[sales_df['SID'].astype(str).str.startswith('530')]
+            sales_df = sales_df[sales_df['SID'].str.startswith('530')]
             print(f"📊 After SID filter: {len(sales_df)} records")
         
         # Convert date column and filter by date range (FDATE BETWEEN from_date AND to_date)
         if 'FDATE' in sales_df.columns:
-            sales_df['FDATE'] = pd.to_datetime(sales_df['FDATE'], errors='coerce')
             
             if from_date:
                 from_date_dt = pd.to_datetime(from_date)
@@ -1106,10 +1483,10 @@ def api_sales_by_item_report():
         # Filter by site type if specified
         if site_type:
             if site_type == 'kinshasa':
-                sales_df = sales_df[sales_df['SID'].astype(str).str.startswith('5301')]
+                sales_df = sales_df[sales_df['SID'].str.startswith('5301')]
                 site_type_name = 'Kinshasa'
             elif site_type == 'int':
-                sales_df = sales_df[sales_df['SID'].astype(str).str.startswith('5302')]
+                sales_df = sales_df[sales_df['SID'].str.startswith('5302')]
                 site_type_name = 'INT'
             else:
                 return jsonify({'error': 'Invalid site_type. Must be "kinshasa" or "int"'}), 400
@@ -1141,12 +1518,6 @@ def api_sales_by_item_report():
             sales_with_invoice['OTHER'] = 0
             sales_with_invoice['SUBTOTAL'] = 1  # Avoid division by zero
         
-        # Fill NaN values for calculations
-        numeric_fields = ['CREDITQTY', 'DEBITQTY', 'CREDITUS', 'DEBITUS', 'CREDITVATAMOUNT', 'DEBITVATAMOUNT', 'QTY']
-        for field in numeric_fields:
-            if field in sales_with_invoice.columns:
-                sales_with_invoice[field] = sales_with_invoice[field].fillna(0)
-        
         # Calculate using original query logic
         calculation_results = []
         
@@ -1342,6 +1713,8 @@ def api_sales_by_item_report():
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/kinshasa-bureau-client-report', methods=['POST'])
+@report_tables('sales_details', 'accounts', 'sites')
+@snapshot_cached_report
 def api_kinshasa_bureau_client_report():
     """
     Generate Kinshasa Sales Bureau Client Report
@@ -1368,12 +1741,12 @@ def api_kinshasa_bureau_client_report():
         if 'sales_details' not in dataframes or dataframes['sales_details'] is None:
             return jsonify({'error': 'Sales details data not available'}), 400
         
-        sales_df = dataframes['sales_details'].copy()
+        sales_df = dataframes['sales_details']
         print(f"📊 Working with {len(sales_df)} sales detail records")
         
         # Filter for SID starting with "411" (office clients)
         if 'SID' in sales_df.columns:
-            sales_df = sales_df[sales_df['SID'].astype(str).str.startswith('411')]
+            sales_df = sales_df[sales_df['SID'].str.startswith('411')]
             print(f"📊 After SID starts with '411' filter: {len(sales_df)} records")
         else:
             return jsonify({'error': 'SID column not found in sales details'}), 400
@@ -1410,17 +1783,15 @@ def api_kinshasa_bureau_client_report():
             
             # Filter sales_df by SITE (ITEMS.SITE = ALLSTOCK.ID)
             if 'SITE' in sales_df.columns:
-                # Convert both to string for proper matching
-                sales_df['SITE'] = sales_df['SITE'].astype(str)
+                # Compare both as strings (without writing into the shared cached table)
                 site_ids_str = [str(sid) for sid in site_ids]
-                sales_df = sales_df[sales_df['SITE'].isin(site_ids_str)]
+                sales_df = sales_df[sales_df['SITE'].astype(str).isin(site_ids_str)]
                 print(f"📊 After SIDNO filter ({site_sidno_str}): {len(sales_df)} records")
             else:
                 return jsonify({'error': 'SITE column not found in sales details'}), 400
         
         # Filter by date range
         if 'FDATE' in sales_df.columns:
-            sales_df['FDATE'] = pd.to_datetime(sales_df['FDATE'], errors='coerce')
             from_date_dt = pd.to_datetime(from_date)
             to_date_dt = pd.to_datetime(to_date)
             
@@ -1454,7 +1825,7 @@ def api_kinshasa_bureau_client_report():
                 contact = [contact]
             
             # Filter SUB table by SID starting with '411' first
-            accounts_df = accounts_df[accounts_df['SID'].astype(str).str.startswith('411')]
+            accounts_df = accounts_df[accounts_df['SID'].str.startswith('411')]
             print(f"📊 Accounts with SID starting with 411: {len(accounts_df)}")
             
             # Try multiple matching strategies
@@ -1497,7 +1868,7 @@ def api_kinshasa_bureau_client_report():
             
             # Filter sales_df by these SIDs
             sales_df_before = len(sales_df)
-            sales_df = sales_df[sales_df['SID'].astype(str).isin(filtered_sids)]
+            sales_df = sales_df[sales_df['SID'].isin(filtered_sids)]
             print(f"📊 After CONTACT filter ({contact}): {len(sales_df)} records (was {sales_df_before})")
         
         if sales_df.empty:
@@ -1512,19 +1883,6 @@ def api_kinshasa_bureau_client_report():
         if qty_col is None:
             return jsonify({'error': 'No quantity column (QTY/QTY1) found in sales details'}), 400
         
-        # Fill NaN values
-        sales_df[qty_col] = sales_df[qty_col].fillna(0)
-        
-        # Fill NaN values for USD calculation fields
-        if 'CREDITUS' in sales_df.columns:
-            sales_df['CREDITUS'] = sales_df['CREDITUS'].fillna(0)
-        if 'DEBITUS' in sales_df.columns:
-            sales_df['DEBITUS'] = sales_df['DEBITUS'].fillna(0)
-        if 'CREDITVATAMOUNT' in sales_df.columns:
-            sales_df['CREDITVATAMOUNT'] = sales_df['CREDITVATAMOUNT'].fillna(0)
-        if 'DEBITVATAMOUNT' in sales_df.columns:
-            sales_df['DEBITVATAMOUNT'] = sales_df['DEBITVATAMOUNT'].fillna(0)
-        
         # Filter for FTYPE 1 (sales) and FTYPE 2 (returns)
         sales_df = sales_df[sales_df['FTYPE'].isin([1, 2])]
         
@@ -1613,8 +1971,7 @@ def api_kinshasa_bureau_client_report():
         
         if 'accounts' in dataframes and dataframes['accounts'] is not None:
             # Use FULL accounts_df to get correct CONTACT values for each SID
-            accounts_df = dataframes['accounts'].copy()
-            accounts_df['SID'] = accounts_df['SID'].astype(str)
+            accounts_df = dataframes['accounts']
             
             # Filter accounts_df to only include SIDs in the result (for efficiency)
             accounts_df_filtered = accounts_df[accounts_df['SID'].isin(result_sids)]
@@ -1764,7 +2121,7 @@ def api_unique_contacts():
         if 'SID' not in accounts_df.columns:
             return jsonify({'error': 'SID column not found in SUB table (accounts)'}), 400
         
-        accounts_df = accounts_df[accounts_df['SID'].astype(str).str.startswith('411')]
+        accounts_df = accounts_df[accounts_df['SID'].str.startswith('411')]
         
         # Get unique non-null CONTACT values
         unique_contacts = accounts_df[contact_col].dropna().unique()
@@ -1791,6 +2148,8 @@ def api_unique_contacts():
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/kinshasa-bureau-client-items', methods=['POST'])
+@report_tables('sales_details', 'accounts', 'sites', 'inventory_items', 'categories', pushdown=('sales_details',))
+@snapshot_cached_report
 def api_kinshasa_bureau_client_items():
     """
     Get all items purchased by a specific client (SID) for Kinshasa Bureau
@@ -1809,30 +2168,23 @@ def api_kinshasa_bureau_client_items():
         if not from_date or not to_date:
             return jsonify({'error': 'Both from_date and to_date are required'}), 400
         
+        from_date_dt = pd.to_datetime(from_date)
+        to_date_dt = pd.to_datetime(to_date)
+        push_down = should_push_down(data, ['sales_details'], from_date_dt, to_date_dt)
+        
         dataframes = get_dataframes()
-        if not dataframes:
+        if not dataframes and not push_down:
             return jsonify({'error': 'No data loaded. Please load dataframes first.'}), 400
         
-        # Get sales details data (ITEMS table)
-        if 'sales_details' not in dataframes or dataframes['sales_details'] is None:
-            return jsonify({'error': 'Sales details data not available'}), 400
-        
-        sales_df = dataframes['sales_details'].copy()
-        
-        # Filter for specific client SID
-        if 'SID' in sales_df.columns:
-            sales_df = sales_df[sales_df['SID'].astype(str) == str(client_sid)]
-        else:
-            return jsonify({'error': 'SID column not found in sales details'}), 400
-        
-        # Filter by SIDNO from ALLSTOCK table if site_sidno is provided
+        # Resolve SIDNO from ALLSTOCK table if site_sidno is provided
         # Join: ITEMS.SITE = ALLSTOCK.ID, then filter by ALLSTOCK.SIDNO
         # site_sidno can be a single value or an array
+        site_ids = None
         if site_sidno:
             if 'sites' not in dataframes or dataframes['sites'] is None:
                 return jsonify({'error': 'Sites data (ALLSTOCK) not available'}), 400
             
-            sites_df = dataframes['sites'].copy()
+            sites_df = dataframes['sites']
             
             # Check if SIDNO column exists
             if 'SIDNO' not in sites_df.columns:
@@ -1854,53 +2206,76 @@ def api_kinshasa_bureau_client_items():
             # Get site IDs (ALLSTOCK.ID) that match any of the SIDNO values
             site_ids = filtered_sites['ID'].unique().tolist()
             print(f"📍 Found {len(site_ids)} sites with SIDNO in {site_sidno_str}")
+        
+        # Selective query: aggregate in InterBase (fresh rows, no table scan in memory)
+        sales_by_item = None
+        execution = 'memory'
+        if push_down:
+            try:
+                sales_by_item, qty_col = client_item_quantities(client_sid, from_date_dt, to_date_dt, site_ids)
+                all_items = sales_by_item['ITEM'].unique()
+                execution = g.report_execution = 'pushdown'
+                print(f"🗄️ Client items pushed down to InterBase: {len(all_items)} items")
+            except Exception as e:
+                print(f"⚠️ Client items pushdown failed ({e}) — using cached tables")
+                if dataframes.get('sales_details') is None:
+                    return jsonify({'error': f'Database query failed: {e}'}), 503
+            if sales_by_item is not None and sales_by_item.empty:
+                return jsonify({'error': 'No sales found for this client in the specified period'}), 404
+        
+        if sales_by_item is None:
+            # Get sales details data (ITEMS table)
+            if 'sales_details' not in dataframes or dataframes['sales_details'] is None:
+                return jsonify({'error': 'Sales details data not available'}), 400
+            
+            sales_df = dataframes['sales_details']
+            
+            # Filter for specific client SID
+            if 'SID' in sales_df.columns:
+                sales_df = sales_df[sales_df['SID'] == str(client_sid)]
+            else:
+                return jsonify({'error': 'SID column not found in sales details'}), 400
             
             # Filter sales_df by SITE (ITEMS.SITE = ALLSTOCK.ID)
-            if 'SITE' in sales_df.columns:
-                # Convert both to string for proper matching
-                sales_df['SITE'] = sales_df['SITE'].astype(str)
-                site_ids_str = [str(sid) for sid in site_ids]
-                sales_df = sales_df[sales_df['SITE'].isin(site_ids_str)]
-                print(f"📊 After SIDNO filter ({site_sidno_str}): {len(sales_df)} records")
+            if site_ids is not None:
+                if 'SITE' in sales_df.columns:
+                    # Convert both to string for proper matching
+                    site_ids_str = [str(sid) for sid in site_ids]
+                    sales_df = sales_df[sales_df['SITE'].astype(str).isin(site_ids_str)]
+                    print(f"📊 After SIDNO filter ({site_sidno_str}): {len(sales_df)} records")
+                else:
+                    return jsonify({'error': 'SITE column not found in sales details'}), 400
+            
+            # Filter by date range
+            if 'FDATE' in sales_df.columns:
+                sales_df = sales_df[
+                    (sales_df['FDATE'] >= from_date_dt) & 
+                    (sales_df['FDATE'] <= to_date_dt)
+                ]
             else:
-                return jsonify({'error': 'SITE column not found in sales details'}), 400
-        
-        # Filter by date range
-        if 'FDATE' in sales_df.columns:
-            sales_df['FDATE'] = pd.to_datetime(sales_df['FDATE'], errors='coerce')
-            from_date_dt = pd.to_datetime(from_date)
-            to_date_dt = pd.to_datetime(to_date)
+                return jsonify({'error': 'FDATE column not found in sales details'}), 400
             
-            sales_df = sales_df[
-                (sales_df['FDATE'] >= from_date_dt) & 
-                (sales_df['FDATE'] <= to_date_dt)
-            ]
-        else:
-            return jsonify({'error': 'FDATE column not found in sales details'}), 400
-        
-        if sales_df.empty:
-            return jsonify({'error': 'No sales found for this client in the specified period'}), 404
-        
-        # Get quantity column
-        qty_col = 'QTY' if 'QTY' in sales_df.columns else ('QTY1' if 'QTY1' in sales_df.columns else None)
-        if qty_col is None:
-            return jsonify({'error': 'No quantity column (QTY/QTY1) found in sales details'}), 400
-        
-        # Fill NaN values
-        sales_df[qty_col] = sales_df[qty_col].fillna(0)
-        
-        # Filter for FTYPE 1 (sales) and FTYPE 2 (returns)
-        sales_df = sales_df[sales_df['FTYPE'].isin([1, 2])]
-        
-        # Calculate sales (FTYPE = 1) and returns (FTYPE = 2) by ITEM
-        sales_by_item = sales_df.groupby(['ITEM', 'FTYPE'])[qty_col].sum().reset_index()
+            if sales_df.empty:
+                return jsonify({'error': 'No sales found for this client in the specified period'}), 404
+            
+            # Get quantity column
+            qty_col = 'QTY' if 'QTY' in sales_df.columns else ('QTY1' if 'QTY1' in sales_df.columns else None)
+            if qty_col is None:
+                return jsonify({'error': 'No quantity column (QTY/QTY1) found in sales details'}), 400
+            
+            # Filter for FTYPE 1 (sales) and FTYPE 2 (returns)
+            sales_df = sales_df[sales_df['FTYPE'].isin([1, 2])]
+            
+            # Calculate sales (FTYPE = 1) and returns (FTYPE = 2) by ITEM
+            sales_by_item = sales_df.groupby(['ITEM', 'FTYPE'])[qty_col].sum().reset_index()
+            
+            # Get all items for this client
+            all_items = sales_df['ITEM'].unique()
         
         # Separate sales and returns
         sales_only = sales_by_item[sales_by_item['FTYPE'] == 1].copy()
         returns_only = sales_by_item[sales_by_item['FTYPE'] == 2].copy()
         
-        # Get all items for this client
-        all_items = sales_df['ITEM'].unique()
         result_data = []
         
         for item_code in all_items:
@@ -1963,9 +2338,8 @@ def api_kinshasa_bureau_client_items():
         # Get client name
         client_name = f"Client {client_sid}"
         if 'accounts' in dataframes and dataframes['accounts'] is not None:
-            accounts_df = dataframes['accounts'].copy()
+            accounts_df = dataframes['accounts']
             if 'SID' in accounts_df.columns and 'SNAME' in accounts_df.columns:
-                accounts_df['SID'] = accounts_df['SID'].astype(str)
                 client_info = accounts_df[accounts_df['SID'] == str(client_sid)]
                 if not client_info.empty:
                     client_name = str(client_info.iloc[0]['SNAME']) if pd.notna(client_info.iloc[0]['SNAME']) else f"Client {client_sid}"
@@ -2003,7 +2377,8 @@ def api_kinshasa_bureau_client_items():
                 'total_net_qty': float(total_net),
                 'total_weight': float(total_weight),
                 'filter': f'SID = {client_sid} (Office Client)',
-                'data_source': 'ITEMS table (sales_details)'
+                'data_source': 'ITEMS table (sales_details)',
+                'execution': execution
             }
         })
         
@@ -2014,6 +2389,8 @@ def api_kinshasa_bureau_client_items():
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/kinshasa-bureau-item-clients', methods=['POST'])
+@report_tables('sales_details', 'accounts', 'sites', 'inventory_items')
+@snapshot_cached_report
 def api_kinshasa_bureau_item_clients():
     """
     Get all clients who purchased a specific item for Kinshasa Bureau
@@ -2044,12 +2421,12 @@ def api_kinshasa_bureau_item_clients():
         if 'sales_details' not in dataframes or dataframes['sales_details'] is None:
             return jsonify({'error': 'Sales details data not available'}), 400
         
-        sales_df = dataframes['sales_details'].copy()
+        sales_df = dataframes['sales_details']
         print(f"📊 Working with {len(sales_df)} sales detail records")
         
         # Filter for SID starting with "411" (office clients)
         if 'SID' in sales_df.columns:
-            sales_df = sales_df[sales_df['SID'].astype(str).str.startswith('411')]
+            sales_df = sales_df[sales_df['SID'].str.startswith('411')]
             print(f"📊 After SID starts with '411' filter: {len(sales_df)} records")
         else:
             return jsonify({'error': 'SID column not found in sales details'}), 400
@@ -2063,7 +2440,6 @@ def api_kinshasa_bureau_item_clients():
         
         # Filter by date range
         if 'FDATE' in sales_df.columns:
-            sales_df['FDATE'] = pd.to_datetime(sales_df['FDATE'], errors='coerce')
             from_date_dt = pd.to_datetime(from_date)
             to_date_dt = pd.to_datetime(to_date)
             
@@ -2105,10 +2481,9 @@ def api_kinshasa_bureau_item_clients():
             
             # Filter sales_df by SITE (ITEMS.SITE = ALLSTOCK.ID)
             if 'SITE' in sales_df.columns:
-                # Convert both to string for proper matching
-                sales_df['SITE'] = sales_df['SITE'].astype(str)
+                # Compare both as strings (without writing into the shared cached table)
                 site_ids_str = [str(sid) for sid in site_ids]
-                sales_df = sales_df[sales_df['SITE'].isin(site_ids_str)]
+                sales_df = sales_df[sales_df['SITE'].astype(str).isin(site_ids_str)]
                 print(f"📊 After SIDNO filter ({site_sidno_str}): {len(sales_df)} records")
             else:
                 return jsonify({'error': 'SITE column not found in sales details'}), 400
@@ -2135,7 +2510,7 @@ def api_kinshasa_bureau_item_clients():
                 contact = [contact]
             
             # Filter SUB table by SID starting with '411' first
-            accounts_df = accounts_df[accounts_df['SID'].astype(str).str.startswith('411')]
+            accounts_df = accounts_df[accounts_df['SID'].str.startswith('411')]
             print(f"📊 Accounts with SID starting with 411: {len(accounts_df)}")
             
             # Try multiple matching strategies
@@ -2178,7 +2553,7 @@ def api_kinshasa_bureau_item_clients():
             
             # Filter sales_df by these SIDs
             sales_df_before = len(sales_df)
-            sales_df = sales_df[sales_df['SID'].astype(str).isin(filtered_sids)]
+            sales_df = sales_df[sales_df['SID'].isin(filtered_sids)]
             print(f"📊 After CONTACT filter ({contact}): {len(sales_df)} records (was {sales_df_before})")
         
         if sales_df.empty:
@@ -2193,19 +2568,6 @@ def api_kinshasa_bureau_item_clients():
         if qty_col is None:
             return jsonify({'error': 'No quantity column (QTY/QTY1) found in sales details'}), 400
         
-        # Fill NaN values
-        sales_df[qty_col] = sales_df[qty_col].fillna(0)
-        
-        # Fill NaN values for USD calculation fields
-        if 'CREDITUS' in sales_df.columns:
-            sales_df['CREDITUS'] = sales_df['CREDITUS'].fillna(0)
-        if 'DEBITUS' in sales_df.columns:
-            sales_df['DEBITUS'] = sales_df['DEBITUS'].fillna(0)
-        if 'CREDITVATAMOUNT' in sales_df.columns:
-            sales_df['CREDITVATAMOUNT'] = sales_df['CREDITVATAMOUNT'].fillna(0)
-        if 'DEBITVATAMOUNT' in sales_df.columns:
-            sales_df['DEBITVATAMOUNT'] = sales_df['DEBITVATAMOUNT'].fillna(0)
-        
         # Filter for FTYPE 1 (sales) and FTYPE 2 (returns)
         sales_df = sales_df[sales_df['FTYPE'].isin([1, 2])]
         
@@ -2289,10 +2651,8 @@ def api_kinshasa_bureau_item_clients():
         # Get client names from SUB table (accounts dataframe)
         client_names = {}
         if 'accounts' in dataframes and dataframes['accounts'] is not None:
-            accounts_df = dataframes['accounts'].copy()
+            accounts_df = dataframes['accounts']
             if 'SID' in accounts_df.columns and 'SNAME' in accounts_df.columns:
-                # Convert SID to string for matching
-                accounts_df['SID'] = accounts_df['SID'].astype(str)
                 # Get unique SID-SNAME mappings
                 sid_name_map = accounts_df[['SID', 'SNAME']].drop_duplicates()
                 client_names = dict(zip(sid_name_map['SID'], sid_name_map['SNAME']))
@@ -2362,6 +2722,8 @@ def api_kinshasa_bureau_item_clients():
         return jsonify({'error': str(e)}), 500
 
 @api_bp.route('/kinshasa-bureau-items-report', methods=['POST'])
+@report_tables('sales_details', 'accounts', 'sites', 'inventory_items', 'categories')
+@snapshot_cached_report
 def api_kinshasa_bureau_items_report():
     """
     Generate Kinshasa Sales Bureau Top Items Report
@@ -2387,12 +2749,12 @@ def api_kinshasa_bureau_items_report():
         if 'sales_details' not in dataframes or dataframes['sales_details'] is None:
             return jsonify({'error': 'Sales details data not available'}), 400
         
-        sales_df = dataframes['sales_details'].copy()
+        sales_df = dataframes['sales_details']
         print(f"📊 Working with {len(sales_df)} sales detail records")
         
         # Filter for SID starting with "411" (office clients)
         if 'SID' in sales_df.columns:
-            sales_df = sales_df[sales_df['SID'].astype(str).str.startswith('411')]
+            sales_df = sales_df[sales_df['SID'].str.startswith('411')]
             print(f"📊 After SID starts with '411' filter: {len(sales_df)} records")
         else:
             return jsonify({'error': 'SID column not found in sales details'}), 400
@@ -2429,17 +2791,15 @@ def api_kinshasa_bureau_items_report():
             
             # Filter sales_df by SITE (ITEMS.SITE = ALLSTOCK.ID)
             if 'SITE' in sales_df.columns:
-                # Convert both to string for proper matching
-                sales_df['SITE'] = sales_df['SITE'].astype(str)
+                # Compare both as strings (without writing into the shared cached table)
                 site_ids_str = [str(sid) for sid in site_ids]
-                sales_df = sales_df[sales_df['SITE'].isin(site_ids_str)]
+                sales_df = sales_df[sales_df['SITE'].astype(str).isin(site_ids_str)]
                 print(f"📊 After SIDNO filter ({site_sidno_str}): {len(sales_df)} records")
             else:
                 return jsonify({'error': 'SITE column not found in sales details'}), 400
         
         # Filter by date range
         if 'FDATE' in sales_df.columns:
-            sales_df['FDATE'] = pd.to_datetime(sales_df['FDATE'], errors='coerce')
             from_date_dt = pd.to_datetime(from_date)
             to_date_dt = pd.to_datetime(to_date)
             
@@ -2473,7 +2833,7 @@ def api_kinshasa_bureau_items_report():
                 contact = [contact]
             
             # Filter SUB table by SID starting with '411' first
-            accounts_df = accounts_df[accounts_df['SID'].astype(str).str.startswith('411')]
+            accounts_df = accounts_df[accounts_df['SID'].str.startswith('411')]
             print(f"📊 Accounts with SID starting with 411: {len(accounts_df)}")
             
             # Try multiple matching strategies
@@ -2516,7 +2876,7 @@ def api_kinshasa_bureau_items_report():
             
             # Filter sales_df by these SIDs
             sales_df_before = len(sales_df)
-            sales_df = sales_df[sales_df['SID'].astype(str).isin(filtered_sids)]
+            sales_df = sales_df[sales_df['SID'].isin(filtered_sids)]
             print(f"📊 After CONTACT filter ({contact}): {len(sales_df)} records (was {sales_df_before})")
         
         if sales_df.empty:
@@ -2531,19 +2891,6 @@ def api_kinshasa_bureau_items_report():
         if qty_col is None:
             return jsonify({'error': 'No quantity column (QTY/QTY1) found in sales details'}), 400
         
-        # Fill NaN values
-        sales_df[qty_col] = sales_df[qty_col].fillna(0)
-        
-        # Fill NaN values for USD calculation fields
-        if 'CREDITUS' in sales_df.columns:
-            sales_df['CREDITUS'] = sales_df['CREDITUS'].fillna(0)
-        if 'DEBITUS' in sales_df.columns:
-            sales_df['DEBITUS'] = sales_df['DEBITUS'].fillna(0)
-        if 'CREDITVATAMOUNT' in sales_df.columns:
-            sales_df['CREDITVATAMOUNT'] = sales_df['CREDITVATAMOUNT'].fillna(0)
-        if 'DEBITVATAMOUNT' in sales_df.columns:
-            sales_df['DEBITVATAMOUNT'] = sales_df['DEBITVATAMOUNT'].fillna(0)
-        
         # Filter for FTYPE 1 (sales) and FTYPE 2 (returns)
         sales_df = sales_df[sales_df['FTYPE'].isin([1, 2])]
         
@@ -2652,10 +2999,9 @@ def api_kinshasa_bureau_items_report():
         
         # Get client names from SUB table (accounts dataframe)
         if 'accounts' in dataframes and dataframes['accounts'] is not None:
-            accounts_df = dataframes['accounts'].copy()
+            accounts_df = dataframes['accounts']
             if 'SID' in accounts_df.columns and 'SNAME' in accounts_df.columns:
-                # Convert SID to string for matching
-                accounts_df['SID'] = accounts_df['SID'].astype(str)
+                # SUB.SID is str since load; match the result side
                 result_df['SID'] = result_df['SID'].astype(str)
                 # Get unique SID-SNAME mappings
                 sid_name_map = accounts_df[['SID', 'SNAME']].drop_duplicates()
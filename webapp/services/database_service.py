@@ -1,13 +1,35 @@
 """Database connection and loading service"""
 
+import numpy as np
 import pandas as pd
 import threading
 import warnings
 import time as time_module
 import json
 import os
+import sqlite3
+import uuid
+import weakref
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime, time
-from config.database import DATABASE_CONFIG, USE_ODBC, get_connection_string
+from decimal import Decimal
+from types import MappingProxyType
+from flask import g, has_request_context
+from config.database import (
+    DATABASE_CONFIG, USE_ODBC, DB_BACKEND, SQLITE_DATABASE, LOAD_PARALLEL, LOAD_MAX_WORKERS,
+    INCREMENTAL_RELOAD, INCREMENTAL_FULL_RELOAD_HOURS, LOAD_COLUMN_PROJECTION,
+    CACHE_SNAPSHOT, CHANGE_DETECTION, DB_POOL_SIZE, DB_POOL_IDLE_CHECK_SECONDS,
+    CACHE_MAX_AGE_HOURS, CACHE_REVALIDATE_MIN_INTERVAL_SECONDS, PROGRESSIVE_PUBLISH,
+    EAGER_TABLES, LAZY_TABLE_IDLE_HOURS, RELOAD_MEMORY_BUDGET_MB, RELOAD_MEMORY_WAIT_SECONDS,
+    LOAD_TELEMETRY_DEEP_BYTES, get_connection_string
+)
+from services.snapshot_service import save_snapshot, load_snapshot
+from services.memory_service import frame_bytes, profile_frame, record_memory_sample
+from services.telemetry_service import record_table_load
+from services.scheduler_service import (
+    CronExpression, add_job, remove_job, remove_jobs, start_scheduler, stop_scheduler, is_scheduler_running
+)
 
 # Try pyodbc for fast ODBC path
 try:
@@ -23,173 +45,1422 @@ try:
 except ImportError:
     INTERBASE_AVAILABLE = False
 
+# psutil (optional) reports the process memory next to the cache's own estimate
+try:
+    import psutil
+    PSUTIL_AVAILABLE = True
+except ImportError:
+    PSUTIL_AVAILABLE = False
+
+# SQLite stand-in (DB_BACKEND=sqlite): columns declared DECIMAL/TIMESTAMP come back as Decimal and
+# datetime, like NUMERIC and TIMESTAMP columns from the InterBase drivers
+sqlite3.register_adapter(datetime, lambda value: value.isoformat(' '))
+sqlite3.register_converter('DECIMAL', lambda raw: Decimal(raw.decode()))
+sqlite3.register_converter('TIMESTAMP', lambda raw: datetime.fromisoformat(raw.decode()))
+
 # Suppress warnings to match notebook behavior
 warnings.filterwarnings('ignore')
 
 # Bulk fetch size: larger = fewer round-trips, faster load (especially with ODBC)
 CURSOR_ARRAYSIZE = 50000
 
-# Global cache for dataframes
-dataframes = {}
+# Cache key -> InterBase table (descriptive names matching the notebook)
+TABLES = {
+    'sites': 'ALLSTOCK',                    # Site/Location master data
+    'categories': 'DETDESCR',               # Category definitions
+    'invoice_headers': 'INVOICE',           # Invoice headers
+    'sales_details': 'ITEMS',               # Sales transaction details
+    'vouchers': 'PAYM',                     # Payment vouchers
+    'accounts': 'SUB',                      # Accounts/Sub-accounts data
+    'inventory_items': 'STOCK',             # Items/Products master
+    'inventory_transactions': 'ALLITEM',    # All inventory transactions
+}
+
+# Tables outside EAGER_TABLES are lazy: fetched on first use (ensure_tables), not by full loads
+LAZY_TABLES = () if EAGER_TABLES is None else tuple(t for t in TABLES.values() if t not in EAGER_TABLES)
+
+# Big transaction tables are submitted first so they overlap in parallel mode
+LARGE_TABLES = ('ALLITEM', 'ITEMS', 'INVOICE')
+
+# Transaction tables that support delta refresh: table -> (row id column, modification date column)
+INCREMENTAL_TABLES = {
+    'INVOICE': ('ID', 'LOGDATE'),
+    'ITEMS': ('ID', 'LOGDATE'),
+    'ALLITEM': ('ID', 'LOGDATE'),
+}
+
+# Column manifest: columns always loaded per table (keys and watermarks).
+# Report modules add what they read through require_columns(). None = load every column.
+TABLE_COLUMNS = {
+    'ALLSTOCK': ['ID'],
+    'DETDESCR': ['ID'],
+    'INVOICE': ['ID', 'LOGDATE'],
+    'ITEMS': ['ID', 'LOGDATE'],
+    'PAYM': None,
+    'SUB': ['SID'],
+    'STOCK': ['ITEM'],
+    'ALLITEM': ['ID', 'LOGDATE'],
+}
+
+# Columns declared by report modules: table name -> set of column names
+_required_columns = {}
+
+# Actual columns per table as reported by InterBase (filled on first load)
+_table_columns = {}
+
+# Load-time schema normalisation (applied once per load instead of in every report)
+DATE_COLUMNS = ('FDATE', 'LOGDATE')             # -> datetime64 (unparseable -> NaT)
+SMALL_INT_COLUMNS = ('FTYPE',)                  # -> int8 when there are no NULLs
+AMOUNT_COLUMNS = (                              # -> float64 with NULL filled as 0
+    'QTY', 'QTY1', 'DEBITQTY', 'CREDITQTY', 'CREDITUS', 'DEBITUS',
+    'CREDITVATAMOUNT', 'DEBITVATAMOUNT', 'NET', 'SUBTOTAL', 'VAT', 'OTHER',
+    'POSPRICE1', 'NWEIGHT',
+)
+STRING_COLUMNS = ('SID',)                       # -> str, the form every report compares SID in
+INTERNED_COLUMNS = ('SITE', 'ITEM', 'CATEGORY') # repeated strings share one object per value
+
+
+class CacheSnapshot:
+    """One published state of the cache: read-only table mapping plus a version number.
+
+    Loaders never modify a published snapshot; they build a new one and swap the module-level
+    reference. A request pins the snapshot current at its first get_dataframes() call and keeps
+    it until teardown, so it never sees tables from two loads. Superseded snapshots are freed
+    by reference counting once their last reader releases them. The DataFrames themselves
+    must be treated as read-only.
+    """
+
+    def __init__(self, version, tables, timestamp):
+        self.version = version
+        self.tables = MappingProxyType(dict(tables))
+        self.timestamp = timestamp
+        self._readers = 0
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    @property
+    def readers(self):
+        """Number of requests currently pinning this snapshot"""
+        return self._readers
+
+    def acquire(self):
+        with self._lock:
+            self._readers += 1
+        return self
+
+    def release(self):
+        with self._lock:
+            self._readers -= 1
+
+    def derived(self, key, factory):
+        """Memoise a value computed from this snapshot's tables (dropped with the snapshot)."""
+        with self._lock:
+            if key in self._derived:
+                return self._derived[key]
+        value = factory()
+        with self._lock:
+            return self._derived.setdefault(key, value)
+
+    def inherit_derived(self, other):
+        """Carry over values memoised on a snapshot holding the very same tables."""
+        with other._lock:
+            self._derived.update(other._derived)
+
+
+# Published cache: replaced as a whole (single reference assignment), never mutated
+_current_snapshot = CacheSnapshot(0, {}, None)
+
+# Superseded snapshots still referenced by in-flight requests (entries vanish once freed)
+_retired_snapshots = weakref.WeakSet()
+
+# Serialises loaders (cache_loading flag and publishing); readers never take it
 cache_lock = threading.Lock()
 cache_loading = False
-cache_timestamp = None
 
 # Set at startup: True = using ODBC, False = using direct InterBase
 _using_odbc = False
 
+# High-water marks per incremental table: {'max_id': ..., 'max_logdate': ...}
+_watermarks = {}
+_last_full_load = None
 
-def _load_table_odbc(table_name):
-    """Load table via ODBC (faster bulk fetch). Returns DataFrame or None."""
-    if not PYODBC_AVAILABLE:
+# Per-table load times (table name -> datetime): last refresh of any kind, last whole-table load
+_table_refreshed_at = {}
+_table_full_loaded_at = {}
+
+# Change detection: MAX() of these columns (when present) plus COUNT(*) fingerprint a table
+FINGERPRINT_COLUMNS = ('ID', 'LOGDATE')
+_fingerprints = {}            # table name -> fingerprint recorded when the cached frame was loaded
+_last_skipped_tables = []     # tables the last reload found unchanged
+_last_change_check = None
+
+# Progress of the current load: table name -> {'status', 'rows', 'expected_rows', 'started', 'finished'}
+_load_progress = {}
+_load_progress_started = None
+_load_run_id = None  # groups the table loads of one load run in the telemetry
+_progress_lock = threading.Lock()
+
+# Background load jobs started through the API: job id -> job dict (oldest first)
+LOAD_JOB_HISTORY = 20
+_load_jobs = {}
+_load_jobs_lock = threading.Lock()
+
+# Table usage registry: table name -> {'count', 'last_access'} (reports declaring the table)
+_table_usage = {}
+_usage_lock = threading.Lock()
+_lazy_load_lock = threading.Lock()
+
+# Memory accounting: last measured size per table and the peak of the last budgeted reload
+_table_bytes_seen = {}
+_last_reload_memory = {}
+RELOAD_GROWTH_MARGIN = 1.1  # a reloaded table is assumed up to 10% larger than the cached one
+
+# Stale-while-revalidate: (time, cache version) of the last background refresh attempt
+_last_revalidation = None
+_revalidation_lock = threading.Lock()
+
+# Post-reload hooks: name -> func(snapshot), run after every publish; name -> last run
+_post_reload_hooks = {}
+_hook_runs = {}
+_hooks_lock = threading.Lock()
+
+
+def require_columns(table, columns):
+    """Declare columns a report reads from a cached table.
+
+    Args:
+        table: cache key (e.g. 'sales_details') or InterBase table name (e.g. 'ITEMS')
+        columns: iterable of column names
+    """
+    table_name = TABLES.get(table, table)
+    _required_columns.setdefault(table_name, set()).update(columns)
+
+
+def get_projection(table_name):
+    """Columns to request for a table (manifest + declared), or None to load all of them."""
+    if not LOAD_COLUMN_PROJECTION:
+        return None
+    manifest = TABLE_COLUMNS.get(table_name)
+    if manifest is None:
         return None
+    wanted = list(manifest)
+    for col in sorted(_required_columns.get(table_name, ())):
+        if col not in wanted:
+            wanted.append(col)
+    return wanted
+
+
+def _get_table_columns(cursor, table_name):
+    """Column names of a table from the InterBase system tables (cached), or None on failure."""
+    if table_name in _table_columns:
+        return _table_columns[table_name]
     try:
-        conn = pyodbc.connect(get_connection_string())
-        cursor = conn.cursor()
-        cursor.arraysize = CURSOR_ARRAYSIZE
-        cursor.execute(f"SELECT * FROM {table_name}")
-        columns = [desc[0] for desc in cursor.description]
-        rows = cursor.fetchall()
-        # pyodbc Row objects -> list of tuples for pandas
-        data = [tuple(row) for row in rows]
-        df = pd.DataFrame(data, columns=columns)
-        conn.close()
-        return df
-    except Exception:
+        if DB_BACKEND == 'sqlite':
+            _execute(cursor, "SELECT name FROM pragma_table_info(?) ORDER BY cid", [table_name])
+        else:
+            _execute(
+                cursor,
+                "SELECT RDB$FIELD_NAME FROM RDB$RELATION_FIELDS "
+                "WHERE RDB$RELATION_NAME = ? ORDER BY RDB$FIELD_POSITION",
+                [table_name],
+            )
+        columns = [row[0].strip() for row in cursor.fetchall()]
+    except Exception as e:
+        print(f"⚠️ {table_name}: could not read column list ({e}) — loading all columns")
         return None
+    if columns:
+        _table_columns[table_name] = columns
+    return columns or None
 
 
-def _load_table_direct(table_name):
-    """Load table via direct InterBase connection. Returns DataFrame or None."""
-    if not INTERBASE_AVAILABLE:
+def _resolve_columns(cursor, table_name):
+    """SELECT list for a table: projected columns that exist in the database, or None for *."""
+    wanted = get_projection(table_name)
+    if not wanted:
         return None
-    try:
-        dsn = f"{DATABASE_CONFIG['DATA_SOURCE']}:{DATABASE_CONFIG['DATABASE_PATH']}"
-        kwargs = {
-            'dsn': dsn,
-            'user': DATABASE_CONFIG['USERNAME'],
-            'password': DATABASE_CONFIG['PASSWORD'],
-            'charset': 'NONE',
-        }
-        if DATABASE_CONFIG.get('CLIENT_LIBRARY'):
-            kwargs['ib_library_name'] = DATABASE_CONFIG['CLIENT_LIBRARY']
-        conn = interbase.connect(**kwargs)
-        cursor = conn.cursor()
+    existing = _get_table_columns(cursor, table_name)
+    if not existing:
+        return None
+    # Only plain (unquoted) identifiers so the SELECT works in every SQL dialect
+    columns = [c for c in existing if c in wanted and c.isidentifier() and c.isupper()]
+    return columns or None
+
+
+def _build_select(table_name, where=None, columns=None):
+    """Build the SELECT statement for a table, optionally projected and restricted by a WHERE clause."""
+    query = f"SELECT {', '.join(columns) if columns else '*'} FROM {table_name}"
+    if where:
+        query += f" WHERE {where}"
+    return query
+
+
+def _execute(cursor, query, params=()):
+    """Execute a query, passing parameters only when there are some (driver-neutral)."""
+    if params:
+        cursor.execute(query, tuple(params))
+    else:
+        cursor.execute(query)
+
+
+def _fetch_columnar(cursor, on_batch=None, timings=None):
+    """Stream the cursor's result set into a DataFrame, column by column.
+
+    Rows are pulled with fetchmany(CURSOR_ARRAYSIZE) and each batch is transposed straight into
+    preallocated per-column object arrays (grown geometrically), so a table never exists as
+    driver rows + tuples + DataFrame at the same time. dtypes are inferred per column exactly
+    like pd.DataFrame(rows) would. on_batch(rows_so_far) is called after every batch.
+    timings (dict) receives fetch_seconds and frame_seconds.
+    """
+    started = time_module.perf_counter()
+    columns = [desc[0] for desc in cursor.description]
+    capacity = CURSOR_ARRAYSIZE
+    arrays = [np.empty(capacity, dtype=object) for _ in columns]
+    n_rows = 0
+
+    while True:
+        batch = cursor.fetchmany(CURSOR_ARRAYSIZE)
+        if not batch:
+            break
+        size = len(batch)
+        if n_rows + size > capacity:
+            while n_rows + size > capacity:
+                capacity *= 2
+            for i, arr in enumerate(arrays):
+                grown = np.empty(capacity, dtype=object)
+                grown[:n_rows] = arr[:n_rows]
+                arrays[i] = grown
+        for i, values in enumerate(zip(*batch)):
+            arrays[i][n_rows:n_rows + size] = values
+        n_rows += size
+        del batch
+        if on_batch is not None:
+            on_batch(n_rows)
+
+    fetched = time_module.perf_counter()
+    data = {}
+    for i in range(len(columns)):
+        # Trim to the fetched length and release the oversized buffer column by column
+        values = arrays[i][:n_rows].copy() if n_rows < capacity else arrays[i]
+        arrays[i] = None
+        data[i] = pd.Series(values, dtype=object).infer_objects()
+    df = pd.DataFrame(data)
+    df.columns = columns
+    if timings is not None:
+        timings['fetch_seconds'] = fetched - started
+        timings['frame_seconds'] = time_module.perf_counter() - fetched
+    return df
+
+
+def _intern_values(series):
+    """Make equal string values share one object (same values and dtype, far less memory)."""
+    codes, uniques = pd.factorize(series)
+    if len(uniques) == 0:
+        return series
+    values = np.asarray(uniques, dtype=object)[codes]
+    missing = codes == -1
+    if missing.any():
+        values[missing] = series.values[missing]
+    return pd.Series(values, index=series.index, name=series.name, dtype=object)
+
+
+def normalize_table_schema(df):
+    """Convert report columns to their working dtypes once, at load time.
+
+    FDATE/LOGDATE become datetime64, FTYPE int8, quantity/amount columns filled float64,
+    SID str and SITE/ITEM/CATEGORY interned strings. Key columns keep their values (no
+    categoricals): they are compared to request parameters and merged across tables, and
+    categorical groupby would expand to every category combination.
+    """
+    if df is None or df.empty:
+        return df
+    for col in df.columns:
+        series = df[col]
         try:
-            cursor.arraysize = CURSOR_ARRAYSIZE
+            if col in DATE_COLUMNS:
+                if not pd.api.types.is_datetime64_any_dtype(series):
+                    df[col] = pd.to_datetime(series, errors='coerce')
+            elif col in SMALL_INT_COLUMNS:
+                numeric = pd.to_numeric(series, errors='coerce')
+                if numeric.notna().all() and (numeric % 1 == 0).all() and numeric.abs().max() < 128:
+                    df[col] = numeric.astype('int8')
+            elif col in AMOUNT_COLUMNS:
+                numeric = pd.to_numeric(series, errors='coerce')
+                # Leave the column alone if it is not actually numeric
+                if numeric.isna().sum() == series.isna().sum():
+                    df[col] = numeric.fillna(0).astype('float64')
+            elif col in STRING_COLUMNS:
+                df[col] = series.astype(str)
+            elif col in INTERNED_COLUMNS and series.dtype == object:
+                df[col] = _intern_values(series)
+        except Exception as e:
+            print(f"⚠️ Schema normalisation skipped for column {col}: {e}")
+    return df
+
+
+class ConnectionPool:
+    """Bounded pool of open database connections, reused across tables, reloads and queries.
+
+    At most max_size connections exist at once; acquire() waits for a free one when all are
+    in use. A connection idle for longer than idle_check_seconds is health-checked before it
+    is handed out, and dropped (replaced by a new one) if the check fails. Every release ends
+    the connection's transaction so the next user sees current data (InterBase snapshot
+    isolation would otherwise keep showing the state at the first read).
+    """
+
+    HEALTH_CHECK_QUERY = "SELECT 1 FROM RDB$DATABASE"
+
+    def __init__(self, name, factory, max_size, idle_check_seconds=DB_POOL_IDLE_CHECK_SECONDS,
+                 health_check_query=None):
+        self.name = name
+        self._factory = factory
+        self._health_check_query = health_check_query or self.HEALTH_CHECK_QUERY
+        self._max_size = max(1, max_size)
+        self._idle_check_seconds = idle_check_seconds
+        self._idle = []          # [(connection, released_at)], most recently used last
+        self._open = 0           # idle + checked out
+        self._created = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, timeout=None):
+        """Check out a healthy connection (new, or reused from the idle list)."""
+        deadline = None if timeout is None else time_module.time() + timeout
+        while True:
+            with self._cond:
+                while not self._idle and self._open >= self._max_size:
+                    remaining = None if deadline is None else deadline - time_module.time()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No {self.name} connection free after {timeout}s")
+                    self._cond.wait(remaining)
+                if self._idle:
+                    conn, released_at = self._idle.pop()
+                else:
+                    conn, released_at = None, None
+                    self._open += 1
+
+            if conn is None:
+                try:
+                    conn = self._factory()
+                except Exception:
+                    self._discard(None)
+                    raise
+                with self._cond:
+                    self._created += 1
+                return conn
+
+            if time_module.time() - released_at < self._idle_check_seconds or self._is_healthy(conn):
+                return conn
+            print(f"⚠️ {self.name} pool: dropping dead connection")
+            self._discard(conn)
+
+    def release(self, conn, broken=False):
+        """Return a connection; broken ones (or ones that cannot end their transaction) are closed."""
+        if not broken:
+            try:
+                conn.rollback()
+            except Exception:
+                broken = True
+        if broken:
+            self._discard(conn)
+            return
+        with self._cond:
+            self._idle.append((conn, time_module.time()))
+            self._cond.notify()
+
+    @contextmanager
+    def connection(self, timeout=None):
+        """with pool.connection() as conn: ... — released (or discarded on error) afterwards."""
+        conn = self.acquire(timeout)
+        try:
+            yield conn
         except Exception:
-            pass
-        cursor.execute(f"SELECT * FROM {table_name}")
-        columns = [desc[0] for desc in cursor.description]
-        rows = cursor.fetchall()
-        df = pd.DataFrame(rows, columns=columns)
-        conn.close()
-        return df
-    except Exception:
+            self.release(conn, broken=True)
+            raise
+        else:
+            self.release(conn)
+
+    def close_all(self):
+        """Close idle connections (checked-out ones are closed when released as broken)."""
+        with self._cond:
+            idle, self._idle = self._idle, []
+            self._open -= len(idle)
+            self._cond.notify_all()
+        for conn, _ in idle:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    def stats(self):
+        with self._cond:
+            return {
+                'max_size': self._max_size,
+                'open': self._open,
+                'idle': len(self._idle),
+                'in_use': self._open - len(self._idle),
+                'created': self._created,
+            }
+
+    def _is_healthy(self, conn):
+        try:
+            cursor = conn.cursor()
+            cursor.execute(self._health_check_query)
+            cursor.fetchone()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, conn):
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+        with self._cond:
+            self._open -= 1
+            self._cond.notify()
+
+
+def _connect_odbc():
+    return pyodbc.connect(get_connection_string())
+
+
+def _connect_direct():
+    dsn = f"{DATABASE_CONFIG['DATA_SOURCE']}:{DATABASE_CONFIG['DATABASE_PATH']}"
+    kwargs = {
+        'dsn': dsn,
+        'user': DATABASE_CONFIG['USERNAME'],
+        'password': DATABASE_CONFIG['PASSWORD'],
+        'charset': 'NONE',
+    }
+    if DATABASE_CONFIG.get('CLIENT_LIBRARY'):
+        kwargs['ib_library_name'] = DATABASE_CONFIG['CLIENT_LIBRARY']
+    return interbase.connect(**kwargs)
+
+
+def _connect_sqlite():
+    if not os.path.exists(SQLITE_DATABASE):
+        raise FileNotFoundError(f"{SQLITE_DATABASE} not found — create it with: python -m bench generate")
+    return sqlite3.connect(SQLITE_DATABASE, detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+
+
+# One pool per driver; connections are opened lazily on first use
+odbc_pool = ConnectionPool('ODBC', _connect_odbc, DB_POOL_SIZE)
+direct_pool = ConnectionPool('InterBase', _connect_direct, DB_POOL_SIZE)
+sqlite_pool = ConnectionPool('SQLite', _connect_sqlite, DB_POOL_SIZE, health_check_query='SELECT 1')
+
+# How long a load waits for a free pooled connection before giving up
+POOL_ACQUIRE_TIMEOUT = 300
+
+
+def get_connection_pool():
+    """Pool for the driver chosen at the last connection test (ODBC or direct InterBase)"""
+    if DB_BACKEND == 'sqlite':
+        return sqlite_pool
+    return odbc_pool if _using_odbc else direct_pool
+
+
+def get_pool_stats():
+    """Usage counters of both connection pools"""
+    stats = {'odbc': odbc_pool.stats(), 'direct': direct_pool.stats()}
+    if DB_BACKEND == 'sqlite':
+        stats['sqlite'] = sqlite_pool.stats()
+    return stats
+
+
+def _load_table_pooled(pool, table_name, where=None, params=(), timings=None):
+    """Load a table on a pooled connection. Returns DataFrame or None.
+
+    timings (dict) receives connect_seconds (pool wait + connection open), query_seconds,
+    fetch_seconds, frame_seconds, and error when the load failed.
+    """
+    timings = {} if timings is None else timings
+    try:
+        clock = time_module.perf_counter()
+        with pool.connection(POOL_ACQUIRE_TIMEOUT) as conn:
+            timings['connect_seconds'] = time_module.perf_counter() - clock
+            clock = time_module.perf_counter()
+            cursor = conn.cursor()
+            try:
+                cursor.arraysize = CURSOR_ARRAYSIZE
+            except Exception:
+                pass
+            _execute(cursor, _build_select(table_name, where, _resolve_columns(cursor, table_name)), params)
+            timings['query_seconds'] = time_module.perf_counter() - clock
+            df = _fetch_columnar(cursor, lambda rows: _update_progress(table_name, rows=rows), timings)
+            cursor.close()
+            return df
+    except Exception as e:
+        timings['error'] = str(e)
         return None
 
 
-def connect_and_load_table(table_name):
-    """Load a table: ODBC first (faster) when USE_ODBC is True, else direct InterBase."""
+def _load_table_odbc(table_name, where=None, params=(), timings=None):
+    """Load table via ODBC (faster bulk fetch). Returns DataFrame or None."""
+    if not PYODBC_AVAILABLE:
+        return None
+    return _load_table_pooled(odbc_pool, table_name, where, params, timings)
+
+
+def _load_table_direct(table_name, where=None, params=(), timings=None):
+    """Load table via direct InterBase connection. Returns DataFrame or None."""
+    if not INTERBASE_AVAILABLE:
+        return None
+    return _load_table_pooled(direct_pool, table_name, where, params, timings)
+
+
+def _load_table_sqlite(table_name, where=None, params=(), timings=None):
+    """Load table from the SQLite stand-in database (DB_BACKEND=sqlite). Returns DataFrame or None."""
+    return _load_table_pooled(sqlite_pool, table_name, where, params, timings)
+
+
+def _load_table_timed(backend, load, table_name, where, params):
+    """Run one load attempt (ODBC or direct) and record its telemetry. Returns DataFrame or None."""
+    timings = {}
+    started = time_module.perf_counter()
+    df = load(table_name, where, params, timings)
+    if df is not None:
+        clock = time_module.perf_counter()
+        df = normalize_table_schema(df)
+        timings['frame_seconds'] = timings.get('frame_seconds', 0) + time_module.perf_counter() - clock
+        # Before the total is taken, so a deep measurement shows up in the load time it adds
+        clock = time_module.perf_counter()
+        nbytes = frame_bytes(df) if LOAD_TELEMETRY_DEEP_BYTES else int(df.memory_usage(index=True).sum())
+        timings['bytes_seconds'] = time_module.perf_counter() - clock
+    total = time_module.perf_counter() - started
+    record = {
+        'table': table_name,
+        'load_id': _load_run_id,
+        'backend': backend,
+        'delta': bool(where),
+        'status': 'ok' if df is not None else 'failed',
+        'total_seconds': round(total, 3),
+        **{phase: round(timings[phase], 3) for phase in
+           ('connect_seconds', 'query_seconds', 'fetch_seconds', 'frame_seconds', 'bytes_seconds')
+           if phase in timings},
+    }
+    if df is not None:
+        record.update(rows=int(len(df)), columns=int(df.shape[1]), bytes=nbytes, deep_bytes=LOAD_TELEMETRY_DEEP_BYTES,
+                      rows_per_sec=round(len(df) / total) if total > 0 else None)
+    else:
+        record['error'] = timings.get('error')
+    record_table_load(record)
+    return df
+
+
+def connect_and_load_table(table_name, where=None, params=()):
+    """Load a table: ODBC first (faster) when USE_ODBC is True, else direct InterBase.
+
+    where/params optionally restrict the rows fetched (used by incremental refresh).
+    Every attempt is recorded in the load telemetry (see telemetry_service).
+    """
     global _using_odbc
     try:
-        print(f"🔄 Loading table {table_name}...")
+        print(f"🔄 Loading table {table_name}{' (delta)' if where else ''}...")
+        _update_progress(table_name, status='delta' if where else 'loading', rows=0,
+                         started=time_module.time(), finished=None)
         df = None
+        if DB_BACKEND == 'sqlite':
+            df = _load_table_timed('sqlite', _load_table_sqlite, table_name, where, params)
+            if df is not None:
+                print(f"✅ {table_name}: {df.shape[0]:,} rows × {df.shape[1]} columns (SQLite stand-in)")
+                _update_progress(table_name, status='done', rows=len(df), finished=time_module.time())
+                return df
+            raise RuntimeError(f"SQLite stand-in load failed ({SQLITE_DATABASE})")
         if USE_ODBC and PYODBC_AVAILABLE:
-            df = _load_table_odbc(table_name)
+            df = _load_table_timed('odbc', _load_table_odbc, table_name, where, params)
             if df is not None:
                 print(f"✅ {table_name}: {df.shape[0]:,} rows × {df.shape[1]} columns (ODBC)")
+                _update_progress(table_name, status='done', rows=len(df), finished=time_module.time())
                 return df
         if INTERBASE_AVAILABLE:
-            df = _load_table_direct(table_name)
+            df = _load_table_timed('direct', _load_table_direct, table_name, where, params)
             if df is not None:
                 print(f"✅ {table_name}: {df.shape[0]:,} rows × {df.shape[1]} columns (direct)")
+                _update_progress(table_name, status='done', rows=len(df), finished=time_module.time())
                 return df
         raise RuntimeError("ODBC and direct connection both failed or unavailable")
     except Exception as e:
         print(f"❌ {table_name}: Failed - {e}")
+        _update_progress(table_name, status='failed', finished=time_module.time())
+        return None
+
+def _run_on_connection(work, acquire_timeout=POOL_ACQUIRE_TIMEOUT):
+    """Call work(cursor) on a pooled connection: ODBC first when enabled, then direct InterBase.
+
+    acquire_timeout: seconds to wait for a free pooled connection (per driver).
+    Raises RuntimeError if no connection can run it.
+    """
+    pools = []
+    if DB_BACKEND == 'sqlite':
+        pools.append(sqlite_pool)
+    else:
+        if USE_ODBC and PYODBC_AVAILABLE:
+            pools.append(odbc_pool)
+        if INTERBASE_AVAILABLE:
+            pools.append(direct_pool)
+
+    last_error = 'no database driver installed'
+    for pool in pools:
+        try:
+            with pool.connection(acquire_timeout) as conn:
+                cursor = conn.cursor()
+                result = work(cursor)
+                cursor.close()
+            return result
+        except Exception as e:
+            last_error = e
+    raise RuntimeError(f"Query failed: {last_error}")
+
+def query_dataframe(query, params=(), acquire_timeout=POOL_ACQUIRE_TIMEOUT):
+    """Run an ad-hoc SELECT (e.g. a pushed-down report aggregate) on a pooled connection.
+
+    The result gets the same schema normalisation as cached tables.
+    Raises RuntimeError if no connection can run it (none free within acquire_timeout seconds).
+    """
+    def work(cursor):
+        _execute(cursor, query, params)
+        return _fetch_columnar(cursor)
+    return normalize_table_schema(_run_on_connection(work, acquire_timeout))
+
+def _query_fingerprint(table_name):
+    """Cheap change marker: [COUNT(*), MAX(ID), MAX(LOGDATE), loaded columns] as strings, or None
+    if unreadable.
+
+    MAX() is only taken for the FINGERPRINT_COLUMNS the table actually has. The loaded columns
+    (get_projection) make a table whose reports now read other columns count as changed.
+    """
+    projection = get_projection(table_name)
+    columns = ','.join(projection) if projection else '*'
+
+    def work(cursor):
+        existing = _get_table_columns(cursor, table_name) or ()
+        exprs = ['COUNT(*)'] + [f"MAX({col})" for col in FINGERPRINT_COLUMNS if col in existing]
+        _execute(cursor, f"SELECT {', '.join(exprs)} FROM {table_name}")
+        return [str(value) for value in cursor.fetchone()] + [columns]
+    try:
+        return _run_on_connection(work)
+    except Exception as e:
+        print(f"⚠️ {table_name}: change check failed ({e}) — reloading")
         return None
 
-def load_dataframes():
+def _reconcile_due(table_name, now):
+    """True when a table's last whole-table load is older than INCREMENTAL_FULL_RELOAD_HOURS"""
+    full_at = _table_full_loaded_at.get(table_name)
+    return full_at is None or (now - full_at).total_seconds() > INCREMENTAL_FULL_RELOAD_HOURS * 3600
+
+def _is_unchanged(table_name, fingerprint):
+    """Fingerprint matches the last load, and the table is not due for its periodic full reload
+    (which also catches edits COUNT/MAX cannot see)."""
+    return (fingerprint is not None and _fingerprints.get(table_name) == fingerprint
+            and not _reconcile_due(table_name, datetime.now()))
+
+def _change_aware_loader(cached, fingerprints, skipped, load=connect_and_load_table):
+    """Table loader for _load_tables that reuses the cached frame of a table whose fingerprint
+    matches the one recorded at its last load.
+
+    cached: {cache_key: DataFrame}, or None to look each table up in the current snapshot when
+    it is checked (a memory-budgeted load must not keep the tables it replaces alive).
+    fingerprints (table -> fingerprint) and skipped (table names) are filled as tables are
+    checked; publish them with _commit_fingerprints once the load is swapped in.
+    load(table_name) fetches a table that changed.
+    """
+    cached_by_table = None if cached is None else {TABLES[key]: df for key, df in cached.items() if key in TABLES}
+
+    def load_if_changed(table_name):
+        fingerprint = _query_fingerprint(table_name)
+        fingerprints[table_name] = fingerprint
+        if fingerprint is not None:
+            _update_progress(table_name, expected_rows=int(fingerprint[0]))
+        if cached_by_table is None:
+            cached_df = _current_snapshot.tables.get(_cache_key(table_name))
+        else:
+            cached_df = cached_by_table.get(table_name)
+        if cached_df is not None and _is_unchanged(table_name, fingerprint):
+            print(f"⏭️ {table_name}: unchanged since last load, skipped")
+            skipped.append(table_name)
+            _update_progress(table_name, status='unchanged', rows=len(cached_df))
+            return cached_df
+        return load(table_name)
+    return load_if_changed
+
+def _commit_fingerprints(fingerprints, tables, skipped):
+    """Record fingerprints of the tables just published (a failed table keeps none)."""
+    global _last_skipped_tables, _last_change_check
+    _last_skipped_tables = sorted(skipped)
+    loaded = {TABLES[key] for key, df in tables.items() if df is not None}
+    for table_name, fingerprint in fingerprints.items():
+        if table_name in loaded and fingerprint is not None:
+            _fingerprints[table_name] = fingerprint
+        else:
+            _fingerprints.pop(table_name, None)
+    if fingerprints:
+        _last_change_check = datetime.now()
+
+def _begin_progress(table_names):
+    """Reset load progress for a new load of table_names (expected rows = cached row counts).
+
+    Also starts a new load run id, which groups the run's table loads in the telemetry.
+    """
+    global _load_progress_started, _load_run_id
+    _load_run_id = datetime.now().strftime('%Y%m%d-%H%M%S-') + uuid.uuid4().hex[:6]
+    cached_rows = {TABLES[key]: len(df) for key, df in _current_snapshot.tables.items() if key in TABLES}
+    with _progress_lock:
+        _load_progress.clear()
+        _load_progress_started = time_module.time()
+        for table_name in table_names:
+            _load_progress[table_name] = {
+                'status': 'pending', 'rows': 0, 'expected_rows': cached_rows.get(table_name),
+                'started': None, 'finished': None,
+            }
+
+def _update_progress(table_name, **fields):
+    with _progress_lock:
+        entry = _load_progress.get(table_name)
+        if entry is not None:
+            entry.update(fields)
+
+def get_load_progress():
+    """Per-table progress of the current (or last) load: rows fetched, rows/sec and ETA.
+
+    expected_rows comes from the change-detection COUNT(*) or the cached row count, so the
+    ETA is an estimate; delta refreshes have none.
+    """
+    now = time_module.time()
+    with _progress_lock:
+        entries = {table_name: dict(entry) for table_name, entry in _load_progress.items()}
+        load_started = _load_progress_started
+    tables = {}
+    remaining_rows = 0
+    fetched_rows = 0
+    for table_name, entry in entries.items():
+        started, finished = entry.pop('started'), entry.pop('finished')
+        elapsed = ((finished or now) - started) if started else 0
+        rate = entry['rows'] / elapsed if elapsed > 0 else None
+        eta = None
+        expected = entry['expected_rows']
+        if entry['status'] in ('pending', 'loading') and expected is not None:
+            left = max(expected - entry['rows'], 0)
+            remaining_rows += left
+            if entry['status'] == 'loading' and rate:
+                eta = round(left / rate, 1)
+        if entry['status'] in ('loading', 'delta', 'done'):
+            fetched_rows += entry['rows']
+        tables[table_name] = {
+            **entry,
+            'elapsed_seconds': round(elapsed, 1),
+            'rows_per_sec': round(rate) if rate else None,
+            'eta_seconds': eta,
+        }
+    elapsed_total = now - load_started if load_started else 0
+    overall_rate = fetched_rows / elapsed_total if elapsed_total > 0 else 0
+    return {
+        'loading': is_cache_loading(),
+        'elapsed_seconds': round(elapsed_total, 1),
+        'tables_total': len(tables),
+        'tables_done': sum(1 for t in tables.values() if t['status'] in ('done', 'unchanged', 'failed')),
+        'rows_fetched': fetched_rows,
+        'eta_seconds': round(remaining_rows / overall_rate, 1) if overall_rate and is_cache_loading() else None,
+        'tables': tables,
+    }
+
+def _load_tables(table_map, loader=connect_and_load_table, on_loaded=None, max_workers=None):
+    """Load the given {cache_key: table_name} tables and return {cache_key: DataFrame or None}.
+
+    With LOAD_PARALLEL each table runs on its own worker (and its own connection),
+    at most LOAD_MAX_WORKERS (or max_workers) at a time; large tables are submitted first
+    so they overlap.
+    loader(table_name) does the per-table work (see _change_aware_loader).
+    on_loaded(cache_key, DataFrame or None) is called as each table finishes.
+    """
+    ordered = sorted(table_map.items(), key=lambda kv: kv[1] not in LARGE_TABLES)
+    workers = min(max_workers or LOAD_MAX_WORKERS, len(ordered))
+
+    if not LOAD_PARALLEL or workers <= 1:
+        results = {}
+        for key, table_name in ordered:
+            results[key] = loader(table_name)
+            if on_loaded is not None:
+                on_loaded(key, results[key])
+        return {key: results.get(key) for key in table_map}
+
+    print(f"⚡ Loading {len(ordered)} tables in parallel ({workers} workers)...")
+    started = time_module.time()
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='table-loader') as executor:
+        futures = {
+            executor.submit(loader, table_name): key
+            for key, table_name in ordered
+        }
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            if on_loaded is not None:
+                on_loaded(futures[future], results[futures[future]])
+    print(f"⚡ Parallel load finished in {time_module.time() - started:.1f}s")
+
+    # Keep the notebook ordering for downstream summaries
+    return {key: results.get(key) for key in table_map}
+
+
+def _swap_cache(new_dataframes, timestamp=None, partial=False, drop=()):
+    """Publish freshly loaded tables as a new cache snapshot (atomic reference swap).
+
+    timestamp: when the data was read from the database (defaults to now; a restored
+    snapshot keeps its original time so cache age stays truthful).
+    partial: new_dataframes are only the tables to add or replace, e.g. one published while
+    the load is still running (see _progressive_publisher) or a lazy table; the load stays in
+    progress, the cache keeps its timestamp and hooks wait for the final swap.
+    Lazy tables of the previous snapshot missing from new_dataframes are carried over
+    unless listed in drop (cache keys).
+    """
+    global _current_snapshot, cache_loading
+    with cache_lock:
+        previous = _current_snapshot
+        # Merged under the lock so concurrent publishers never lose each other's tables
+        new_dataframes = {**previous.tables, **new_dataframes} if partial else dict(new_dataframes)
+        for key, df in previous.tables.items():
+            if key not in new_dataframes and key not in drop and TABLES.get(key) in LAZY_TABLES:
+                new_dataframes[key] = df
+        if partial:
+            timestamp = timestamp or previous.timestamp
+        snapshot = CacheSnapshot(previous.version + 1, new_dataframes, timestamp or datetime.now())
+        if previous.tables and all(snapshot.tables.get(key) is df for key, df in previous.tables.items()) \
+                and len(snapshot.tables) == len(previous.tables):
+            # Nothing changed (e.g. every table skipped by change detection): keep the warm values
+            snapshot.inherit_derived(previous)
+        _current_snapshot = snapshot
+        _retired_snapshots.add(previous)
+        if partial:
+            return
+        cache_loading = False
+        print(f"\n🕒 Cache loaded successfully at: "
+              f"{snapshot.timestamp.strftime('%Y-%m-%d %H:%M:%S')} (version {snapshot.version})")
+    _start_post_reload_hooks(snapshot)
+
+
+def _progressive_publisher():
+    """on_loaded callback for _load_tables that publishes each table as soon as it has loaded.
+
+    With PROGRESSIVE_PUBLISH='cold' only tables the cache does not hold yet are published early
+    (a warm cache keeps serving one consistent load until the final swap); 'always' also
+    replaces cached tables one by one. Returns None when PROGRESSIVE_PUBLISH='off'.
+    """
+    if PROGRESSIVE_PUBLISH not in ('cold', 'always'):
+        return None
+
+    def publish(key, df):
+        current = _current_snapshot.tables
+        if df is None or current.get(key) is df:
+            return
+        if PROGRESSIVE_PUBLISH == 'cold' and key in current:
+            return
+        _swap_cache({key: df}, partial=True)
+        print(f"📤 {TABLES[key]} queryable (cache version {_current_snapshot.version}, "
+              f"{len(_current_snapshot.tables)} tables)")
+    return publish
+
+
+def _table_bytes(key, df):
+    nbytes = frame_bytes(df)
+    _table_bytes_seen[TABLES.get(key, key)] = nbytes
+    return nbytes
+
+
+def _live_cache_bytes():
+    """Bytes of every distinct table held by the current snapshot or by superseded snapshots
+    that requests still pin (replaced tables are only freed once those requests finish)."""
+    frames = {}
+    for snapshot in [_current_snapshot, *list(_retired_snapshots)]:
+        for key, df in snapshot.tables.items():
+            frames[id(df)] = (key, df)
+    return sum(_table_bytes(key, df) for key, df in frames.values())
+
+
+def _estimated_table_bytes(table_name):
+    """Expected size of a table once reloaded: its cached size (or last known size) plus margin"""
+    df = _current_snapshot.tables.get(_cache_key(table_name))
+    nbytes = _table_bytes(_cache_key(table_name), df) if df is not None else _table_bytes_seen.get(table_name, 0)
+    return int(nbytes * RELOAD_GROWTH_MARGIN)
+
+
+def _check_memory_budget(table_names, serialized):
+    """Refuse a reload whose estimated peak exceeds RELOAD_MEMORY_BUDGET_MB.
+
+    serialized: tables are replaced one at a time (peak = cache + largest table) instead of
+    being built next to the whole cache (peak = cache + every reloaded table).
+    """
+    if RELOAD_MEMORY_BUDGET_MB <= 0:
+        return
+    estimates = [_estimated_table_bytes(table_name) for table_name in table_names]
+    extra = max(estimates, default=0) if serialized else sum(estimates)
+    peak_mb = (_live_cache_bytes() + extra) / 2**20
+    if peak_mb > RELOAD_MEMORY_BUDGET_MB:
+        raise Exception(f"Reload refused: estimated peak {peak_mb:,.0f} MB exceeds "
+                        f"RELOAD_MEMORY_BUDGET_MB={RELOAD_MEMORY_BUDGET_MB:,.0f}")
+
+
+def _memory_capped_loader(loader):
+    """Wrap a table loader so each table starts only once it fits in the memory budget.
+
+    Old tables replaced earlier in the load stay alive while requests pin their snapshot; the
+    load waits up to RELOAD_MEMORY_WAIT_SECONDS for those requests, then gives up.
+    """
+    def load(table_name):
+        needed = _estimated_table_bytes(table_name)
+        deadline = time_module.time() + RELOAD_MEMORY_WAIT_SECONDS
+        while (_live_cache_bytes() + needed) / 2**20 > RELOAD_MEMORY_BUDGET_MB:
+            if time_module.time() >= deadline:
+                raise Exception(f"{table_name}: memory budget of {RELOAD_MEMORY_BUDGET_MB:,.0f} MB "
+                                f"still exceeded after {RELOAD_MEMORY_WAIT_SECONDS:.0f}s, reload stopped")
+            time_module.sleep(0.5)
+        return loader(table_name)
+    return load
+
+
+def _memory_capped_publisher():
+    """on_loaded callback for a budgeted load: swap each table in as soon as it has loaded,
+    so the table it replaces can be freed before the next one is fetched."""
+    def publish(key, df):
+        if df is None:
+            return
+        peak = _live_cache_bytes() + _table_bytes(key, df)
+        _last_reload_memory['peak_bytes'] = max(_last_reload_memory.get('peak_bytes', 0), peak)
+        if _current_snapshot.tables.get(key) is df:
+            return
+        _swap_cache({key: df}, partial=True)
+        print(f"📤 {TABLES[key]} swapped in ({_table_bytes(key, df) / 2**20:,.0f} MB, "
+              f"cache now {_live_cache_bytes() / 2**20:,.0f} MB)")
+    return publish
+
+
+def get_cache_memory():
+    """Memory held by the cache: per-table MB, tables still pinned by in-flight requests,
+    the reload budget, the peak of the last budgeted reload and the process RSS (with psutil)."""
+    snapshot = _current_snapshot
+    tables = {TABLES.get(key, key): round(_table_bytes(key, df) / 2**20, 1) for key, df in snapshot.tables.items()}
+    live_mb = _live_cache_bytes() / 2**20
+    peak = _last_reload_memory.get('peak_bytes')
+    memory = {
+        'cache_mb': round(sum(tables.values()), 1),
+        'retained_mb': round(max(live_mb - sum(tables.values()), 0), 1),
+        'tables_mb': tables,
+        'budget_mb': RELOAD_MEMORY_BUDGET_MB or None,
+        'reload_strategy': 'table-by-table' if RELOAD_MEMORY_BUDGET_MB > 0 else 'parallel',
+        'last_reload_peak_mb': round(peak / 2**20, 1) if peak else None,
+        'process_rss_mb': None,
+    }
+    if PSUTIL_AVAILABLE:
+        memory['process_rss_mb'] = round(psutil.Process().memory_info().rss / 2**20, 1)
+    return memory
+
+
+def get_memory_report(table_name=None):
+    """Deep memory use of the cached tables, per table and per column, with slimming hints.
+
+    Args:
+        table_name: InterBase table name to profile alone (None = every cached table)
+
+    Returns:
+        dict: summary (get_cache_memory), tables {name: profile_frame(...)} and
+              suggestions (every column hint across tables, largest saving first)
+    """
+    snapshot = _current_snapshot
+    tables = {}
+    for key, df in snapshot.tables.items():
+        name = TABLES.get(key, key)
+        if table_name is None or name == table_name:
+            tables[name] = {'cache_key': key, **profile_frame(df)}
+    suggestions = [
+        {'table': name, 'column': column, 'dtype': profile['dtype'], 'suggestion': profile['suggestion'],
+         'savings_mb': profile['savings_mb']}
+        for name, table in tables.items() for column, profile in table['columns'].items()
+        if profile.get('suggestion')
+    ]
+    suggestions.sort(key=lambda entry: entry['savings_mb'], reverse=True)
+    return {
+        'cache_version': snapshot.version,
+        'summary': get_cache_memory(),
+        'tables': tables,
+        'suggestions': suggestions,
+    }
+
+
+def _record_memory_history(snapshot):
+    """Post-reload hook: append the size of every table of the new snapshot to the memory history."""
+    tables = {
+        TABLES.get(key, key): {'rows': int(len(df)), 'mb': round(_table_bytes(key, df) / 2**20, 3)}
+        for key, df in snapshot.tables.items()
+    }
+    record_memory_sample({
+        'version': snapshot.version,
+        'timestamp': (snapshot.timestamp or datetime.now()).isoformat(),
+        'total_mb': round(sum(entry['mb'] for entry in tables.values()), 3),
+        'tables': tables,
+    })
+
+
+def _full_load_tables():
+    """{cache_key: table} for a full load: eager tables plus lazy ones still in use.
+
+    Returns:
+        tuple: (table map, cache keys of lazy tables to drop as idle)
+    """
+    now = datetime.now()
+    table_map, idle = {}, []
+    for key, table_name in TABLES.items():
+        if table_name not in LAZY_TABLES:
+            table_map[key] = table_name
+        elif key in _current_snapshot.tables:
+            last_access = _table_usage.get(table_name, {}).get('last_access')
+            if last_access and (now - last_access).total_seconds() <= LAZY_TABLE_IDLE_HOURS * 3600:
+                table_map[key] = table_name
+            else:
+                idle.append(key)
+    return table_map, idle
+
+
+def ensure_tables(keys):
+    """Record a use of the given cache tables and fetch lazy ones that are not loaded yet.
+
+    Call before the request pins its snapshot (get_dataframes) so the report sees them.
+    The first request for a lazy table waits for its load; later requests find it cached.
+
+    Args:
+        keys: cache keys (e.g. 'vouchers') or InterBase table names
+    """
+    now = datetime.now()
+    keys = [key if key in TABLES else _cache_key(key) for key in keys]
+    keys = [key for key in keys if key is not None]
+    with _usage_lock:
+        for key in keys:
+            usage = _table_usage.setdefault(TABLES[key], {'count': 0, 'last_access': None})
+            usage['count'] += 1
+            usage['last_access'] = now
+
+    missing = [key for key in keys if TABLES[key] in LAZY_TABLES and key not in _current_snapshot.tables]
+    if not missing:
+        return
+    with _lazy_load_lock:
+        # Another request may have loaded them while this one waited
+        missing = [key for key in missing if key not in _current_snapshot.tables]
+        if not missing:
+            return
+        print(f"💤 Loading lazy table(s) on first use: {', '.join(TABLES[key] for key in missing)}")
+        loaded = {key: df for key, df in _load_tables({key: TABLES[key] for key in missing}).items()
+                  if df is not None}
+        if loaded:
+            now = datetime.now()
+            for key in loaded:
+                _table_refreshed_at[TABLES[key]] = now
+                _table_full_loaded_at[TABLES[key]] = now
+            _swap_cache(loaded, partial=True)
+
+
+def _cache_key(table_name):
+    for key, name in TABLES.items():
+        if name == table_name:
+            return key
+    return None
+
+
+def _lazy_unloaded(table_name):
+    """True for a lazy table nobody has used yet (scheduled refreshes leave it alone)"""
+    return table_name in LAZY_TABLES and _cache_key(table_name) not in _current_snapshot.tables
+
+
+def get_table_usage():
+    """Registry of every table: eager/lazy, loaded, rows, use count and last access"""
+    tables = _current_snapshot.tables
+    with _usage_lock:
+        usage = {name: dict(entry) for name, entry in _table_usage.items()}
+    registry = {}
+    for key, table_name in TABLES.items():
+        entry = usage.get(table_name, {'count': 0, 'last_access': None})
+        df = tables.get(key)
+        registry[table_name] = {
+            'cache_key': key,
+            'mode': 'lazy' if table_name in LAZY_TABLES else 'eager',
+            'loaded': df is not None,
+            'rows': int(len(df)) if df is not None else None,
+            'count': entry['count'],
+            'last_access': entry['last_access'].isoformat() if entry['last_access'] else None,
+        }
+    return registry
+
+
+def get_table_column_names(table_name):
+    """Column names of a table, from the last load or the InterBase system tables; None if unknown"""
+    if table_name in _table_columns:
+        return _table_columns[table_name]
+    try:
+        return _run_on_connection(lambda cursor: _get_table_columns(cursor, table_name))
+    except Exception:
+        return None
+
+
+def get_cached_column_names(table_name):
+    """Columns a load of the table brings into the cache: the projected ones (see _resolve_columns)
+    or all of them; None if unknown"""
+    columns = get_table_column_names(table_name)
+    wanted = get_projection(table_name)
+    if not columns or not wanted:
+        return columns
+    return [c for c in columns if c in wanted and c.isidentifier() and c.isupper()] or columns
+
+
+def register_post_reload_hook(name, func):
+    """Run func(snapshot) in the background each time a new cache snapshot is published.
+
+    Hooks warm the snapshot before users reach it: indexes, rollups and common report results
+    are stored with snapshot.derived() and dropped with the snapshot. Registering the same
+    name again replaces the hook.
+    """
+    with _hooks_lock:
+        _post_reload_hooks[name] = func
+
+
+register_post_reload_hook('memory history', _record_memory_history)
+
+
+def _run_post_reload_hooks(snapshot):
+    with _hooks_lock:
+        hooks = list(_post_reload_hooks.items())
+    for name, func in hooks:
+        if _current_snapshot is not snapshot:
+            print(f"⏭️ Snapshot {snapshot.version} superseded, skipping remaining warm-up hooks")
+            return
+        started = time_module.perf_counter()
+        run = {'version': snapshot.version, 'started': datetime.now().isoformat()}
+        try:
+            func(snapshot)
+            run['status'] = 'ok'
+        except Exception as e:
+            run['status'] = 'error'
+            run['error'] = str(e)
+            print(f"⚠️ Post-reload hook '{name}' failed: {e}")
+        run['duration_seconds'] = round(time_module.perf_counter() - started, 3)
+        _hook_runs[name] = run
+        print(f"🔥 Post-reload hook '{name}' done in {run['duration_seconds']:.1f}s")
+
+
+def _start_post_reload_hooks(snapshot):
+    if _post_reload_hooks and snapshot.tables:
+        threading.Thread(target=_run_post_reload_hooks, args=(snapshot,), daemon=True,
+                         name='post-reload-hooks').start()
+
+
+def get_post_reload_hook_status():
+    """Last run of every post-reload hook: snapshot version, duration, outcome"""
+    with _hooks_lock:
+        names = list(_post_reload_hooks)
+    return {name: _hook_runs.get(name) for name in names}
+
+
+def _write_snapshot(tables):
+    """Persist the published tables to disk in the background (no-op when CACHE_SNAPSHOT=0)."""
+    if not CACHE_SNAPSHOT:
+        return
+    metadata = {
+        'cache_timestamp': _current_snapshot.timestamp.isoformat() if _current_snapshot.timestamp else None,
+        'last_full_load': _last_full_load.isoformat() if _last_full_load else None,
+        'watermarks': {
+            table_name: {k: v.isoformat() if isinstance(v, datetime) else v for k, v in mark.items()}
+            for table_name, mark in _watermarks.items()
+        },
+        'table_refreshed_at': {t: ts.isoformat() for t, ts in _table_refreshed_at.items()},
+        'table_full_loaded_at': {t: ts.isoformat() for t, ts in _table_full_loaded_at.items()},
+        'fingerprints': dict(_fingerprints),
+        # Columns each table was loaded with: a restart with other report columns reloads it
+        'projections': {TABLES[key]: get_projection(TABLES[key]) for key in tables if key in TABLES},
+    }
+    threading.Thread(target=save_snapshot, args=(dict(tables), metadata), daemon=True).start()
+
+
+def restore_snapshot():
+    """Warm start: publish the last on-disk snapshot into the cache.
+
+    Restores watermarks and the last full load time too, so the following refresh can stay
+    incremental. A table saved with another column projection than the current one (a report
+    declared new columns since) is left out, with its watermark and fingerprint, so the next
+    load pulls it whole. Returns True if a snapshot was restored.
+    """
+    global _last_full_load
+    if not CACHE_SNAPSHOT:
+        return False
+    tables, manifest = load_snapshot()
+    if not tables:
+        return False
+
+    metadata = manifest.get('metadata', {})
+    projections = metadata.get('projections', {})
+    stale = {TABLES[key] for key in tables
+             if key in TABLES and projections.get(TABLES[key]) != get_projection(TABLES[key])}
+    if stale:
+        print(f"🔀 Column projection changed for {', '.join(sorted(stale))} — not restored, reloading")
+        tables = {key: df for key, df in tables.items() if TABLES.get(key) not in stale}
+        if not tables:
+            return False
+
+    for table_name, mark in metadata.get('watermarks', {}).items():
+        if table_name in stale:
+            continue
+        if 'max_logdate' in mark:
+            mark['max_logdate'] = datetime.fromisoformat(mark['max_logdate'])
+        _watermarks[table_name] = mark
+    if metadata.get('last_full_load'):
+        _last_full_load = datetime.fromisoformat(metadata['last_full_load'])
+    for table_name, ts in metadata.get('table_refreshed_at', {}).items():
+        if table_name not in stale:
+            _table_refreshed_at[table_name] = datetime.fromisoformat(ts)
+    for table_name, ts in metadata.get('table_full_loaded_at', {}).items():
+        if table_name not in stale:
+            _table_full_loaded_at[table_name] = datetime.fromisoformat(ts)
+    for table_name, fingerprint in metadata.get('fingerprints', {}).items():
+        if table_name not in stale:
+            _fingerprints[table_name] = fingerprint
+
+    # Parquet does not keep shared string objects; normalising again re-interns the keys
+    tables = {key: normalize_table_schema(df) for key, df in tables.items()}
+    timestamp = metadata.get('cache_timestamp')
+    _swap_cache(tables, datetime.fromisoformat(timestamp) if timestamp else None)
+    # The usage registry is not persisted: a restored lazy table counts as used now, so the first
+    # full load keeps it instead of dropping it as idle (LAZY_TABLE_IDLE_HOURS from the restart)
+    now = datetime.now()
+    with _usage_lock:
+        for key in tables:
+            if TABLES.get(key) in LAZY_TABLES:
+                usage = _table_usage.setdefault(TABLES[key], {'count': 0, 'last_access': None})
+                usage['last_access'] = usage['last_access'] or now
+    print(f"💾 Restored {len(tables)} tables from snapshot")
+    return True
+
+
+def _compute_watermark(table_name, df):
+    """Return {'max_id', 'max_logdate'} for a loaded transaction table, or None if unusable."""
+    id_col, date_col = INCREMENTAL_TABLES[table_name]
+    if df is None or id_col not in df.columns:
+        return None
+    ids = pd.to_numeric(df[id_col], errors='coerce')
+    if ids.notna().sum() == 0:
+        return None
+    max_id = ids.max()
+    mark = {'max_id': int(max_id) if float(max_id).is_integer() else float(max_id)}
+    if date_col in df.columns:
+        dates = pd.to_datetime(df[date_col], errors='coerce')
+        if dates.notna().any():
+            mark['max_logdate'] = dates.max().to_pydatetime()
+    return mark
+
+
+def _update_watermarks(tables):
+    """Recompute high-water marks for the incremental tables present in `tables`."""
+    for key, df in tables.items():
+        table_name = TABLES.get(key)
+        if table_name not in INCREMENTAL_TABLES:
+            continue
+        mark = _compute_watermark(table_name, df)
+        if mark:
+            _watermarks[table_name] = mark
+        else:
+            _watermarks.pop(table_name, None)
+
+
+def _merge_delta(table_name, base_df, delta_df):
+    """Upsert delta rows into a cached table: rows with the same id are replaced, new ones appended."""
+    if delta_df.empty:
+        return base_df
+    id_col = INCREMENTAL_TABLES[table_name][0]
+    kept = base_df[~base_df[id_col].isin(delta_df[id_col])]
+    return pd.concat([kept, delta_df], ignore_index=True)
+
+
+def load_dataframes(force=False):
     """Load all tables with descriptive names (matching notebook exactly).
     Uses ODBC when enabled for best speed.
+    With RELOAD_MEMORY_BUDGET_MB the tables are replaced one by one instead of in one final
+    swap, and a load that would exceed the budget is refused.
+    With CHANGE_DETECTION, tables whose fingerprint is unchanged keep their cached frame
+    unless force=True.
     NOTE: This function should be called with cache_lock acquired, or it will
     acquire the lock internally to set cache_loading flag atomically.
+    Returns the published tables, or None when another load was already running.
     """
-    global dataframes, cache_loading, cache_timestamp, _using_odbc
+    global cache_loading, _using_odbc, _last_full_load
 
     # Ensure we set loading flag atomically
     with cache_lock:
         if cache_loading:
             print("⚠️ Cache loading already in progress, skipping duplicate load")
-            return dataframes  # Return existing cache
+            return None
 
         cache_loading = True
         print("Loading database tables...")
+    table_map, idle_tables = _full_load_tables()
+    _begin_progress(table_map.values())
+    budgeted = RELOAD_MEMORY_BUDGET_MB > 0
 
     # Now do the actual loading outside the lock (to avoid holding lock during I/O)
     try:
-        # Test connection: prefer ODBC when enabled (much faster)
-        if USE_ODBC and PYODBC_AVAILABLE:
-            try:
-                print("🔗 Testing ODBC connection (faster path)...")
-                conn = pyodbc.connect(get_connection_string())
-                conn.close()
-                _using_odbc = True
-                print("✅ ODBC connection OK — using ODBC for all tables")
-            except Exception as e:
-                print(f"⚠️ ODBC failed: {e} — falling back to direct InterBase")
-                _using_odbc = False
-        else:
-            _using_odbc = False
-            if USE_ODBC and not PYODBC_AVAILABLE:
-                print("⚠️ USE_ODBC=1 but pyodbc not installed — using direct InterBase")
+        if budgeted:
+            _check_memory_budget(table_map.values(), serialized=True)
+            _last_reload_memory.clear()
 
-        if not _using_odbc and INTERBASE_AVAILABLE:
+        if DB_BACKEND == 'sqlite':
             try:
-                print("🔗 Testing direct InterBase connection...")
-                dsn = f"{DATABASE_CONFIG['DATA_SOURCE']}:{DATABASE_CONFIG['DATABASE_PATH']}"
-                kwargs = {
-                    'dsn': dsn,
-                    'user': DATABASE_CONFIG['USERNAME'],
-                    'password': DATABASE_CONFIG['PASSWORD'],
-                    'charset': 'UTF8',
-                }
-                if DATABASE_CONFIG.get('CLIENT_LIBRARY'):
-                    kwargs['ib_library_name'] = DATABASE_CONFIG['CLIENT_LIBRARY']
-                test_conn = interbase.connect(**kwargs)
-                test_conn.close()
-                print("✅ Direct InterBase connection test successful")
+                print(f"🔗 Using SQLite stand-in database {SQLITE_DATABASE}")
+                with sqlite_pool.connection(POOL_ACQUIRE_TIMEOUT):
+                    pass
             except Exception as e:
                 with cache_lock:
                     cache_loading = False
                 raise Exception(f"Database connection failed: {e}")
-        elif not _using_odbc:
-            with cache_lock:
-                cache_loading = False
-            raise Exception("Install pyodbc and an InterBase ODBC driver, or the interbase Python package")
+        else:
+            # Test connection: prefer ODBC when enabled (much faster)
+            if USE_ODBC and PYODBC_AVAILABLE:
+                try:
+                    print("🔗 Testing ODBC connection (faster path)...")
+                    # The tested connection stays in the pool for the first table load
+                    with odbc_pool.connection(POOL_ACQUIRE_TIMEOUT):
+                        pass
+                    _using_odbc = True
+                    print("✅ ODBC connection OK — using ODBC for all tables")
+                except Exception as e:
+                    print(f"⚠️ ODBC failed: {e} — falling back to direct InterBase")
+                    _using_odbc = False
+            else:
+                _using_odbc = False
+                if USE_ODBC and not PYODBC_AVAILABLE:
+                    print("⚠️ USE_ODBC=1 but pyodbc not installed — using direct InterBase")
+
+            if not _using_odbc and INTERBASE_AVAILABLE:
+                try:
+                    print("🔗 Testing direct InterBase connection...")
+                    with direct_pool.connection(POOL_ACQUIRE_TIMEOUT):
+                        pass
+                    print("✅ Direct InterBase connection test successful")
+                except Exception as e:
+                    with cache_lock:
+                        cache_loading = False
+                    raise Exception(f"Database connection failed: {e}")
+            elif not _using_odbc:
+                with cache_lock:
+                    cache_loading = False
+                raise Exception("Install pyodbc and an InterBase ODBC driver, or the interbase Python package")
 
         # Load all tables (ODBC or direct per connect_and_load_table)
-        sites_df = connect_and_load_table('ALLSTOCK')          # Site/Location master data
-        categories_df = connect_and_load_table('DETDESCR')     # Category definitions  
-        invoice_headers_df = connect_and_load_table('INVOICE') # Invoice headers
-        sales_details_df = connect_and_load_table('ITEMS')     # Sales transaction details
-        vouchers_df = connect_and_load_table('PAYM')           # Payment vouchers
-        accounts_df = connect_and_load_table('SUB')            # Accounts/Sub-accounts data
-        inventory_items_df = connect_and_load_table('STOCK')   # Items/Products master
-        inventory_transactions_df = connect_and_load_table('ALLITEM') # All inventory transactions
-        
-        # Create dataframes dictionary with descriptive names (matching notebook exactly)
-        temp_dataframes = {
-            'sites': sites_df,
-            'categories': categories_df, 
-            'invoice_headers': invoice_headers_df,
-            'sales_details': sales_details_df,
-            'vouchers': vouchers_df,
-            'accounts': accounts_df,
-            'inventory_items': inventory_items_df,
-            'inventory_transactions': inventory_transactions_df
-        }
+        fingerprints, skipped = {}, []
+        if budgeted:
+            # One table at a time, each swapped in (and its predecessor released) before the next
+            loader = _memory_capped_loader(connect_and_load_table)
+            if CHANGE_DETECTION:
+                loader = _change_aware_loader({} if force else None, fingerprints, skipped, loader)
+            temp_dataframes = _load_tables(table_map, loader, _memory_capped_publisher(), max_workers=1)
+        elif CHANGE_DETECTION:
+            cached = {} if force else _current_snapshot.tables
+            temp_dataframes = _load_tables(table_map, _change_aware_loader(cached, fingerprints, skipped),
+                                           _progressive_publisher())
+        else:
+            temp_dataframes = _load_tables(table_map, on_loaded=_progressive_publisher())
         
         # Remove None values and show summary (matching notebook exactly)
         new_dataframes = {k: v for k, v in temp_dataframes.items() if v is not None}
@@ -203,14 +1474,20 @@ def load_dataframes():
             raise Exception("No tables were loaded successfully")
             
         # Atomically replace cache to prevent inconsistent reads
-        with cache_lock:
-            dataframes.clear()
-            dataframes.update(new_dataframes)
-            cache_timestamp = datetime.now()
-            cache_loading = False
-            print(f"\n🕒 Cache loaded successfully at: {cache_timestamp.strftime('%Y-%m-%d %H:%M:%S')}")
+        _update_watermarks(new_dataframes)
+        if idle_tables:
+            print(f"💤 Dropping idle lazy table(s): {', '.join(TABLES[key] for key in idle_tables)}")
+        _swap_cache(new_dataframes, drop=idle_tables)
+        _last_full_load = _current_snapshot.timestamp
+        _commit_fingerprints(fingerprints, temp_dataframes, skipped)
+        for key in new_dataframes:
+            if TABLES[key] not in skipped:
+                _table_refreshed_at[TABLES[key]] = _last_full_load
+                _table_full_loaded_at[TABLES[key]] = _last_full_load
+        if len(skipped) < len(new_dataframes):
+            _write_snapshot(_current_snapshot.tables)
         
-        return dataframes
+        return _current_snapshot.tables
         
     except Exception as e:
         print(f"❌ Error in load_dataframes: {e}")
@@ -219,9 +1496,297 @@ def load_dataframes():
             cache_loading = False
         raise e
 
+def refresh_dataframes_incremental():
+    """Refresh the transaction tables (INVOICE, ITEMS, ALLITEM) using their high-water marks.
+
+    Only rows with an id above the cached maximum, or a LOGDATE at/after the cached maximum,
+    are fetched and upserted into the cached frames. Falls back to a full load_dataframes()
+    when nothing is cached yet or the last full load is older than INCREMENTAL_FULL_RELOAD_HOURS
+    (periodic reconcile for deletes and edits the watermark cannot see). Eager tables missing
+    from the cache (e.g. left out of a warm start) are loaded whole with them.
+    Returns the published tables, or None when another load was already running.
+    """
+    full_age = (datetime.now() - _last_full_load).total_seconds() if _last_full_load else None
+    if not _current_snapshot.tables or full_age is None or full_age > INCREMENTAL_FULL_RELOAD_HOURS * 3600:
+        print("🔁 Full reconcile due — running full reload")
+        return load_dataframes()
+
+    missing = [table_name for key, table_name in TABLES.items()
+               if table_name not in LAZY_TABLES and table_name not in INCREMENTAL_TABLES
+               and key not in _current_snapshot.tables]
+    return reload_tables(list(INCREMENTAL_TABLES) + missing)
+
+def _refresh_table_delta(table_name, cached_df):
+    """Fetch the rows of a transaction table changed since its watermark and upsert them.
+
+    Returns the merged DataFrame, or None when the delta fetch failed.
+    """
+    mark = _watermarks[table_name]
+    id_col, date_col = INCREMENTAL_TABLES[table_name]
+    where = f"{id_col} > ?"
+    params = [mark['max_id']]
+    if 'max_logdate' in mark:
+        where += f" OR {date_col} >= ?"
+        params.append(mark['max_logdate'])
+
+    delta_df = connect_and_load_table(table_name, where, params)
+    if delta_df is None:
+        print(f"⚠️ {table_name}: delta fetch failed, keeping cached rows")
+        return None
+
+    merged = _merge_delta(table_name, cached_df, delta_df)
+    print(f"➕ {table_name}: merged {len(delta_df):,} new/modified rows ({len(merged):,} total)")
+    return merged
+
+def reload_tables(table_names, persist=True, force=False):
+    """Refresh only the given tables and publish them in a new snapshot (table-level swap).
+
+    Transaction tables with a watermark get a delta refresh, unless their last full load is
+    older than INCREMENTAL_FULL_RELOAD_HOURS; every other table is re-pulled whole (in
+    parallel like a full load). With CHANGE_DETECTION, tables whose fingerprint is unchanged
+    are skipped. Tables that fail keep their cached rows; all other cached tables are
+    carried over unchanged.
+
+    Args:
+        table_names: InterBase table names (e.g. ['INVOICE', 'ITEMS'])
+        persist: also rewrite the on-disk snapshot
+        force: refresh even the tables whose fingerprint is unchanged
+
+    Returns the published tables, or None when another load was already running.
+    Raises when the refresh would exceed RELOAD_MEMORY_BUDGET_MB.
+    """
+    global cache_loading
+
+    with cache_lock:
+        if cache_loading:
+            print("⚠️ Cache loading already in progress, skipping table refresh")
+            return None
+        cache_loading = True
+        print(f"Refreshing tables: {', '.join(table_names)}...")
+    _begin_progress([t for t in TABLES.values() if t in table_names])
+
+    try:
+        # Refreshed tables are built next to the cache and swapped together
+        _check_memory_budget(table_names, serialized=False)
+        new_dataframes = dict(_current_snapshot.tables)
+        now = datetime.now()
+        full_tables = {}
+        refreshed = []
+        fingerprints, skipped = {}, []
+        checked = {}  # cache key -> DataFrame or None, for _commit_fingerprints
+
+        for key, table_name in TABLES.items():
+            if table_name not in table_names:
+                continue
+            if (table_name in INCREMENTAL_TABLES and table_name in _watermarks and key in new_dataframes
+                    and not _reconcile_due(table_name, now)):
+                if CHANGE_DETECTION:
+                    fingerprints[table_name] = _query_fingerprint(table_name)
+                    if not force and _is_unchanged(table_name, fingerprints[table_name]):
+                        print(f"⏭️ {table_name}: unchanged since last refresh, skipped")
+                        skipped.append(table_name)
+                        _update_progress(table_name, status='unchanged', rows=len(new_dataframes[key]))
+                        checked[key] = new_dataframes[key]
+                        continue
+                df = _refresh_table_delta(table_name, new_dataframes[key])
+                checked[key] = df
+                if df is not None:
+                    new_dataframes[key] = df
+                    refreshed.append(table_name)
+            else:
+                # No usable watermark, reconcile due or not a transaction table: reload whole table
+                full_tables[key] = table_name
+
+        if full_tables:
+            if CHANGE_DETECTION:
+                cached = {} if force else {key: new_dataframes[key] for key in full_tables if key in new_dataframes}
+                loaded = _load_tables(full_tables, _change_aware_loader(cached, fingerprints, skipped))
+            else:
+                loaded = _load_tables(full_tables)
+            for key, df in loaded.items():
+                checked[key] = df
+                if df is None:
+                    print(f"⚠️ {full_tables[key]}: reload failed, keeping cached rows")
+                    continue
+                if full_tables[key] in skipped:
+                    continue
+                new_dataframes[key] = df
+                refreshed.append(full_tables[key])
+                _table_full_loaded_at[full_tables[key]] = now
+
+        _update_watermarks({key: new_dataframes[key] for key, table_name in TABLES.items()
+                            if table_name in refreshed})
+        for table_name in refreshed:
+            _table_refreshed_at[table_name] = now
+        _swap_cache(new_dataframes)
+        _commit_fingerprints(fingerprints, checked, skipped)
+        if persist and refreshed:
+            _write_snapshot(new_dataframes)
+        return _current_snapshot.tables
+
+    except Exception as e:
+        print(f"❌ Error in reload_tables: {e}")
+        with cache_lock:
+            cache_loading = False
+        raise e
+
+def start_load_job(mode='full', force=False, tables=None):
+    """Run a reload on a background thread and return its job at once.
+
+    mode: 'full' (load_dataframes), 'incremental' (refresh_dataframes_incremental) or
+    'tables' (reload_tables(tables)). Poll get_load_job(job['id']) for progress.
+
+    Returns:
+        tuple: (job dict, started) — started is False when a load job was already running,
+               whose job is returned instead
+    Raises:
+        RuntimeError: a load not started as a job (e.g. a scheduled reload) is running
+        ValueError: unknown mode or table
+    """
+    if mode not in ('full', 'incremental', 'tables'):
+        raise ValueError(f"Unknown load mode: {mode}")
+    if mode == 'tables':
+        tables = [TABLES.get(t, str(t).upper()) for t in (tables or [])]
+        unknown = [t for t in tables if t not in TABLES.values()]
+        if not tables or unknown:
+            raise ValueError(f"Unknown tables: {unknown or 'none given'}")
+
+    with _load_jobs_lock:
+        for job in _load_jobs.values():
+            if job['status'] in ('queued', 'running'):
+                return dict(job), False
+        if is_cache_loading():
+            raise RuntimeError('Cache loading already in progress')
+        job = {
+            'id': uuid.uuid4().hex[:12],
+            'mode': mode,
+            'force': force,
+            'tables': tables,
+            'status': 'queued',
+            'submitted': datetime.now().isoformat(),
+            'started': None,
+            'finished': None,
+            'duration_seconds': None,
+            'cache_version': None,
+            'loaded_tables': None,
+            'error': None,
+        }
+        _load_jobs[job['id']] = job
+        while len(_load_jobs) > LOAD_JOB_HISTORY:
+            del _load_jobs[next(iter(_load_jobs))]
+
+    threading.Thread(target=_run_load_job, args=(job,), daemon=True, name=f"load-job-{job['id']}").start()
+    print(f"🚀 Load job {job['id']} started (mode={mode})")
+    return dict(job), True
+
+def _run_load_job(job):
+    started = time_module.perf_counter()
+    with _load_jobs_lock:
+        job['status'] = 'running'
+        job['started'] = datetime.now().isoformat()
+    try:
+        if job['mode'] == 'incremental':
+            result = refresh_dataframes_incremental()
+        elif job['mode'] == 'tables':
+            result = reload_tables(job['tables'], force=job['force'])
+        else:
+            result = load_dataframes(force=job['force'])
+        # None when another load (e.g. a scheduled one) got there first; a concurrent per-table
+        # refresh or lazy load also bumps the cache version, so that cannot tell the two apart
+        status = 'done' if result is not None else 'skipped'
+        error = None if status == 'done' else 'Another load was already running'
+        loaded = list(result.keys()) if result else []
+    except Exception as e:
+        status, error, loaded = 'failed', str(e), None
+    with _load_jobs_lock:
+        job.update({
+            'status': status,
+            'error': error,
+            'loaded_tables': loaded,
+            'cache_version': _current_snapshot.version,
+            'finished': datetime.now().isoformat(),
+            'duration_seconds': round(time_module.perf_counter() - started, 1),
+            'progress': get_load_progress(),
+        })
+    print(f"🏁 Load job {job['id']} {status} in {job['duration_seconds']:.1f}s")
+
+def get_load_job(job_id):
+    """Job dict with live per-table progress while it runs, or None for an unknown id"""
+    with _load_jobs_lock:
+        job = _load_jobs.get(job_id)
+        job = dict(job) if job else None
+    if job and job['status'] in ('queued', 'running'):
+        job['progress'] = get_load_progress()
+    return job
+
+def get_load_jobs():
+    """Recent load jobs, newest first (without progress details)"""
+    with _load_jobs_lock:
+        jobs = [dict(job) for job in _load_jobs.values()]
+    for job in jobs:
+        job.pop('progress', None)
+    return jobs[::-1]
+
+def get_active_load_job_id():
+    """Id of the load job currently queued or running, or None"""
+    with _load_jobs_lock:
+        for job in _load_jobs.values():
+            if job['status'] in ('queued', 'running'):
+                return job['id']
+    return None
+
+def get_known_columns(table_name):
+    """Column names of a table as last read from InterBase, or None if not known yet"""
+    return _table_columns.get(table_name)
+
+def get_change_detection_status():
+    """Tables skipped as unchanged by the last reload, and when the last change check ran"""
+    return {
+        'skipped_tables': list(_last_skipped_tables),
+        'last_change_check': _last_change_check.isoformat() if _last_change_check else None,
+    }
+
+def get_last_full_load():
+    """Get the timestamp of the last full (non-incremental) load"""
+    return _last_full_load
+
+def get_cache_snapshot():
+    """Cache snapshot for the caller.
+
+    Inside a request the snapshot is pinned on first use and reused until teardown
+    (release_request_snapshot), so every table a request reads comes from the same load.
+    Pinning a stale snapshot starts a background refresh (revalidate_if_stale); the request
+    itself is still answered from the pinned snapshot. An empty cache is left to
+    AUTO_LOAD_ON_STARTUP or an explicit load, so a page view never starts the first load.
+    Outside a request the latest snapshot is returned.
+    """
+    if not has_request_context():
+        return _current_snapshot
+    snapshot = g.get('cache_snapshot')
+    if snapshot is None:
+        snapshot = _current_snapshot.acquire()
+        g.cache_snapshot = snapshot
+        if snapshot.tables:
+            revalidate_if_stale()
+    return snapshot
+
+def release_request_snapshot(exc=None):
+    """teardown_request hook: unpin the request's cache snapshot"""
+    snapshot = g.pop('cache_snapshot', None)
+    if snapshot is not None:
+        snapshot.release()
+
 def get_dataframes():
-    """Get the cached dataframes"""
-    return dataframes
+    """Get the cached dataframes (read-only mapping of the pinned snapshot)"""
+    return get_cache_snapshot().tables
+
+def get_cache_version():
+    """Version number of the latest published cache snapshot"""
+    return _current_snapshot.version
+
+def get_retired_snapshot_count():
+    """Superseded snapshots not yet freed (still pinned by in-flight requests)"""
+    return len(_retired_snapshots)
 
 def is_cache_loading():
     """Check if cache is currently loading"""
@@ -233,23 +1798,98 @@ def get_cache_lock():
 
 def get_cache_timestamp():
     """Get the cache timestamp"""
-    return cache_timestamp
+    return _current_snapshot.timestamp
 
 def get_cache_age_seconds():
     """Get cache age in seconds"""
+    cache_timestamp = _current_snapshot.timestamp
     if cache_timestamp is None:
         return None
     return (datetime.now() - cache_timestamp).total_seconds()
 
+def get_cache_freshness(snapshot=None, max_age_seconds=None):
+    """Staleness of a snapshot (default: the current one) under the freshness policy.
+
+    Returns:
+        dict: state ('fresh', 'stale' or 'empty'), age_seconds, max_age_seconds, version,
+              revalidating (a load is running) and revalidation_job_id
+    """
+    snapshot = snapshot or _current_snapshot
+    if max_age_seconds is None:
+        max_age_seconds = CACHE_MAX_AGE_HOURS * 3600
+    age = (datetime.now() - snapshot.timestamp).total_seconds() if snapshot.timestamp else None
+    if not snapshot.tables:
+        state = 'empty'
+    elif age is not None and age <= max_age_seconds:
+        state = 'fresh'
+    else:
+        state = 'stale'
+    return {
+        'state': state,
+        'age_seconds': round(age, 1) if age is not None else None,
+        'max_age_seconds': max_age_seconds,
+        'version': snapshot.version,
+        'revalidating': is_cache_loading(),
+        'revalidation_job_id': get_active_load_job_id(),
+    }
+
+def revalidate_if_stale(max_age_seconds=None):
+    """Stale-while-revalidate: start one background refresh when the cache is stale or empty.
+
+    Never blocks: the caller keeps answering from the current snapshot. At most one refresh
+    runs at a time (see start_load_job). While no new snapshot has been published since the last
+    attempt (it failed or was skipped), the next one waits CACHE_REVALIDATE_MIN_INTERVAL_SECONDS
+    so a failing database is not retried on every request.
+
+    Returns:
+        dict: get_cache_freshness() after the decision, plus 'revalidation_started'
+    """
+    global _last_revalidation
+    freshness = get_cache_freshness(max_age_seconds=max_age_seconds)
+    started = False
+    if freshness['state'] != 'fresh' and not freshness['revalidating']:
+        with _revalidation_lock:
+            now = time_module.time()
+            if (_last_revalidation is None or _last_revalidation[1] != _current_snapshot.version
+                    or now - _last_revalidation[0] >= CACHE_REVALIDATE_MIN_INTERVAL_SECONDS):
+                _last_revalidation = (now, _current_snapshot.version)
+                # Incremental refresh falls back to a full load when nothing is cached yet
+                mode = 'incremental' if INCREMENTAL_RELOAD and freshness['state'] == 'stale' else 'full'
+                try:
+                    job, started = start_load_job(mode)
+                    print(f"♻️ Cache {freshness['state']} (age {freshness['age_seconds']}s) — "
+                          f"revalidating in background (job {job['id']})")
+                except RuntimeError:
+                    pass  # a scheduled reload is already refreshing it
+        if started:
+            freshness = get_cache_freshness(max_age_seconds=max_age_seconds)
+    freshness['revalidation_started'] = started
+    return freshness
+
 # Scheduled reload configuration
 _scheduled_reload_enabled = False
-_scheduled_reload_thread = None
-_scheduled_reload_times = []  # List of time objects for scheduled reloads
+_scheduled_reload_times = []  # Reload schedule: 'HH:MM' daily times or cron expressions ('0 7 * * 1-6')
+DEFAULT_RELOAD_TIMES = ['06:00', '12:00', '18:00']
+RELOAD_JOB_PREFIX = 'reload '
+TABLE_REFRESH_JOB = 'table refresh'
+
+# Per-table refresh cadence in minutes, e.g. {'INVOICE': 10, 'ITEMS': 10}. Listed tables are
+# refreshed on their own interval; the others are reloaded at the scheduled reload times.
+_table_intervals = {}
 
 # Config file path for persisting scheduled reload settings
 _CONFIG_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 SCHEDULED_RELOAD_CONFIG_FILE = os.path.join(_CONFIG_DIR, 'scheduled_reload_config.json')
 
+def _parse_reload_times(reload_times):
+    """time objects, 'HH:MM' strings or cron expressions -> validated schedule strings"""
+    parsed = []
+    for t in reload_times:
+        expression = t.strftime('%H:%M') if isinstance(t, time) else str(t).strip()
+        CronExpression(expression)  # raises ValueError when invalid
+        parsed.append(expression)
+    return parsed
+
 def load_scheduled_reload_config():
     """Load scheduled reload config from JSON file
     
@@ -265,19 +1905,13 @@ def load_scheduled_reload_config():
                 enabled = config.get('enabled', False)
                 times_str = config.get('reload_times', [])
                 
-                if times_str:
-                    # Convert string times to time objects
-                    times = []
-                    for t_str in times_str:
-                        hour, minute = map(int, t_str.split(':'))
-                        times.append(time(hour, minute))
-                    _scheduled_reload_times = times
-                else:
-                    # Default times if none specified
-                    _scheduled_reload_times = [time(6, 0), time(12, 0), time(18, 0)]
+                # 'HH:MM' daily times and cron expressions can be mixed
+                _scheduled_reload_times = _parse_reload_times(times_str or DEFAULT_RELOAD_TIMES)
                 
                 _scheduled_reload_enabled = enabled
-                print(f"✅ Loaded scheduled reload config: enabled={enabled}, times={times_str}")
+                set_table_intervals(config.get('table_intervals', {}))
+                print(f"✅ Loaded scheduled reload config: enabled={enabled}, times={times_str}, "
+                      f"table intervals={_table_intervals or 'none'}")
                 return True
         else:
             print("ℹ️ No scheduled reload config file found, using defaults")
@@ -297,7 +1931,8 @@ def save_scheduled_reload_config():
     try:
         config = {
             'enabled': _scheduled_reload_enabled,
-            'reload_times': [t.strftime('%H:%M') for t in _scheduled_reload_times],
+            'reload_times': list(_scheduled_reload_times),
+            'table_intervals': _table_intervals,
             'last_updated': datetime.now().isoformat()
         }
         
@@ -314,87 +1949,114 @@ def save_scheduled_reload_config():
         return False
 
 def start_scheduled_reload(reload_times=None):
-    """Start background thread for scheduled cache reloads
+    """Schedule cache reloads and per-table refreshes on the cron scheduler
     
     Args:
-        reload_times: List of time objects (e.g., [time(6, 0), time(12, 0), time(18, 0)])
+        reload_times: List of time objects, 'HH:MM' strings or cron expressions
+                     (e.g. ['07:00', '*/30 8-18 * * mon-sat']).
                      If None, uses saved config or default times: 6 AM, 12 PM, 6 PM
     """
-    global _scheduled_reload_enabled, _scheduled_reload_thread, _scheduled_reload_times
+    global _scheduled_reload_enabled, _scheduled_reload_times
     
-    if _scheduled_reload_enabled:
+    if reload_times is not None:
+        _scheduled_reload_times = _parse_reload_times(reload_times)
+    elif _scheduled_reload_enabled and is_scheduler_running():
         print("⚠️ Scheduled reload already running")
         return
-    
-    if reload_times is None:
-        # If no times provided, check if we have saved config
-        if not _scheduled_reload_times:
-            # Try to load from file, or use defaults
-            if not load_scheduled_reload_config():
-                # Default: reload at 6 AM, 12 PM, and 6 PM daily
-                _scheduled_reload_times = [time(6, 0), time(12, 0), time(18, 0)]
-    else:
-        _scheduled_reload_times = reload_times
+    elif not _scheduled_reload_times:
+        # Try to load from file, or use defaults
+        if not load_scheduled_reload_config():
+            # Default: reload at 6 AM, 12 PM, and 6 PM daily
+            _scheduled_reload_times = list(DEFAULT_RELOAD_TIMES)
     
     _scheduled_reload_enabled = True
     
     # Save config to file
     save_scheduled_reload_config()
     
-    def scheduled_reload_worker():
-        """Background thread for scheduled reloads"""
-        print(f"🕐 Scheduled reload worker started. Reload times: {[t.strftime('%H:%M') for t in _scheduled_reload_times]}")
-        last_reload_minute = -1
-        
-        while _scheduled_reload_enabled:
-            try:
-                now = datetime.now()
-                current_time = now.time()
-                current_minute = now.minute
-                
-                # Check each scheduled reload time
-                for reload_time in _scheduled_reload_times:
-                    # Check if it's the right hour and minute (check once per minute)
-                    if (current_time.hour == reload_time.hour and 
-                        current_time.minute == reload_time.minute and
-                        current_minute != last_reload_minute):
-                        
-                        print(f"🔄 Scheduled reload triggered at {current_time.strftime('%H:%M:%S')}")
-                        last_reload_minute = current_minute
-                        
-                        try:
-                            # Check if already loading
-                            if not is_cache_loading():
-                                print("📊 Starting scheduled cache reload...")
-                                load_dataframes()
-                                print("✅ Scheduled cache reload completed")
-                            else:
-                                print("⏳ Cache already loading, skipping scheduled reload")
-                        except Exception as e:
-                            print(f"❌ Scheduled reload failed: {e}")
-                
-                # Sleep for 60 seconds before next check
-                time_module.sleep(60)
-                
-            except Exception as e:
-                print(f"❌ Error in scheduled reload worker: {e}")
-                time_module.sleep(60)  # Continue even on error
-    
-    _scheduled_reload_thread = threading.Thread(target=scheduled_reload_worker, daemon=True)
-    _scheduled_reload_thread.start()
-    print("✅ Scheduled reload worker started")
+    # Each expression is its own job, so the status API shows its next fire time and run durations
+    remove_jobs(RELOAD_JOB_PREFIX)
+    for expression in _scheduled_reload_times:
+        add_job(f"{RELOAD_JOB_PREFIX}{expression}", expression, _scheduled_reload)
+    add_job(TABLE_REFRESH_JOB, '* * * * *', _refresh_due_tables, verbose=False)
+    start_scheduler()
+    print(f"✅ Scheduled reload started. Reload times: {_scheduled_reload_times}")
+
+def _scheduled_reload():
+    """Scheduled reload job: tables without their own interval, or the whole cache"""
+    if is_cache_loading():
+        print("⏳ Cache already loading, skipping scheduled reload")
+        return
+    print("📊 Starting scheduled cache reload...")
+    if _table_intervals and _current_snapshot.tables:
+        # Tables with their own cadence are refreshed separately
+        reload_tables([t for t in TABLES.values() if t not in _table_intervals and not _lazy_unloaded(t)])
+    elif INCREMENTAL_RELOAD:
+        refresh_dataframes_incremental()
+    else:
+        load_dataframes()
+    print("✅ Scheduled cache reload completed")
+
+def _refresh_due_tables():
+    """Refresh the tables whose per-table interval has elapsed (one table-level swap)."""
+    if not _table_intervals or not _current_snapshot.tables or is_cache_loading():
+        return
+    now = datetime.now()
+    due = []
+    for table_name, minutes in _table_intervals.items():
+        if _lazy_unloaded(table_name):
+            continue
+        refreshed_at = _table_refreshed_at.get(table_name)
+        # Half a worker tick of slack so a 10-minute table is not pushed to 11 minutes
+        if refreshed_at is None or (now - refreshed_at).total_seconds() >= minutes * 60 - 30:
+            due.append(table_name)
+    if not due:
+        return
+    print(f"⏱️ Table refresh due: {', '.join(due)}")
+    try:
+        # Interval refreshes are frequent: the on-disk snapshot is rewritten by full reloads only
+        reload_tables(due, persist=False)
+    except Exception as e:
+        print(f"❌ Table refresh failed: {e}")
+
+def set_table_intervals(intervals):
+    """Set per-table refresh intervals.
+
+    Args:
+        intervals: {table: minutes}; table is an InterBase table name or a cache key,
+                   minutes <= 0 or None removes the table's interval
+    """
+    global _table_intervals
+    parsed = {}
+    for table, minutes in (intervals or {}).items():
+        table_name = TABLES.get(table, str(table).upper())
+        if table_name not in TABLES.values():
+            raise ValueError(f"Unknown table: {table}")
+        if minutes is not None and float(minutes) > 0:
+            minutes = float(minutes)
+            parsed[table_name] = int(minutes) if minutes.is_integer() else minutes
+    _table_intervals = parsed
+
+def get_table_intervals():
+    """Per-table refresh intervals in minutes"""
+    return dict(_table_intervals)
+
+def get_table_refresh_times():
+    """Last refresh time per table (ISO strings)"""
+    return {t: ts.isoformat() for t, ts in _table_refreshed_at.items()}
 
 def stop_scheduled_reload():
-    """Stop the scheduled reload background thread"""
-    global _scheduled_reload_enabled, _scheduled_reload_thread
+    """Stop scheduled reloads and table refreshes"""
+    global _scheduled_reload_enabled
     
     if not _scheduled_reload_enabled:
         print("⚠️ Scheduled reload not running")
         return
     
     _scheduled_reload_enabled = False
-    if _scheduled_reload_thread:
-        _scheduled_reload_thread.join(timeout=5)
+    remove_jobs(RELOAD_JOB_PREFIX)
+    remove_job(TABLE_REFRESH_JOB)
+    stop_scheduler()
     
     # Save config to file (with enabled=False)
     save_scheduled_reload_config()
@@ -406,5 +2068,5 @@ def is_scheduled_reload_enabled():
     return _scheduled_reload_enabled
 
 def get_scheduled_reload_times():
-    """Get list of scheduled reload times"""
-    return [t.strftime('%H:%M') for t in _scheduled_reload_times]
+    """Get list of scheduled reload times ('HH:MM' or cron expressions)"""
+    return list(_scheduled_reload_times)
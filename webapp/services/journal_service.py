@@ -0,0 +1,44 @@
+"""Request journal: one compact JSON line per report request, replayed by python -m bench replay"""
+
+import json
+import os
+import threading
+from datetime import datetime
+
+from config.database import REQUEST_JOURNAL_FILE
+
+# The file is rotated to <file>.1 beyond this size (one previous file is kept)
+JOURNAL_MAX_BYTES = 50 * 2 ** 20
+
+_file_lock = threading.Lock()
+
+
+def record_request(method, path, body, status, seconds):
+    """Append one request: {'t': time, 'm': method, 'p': path, 'b': JSON body, 's': status, 'ms': latency}"""
+    entry = {'t': datetime.now().isoformat(timespec='milliseconds'), 'm': method, 'p': path, 'b': body,
+             's': status, 'ms': round(seconds * 1000, 1)}
+    line = json.dumps(entry, separators=(',', ':'), default=str)
+    with _file_lock:
+        try:
+            if os.path.exists(REQUEST_JOURNAL_FILE) and os.path.getsize(REQUEST_JOURNAL_FILE) > JOURNAL_MAX_BYTES:
+                os.replace(REQUEST_JOURNAL_FILE, REQUEST_JOURNAL_FILE + '.1')
+            with open(REQUEST_JOURNAL_FILE, 'a') as f:
+                f.write(line + '\n')
+        except Exception as e:
+            print(f"⚠️ Could not write request journal: {e}")
+
+
+def read_journal(path=None):
+    """Journal entries, oldest first (the rotated <path>.1 included when it exists)"""
+    path = path or REQUEST_JOURNAL_FILE
+    entries = []
+    for file_path in (path + '.1', path):
+        if not os.path.exists(file_path):
+            continue
+        with open(file_path, 'r') as f:
+            for line in f:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    continue  # partial line from a crash mid-write
+    return entries
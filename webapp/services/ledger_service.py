@@ -0,0 +1,132 @@
+"""Stock from the ALLITEM ledger, computed once per cache snapshot: the (SITE, ITEM) stock summary and a
+point-in-time index (ledger clustered by (SITE, ITEM, day) with running totals)"""
+
+import numpy as np
+import pandas as pd
+
+from services.database_service import get_cache_snapshot, register_post_reload_hook, require_columns
+
+require_columns('inventory_transactions', ['SITE', 'ITEM', 'FDATE', 'DEBITQTY', 'CREDITQTY'])
+require_columns('sites', ['ID', 'SIDNO'])
+
+# Sites whose stock is the depot stock of an item
+DEPOT_SIDNO = '3700004'
+
+# Sort key = pair number in the high bits, day number (from the first ledger day) in these low bits
+_DAY_BITS = 32
+
+
+class LedgerIndex:
+    """Stock ledger sorted by (SITE, ITEM, FDATE day) with DEBITQTY / CREDITQTY running totals per pair.
+
+    A pair's totals as of a day are those of its last row on or before that day, found by binary
+    search, so stock as of any date costs one search per pair instead of a scan of the ledger.
+    Rows without FDATE count from the very start. About 24 bytes per ledger row.
+    """
+
+    def __init__(self, ledger):
+        pair_numbers = ledger.groupby(['SITE', 'ITEM']).ngroup()
+        # Rows with a missing SITE or ITEM belong to no group (like the stock summary)
+        keep = pair_numbers.notna().to_numpy()
+        pairs = pair_numbers.to_numpy()[keep].astype('int64')
+
+        days = ledger['FDATE'].to_numpy()[keep].astype('datetime64[D]').astype('int64')
+        dated = ~ledger['FDATE'].isna().to_numpy()[keep]
+        self._first_day = int(days[dated].min()) if dated.any() else 0
+        day_numbers = np.where(dated, days - self._first_day + 1, 0)
+
+        keys = (pairs << _DAY_BITS) | day_numbers
+        order = np.argsort(keys, kind='stable')
+        self._keys = keys[order]
+        sorted_pairs = pairs[order]
+        self._starts = np.flatnonzero(np.r_[True, sorted_pairs[1:] != sorted_pairs[:-1]]) if len(order) else \
+            np.empty(0, dtype='int64')
+
+        totals = pd.DataFrame({
+            'DEBITQTY': ledger['DEBITQTY'].to_numpy('float64')[keep][order],
+            'CREDITQTY': ledger['CREDITQTY'].to_numpy('float64')[keep][order],
+        }).groupby(sorted_pairs, sort=False).cumsum()
+        self._debit = totals['DEBITQTY'].to_numpy()
+        self._credit = totals['CREDITQTY'].to_numpy()
+
+        first_rows = order[self._starts]
+        self.pairs = pd.DataFrame({
+            'SITE': ledger['SITE'].to_numpy()[keep][first_rows],
+            'ITEM': ledger['ITEM'].to_numpy()[keep][first_rows],
+        })
+
+    def summary_as_of(self, as_of_date):
+        """DEBITQTY / CREDITQTY totals and transaction count per (SITE, ITEM) up to the end of as_of_date
+        (a parsed date: Timestamp, datetime or date).
+
+        Same columns and order as the stock summary of the whole ledger; pairs without a
+        transaction by then are left out.
+        """
+        day = int(pd.Timestamp(as_of_date).to_datetime64().astype('datetime64[D]').astype('int64'))
+        day_number = min(max(day - self._first_day + 1, 0), 2 ** _DAY_BITS - 1)
+        pair_numbers = np.arange(len(self._starts), dtype='int64')
+        ends = np.searchsorted(self._keys, (pair_numbers << _DAY_BITS) | day_number, side='right')
+        counts = ends - self._starts
+        found = counts > 0
+        last = ends[found] - 1
+        return pd.DataFrame({
+            'SITE': self.pairs['SITE'].to_numpy()[found],
+            'ITEM': self.pairs['ITEM'].to_numpy()[found],
+            'DEBITQTY': self._debit[last],
+            'CREDITQTY': self._credit[last],
+            'STOCK_TRANSACTIONS': counts[found],
+        })
+
+
+def summarize_ledger(ledger):
+    """DEBITQTY / CREDITQTY totals and transaction count per (SITE, ITEM), sorted by SITE, ITEM"""
+    return ledger.groupby(['SITE', 'ITEM']).agg(
+        DEBITQTY=('DEBITQTY', 'sum'),
+        CREDITQTY=('CREDITQTY', 'sum'),
+        STOCK_TRANSACTIONS=('DEBITQTY', 'size'),
+    ).reset_index()
+
+
+def add_stock_columns(summary, sites):
+    """Add CURRENT_STOCK (DEBITQTY - CREDITQTY) and DEPOT_QUANTITY (the item's stock summed over the
+    depot sites, SIDNO = DEPOT_SIDNO; 0 without depot stock) to a (SITE, ITEM) summary, in place."""
+    summary['CURRENT_STOCK'] = summary['DEBITQTY'] - summary['CREDITQTY']
+    summary['DEPOT_QUANTITY'] = 0
+    if sites is not None and 'SIDNO' in sites.columns:
+        depot = summary[summary['SITE'].isin(sites.loc[sites['SIDNO'] == DEPOT_SIDNO, 'ID'])]
+        if not depot.empty:
+            depot_qty = depot.groupby('ITEM')[['DEBITQTY', 'CREDITQTY']].sum()
+            depot_qty = depot_qty['DEBITQTY'] - depot_qty['CREDITQTY']
+            summary['DEPOT_QUANTITY'] = summary['ITEM'].map(depot_qty).fillna(0)
+    return summary
+
+
+def get_stock_summary(snapshot=None):
+    """Stock per (SITE, ITEM) of the snapshot (the pinned one by default), built once per snapshot.
+
+    Columns SITE, ITEM, DEBITQTY, CREDITQTY, STOCK_TRANSACTIONS, CURRENT_STOCK, DEPOT_QUANTITY;
+    shared by every report reading it, so treat it as read-only. None when ALLITEM is not cached.
+    """
+    snapshot = snapshot or get_cache_snapshot()
+    ledger = snapshot.tables.get('inventory_transactions')
+    if ledger is None:
+        return None
+    return snapshot.derived('stock_summary',
+                            lambda: add_stock_columns(summarize_ledger(ledger), snapshot.tables.get('sites')))
+
+
+def get_ledger_index(snapshot=None):
+    """LedgerIndex of the snapshot's ALLITEM (the pinned one by default), built on first use.
+
+    None when ALLITEM is not cached or has no FDATE column (a snapshot saved before it was loaded).
+    """
+    snapshot = snapshot or get_cache_snapshot()
+    ledger = snapshot.tables.get('inventory_transactions')
+    if ledger is None or 'FDATE' not in ledger.columns:
+        return None
+    return snapshot.derived('ledger_index', lambda: LedgerIndex(ledger))
+
+
+# Built right after each reload so the first stock report does not pay for them
+register_post_reload_hook('stock summary', get_stock_summary)
+register_post_reload_hook('ledger index', get_ledger_index)
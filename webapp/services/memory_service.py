@@ -0,0 +1,174 @@
+"""Memory accounting for cached DataFrames: deep size per table and column, slimming hints, history"""
+
+import json
+import os
+import threading
+import weakref
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from config.database import MEMORY_HISTORY_FILE
+
+# Reloads kept in the memory history (one entry per published snapshot)
+MEMORY_HISTORY_ENTRIES = 500
+
+# Object columns with at most this share of distinct values are worth storing as category
+CATEGORY_MAX_CARDINALITY_RATIO = 0.5
+
+MB = 2 ** 20
+
+# id(DataFrame) -> (weakref, value): frames are read-only once published, so one measurement each
+_bytes_memo = {}
+_profile_memo = {}
+_memo_lock = threading.Lock()
+
+_history = None  # deque, read from MEMORY_HISTORY_FILE on first use
+_history_lock = threading.Lock()
+
+
+def _memoised(memo, df, compute):
+    entry = memo.get(id(df))
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    value = compute(df)
+    with _memo_lock:
+        for frame_id in [i for i, (ref, _) in memo.items() if ref() is None]:
+            del memo[frame_id]
+        memo[id(df)] = (weakref.ref(df), value)
+    return value
+
+
+def frame_bytes(df):
+    """Deep memory footprint of a DataFrame in bytes (measured once per frame object).
+
+    Object columns count every row's Python object, so strings shared between rows
+    (interned columns) are counted once per row.
+    """
+    return _memoised(_bytes_memo, df, lambda frame: int(frame.memory_usage(index=True, deep=True).sum()))
+
+
+def _smallest_int_dtype(series):
+    low, high = series.min(), series.max()
+    for dtype in (np.int8, np.int16, np.int32):
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return np.dtype(dtype)
+    return None
+
+
+def _code_itemsize(cardinality):
+    for dtype in (np.int8, np.int16, np.int32):
+        if cardinality < np.iinfo(dtype).max:
+            return np.dtype(dtype).itemsize
+    return 8
+
+
+def _profile_column(series, nbytes):
+    """dtype, size, cardinality and the cheapest safe representation of one column"""
+    rows = len(series)
+    try:
+        cardinality = int(series.nunique(dropna=True))
+    except TypeError:
+        cardinality = None  # unhashable values
+    column = {
+        'dtype': str(series.dtype),
+        'mb': round(nbytes / MB, 3),
+        'cardinality': cardinality,
+        'nulls': int(series.isna().sum()),
+        'suggestion': None,
+        'savings_mb': 0.0,
+    }
+    if rows == 0:
+        return column
+
+    suggested_bytes = None
+    if series.dtype == object and cardinality is not None and cardinality <= rows * CATEGORY_MAX_CARDINALITY_RATIO:
+        # Category: one code per row plus each distinct value stored once
+        per_value = max(nbytes - rows * 8, 0) / rows
+        suggested_bytes = rows * _code_itemsize(cardinality) + cardinality * (per_value + 8)
+        column['suggestion'] = 'category'
+    elif pd.api.types.is_integer_dtype(series.dtype) and series.dtype.itemsize > 1:
+        smaller = _smallest_int_dtype(series)
+        if smaller is not None and smaller.itemsize < series.dtype.itemsize:
+            suggested_bytes = rows * smaller.itemsize
+            column['suggestion'] = str(smaller)
+
+    if suggested_bytes is not None and suggested_bytes < nbytes:
+        column['savings_mb'] = round((nbytes - suggested_bytes) / MB, 3)
+    else:
+        column['suggestion'] = None
+    return column
+
+
+def _profile(df):
+    column_bytes = df.memory_usage(index=False, deep=True)
+    columns = {}
+    for name in df.columns:
+        try:
+            columns[str(name)] = _profile_column(df[name], int(column_bytes[name]))
+        except Exception as e:
+            columns[str(name)] = {'dtype': str(df[name].dtype), 'mb': round(int(column_bytes[name]) / MB, 3),
+                                  'error': str(e)}
+    return {
+        'rows': int(len(df)),
+        'columns': columns,
+        'mb': round(frame_bytes(df) / MB, 3),
+        'potential_savings_mb': round(sum(c.get('savings_mb', 0.0) for c in columns.values()), 3),
+    }
+
+
+def profile_frame(df):
+    """Per-column memory profile of a DataFrame (computed once per frame object).
+
+    Returns:
+        dict: rows, mb, potential_savings_mb and columns {name: {dtype, mb, cardinality,
+              nulls, suggestion, savings_mb}}; suggestion is 'category' or a smaller int dtype
+    """
+    return _memoised(_profile_memo, df, _profile)
+
+
+def _load_history():
+    global _history
+    if _history is None:
+        _history = deque(maxlen=MEMORY_HISTORY_ENTRIES)
+        try:
+            if os.path.exists(MEMORY_HISTORY_FILE):
+                with open(MEMORY_HISTORY_FILE, 'r') as f:
+                    _history.extend(json.load(f))
+        except Exception as e:
+            print(f"⚠️ Could not read memory history ({e}), starting a new one")
+    return _history
+
+
+def record_memory_sample(sample):
+    """Append one reload's memory sample ({version, timestamp, total_mb, tables}) and persist it."""
+    with _history_lock:
+        history = _load_history()
+        history.append(sample)
+        try:
+            tmp_path = MEMORY_HISTORY_FILE + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(list(history), f)
+            os.replace(tmp_path, MEMORY_HISTORY_FILE)
+        except Exception as e:
+            print(f"⚠️ Could not write memory history: {e}")
+
+
+def get_memory_history(limit=None):
+    """Recorded samples, oldest first, plus the growth of each table over them (MB)."""
+    with _history_lock:
+        samples = list(_load_history())
+    if limit:
+        samples = samples[-limit:]
+    growth = {}
+    if samples:
+        first, last = samples[0]['tables'], samples[-1]['tables']
+        for table_name, entry in last.items():
+            if table_name in first:
+                growth[table_name] = {
+                    'mb': round(entry['mb'] - first[table_name]['mb'], 3),
+                    'rows': entry['rows'] - first[table_name]['rows'],
+                }
+    return {'samples': samples, 'growth': growth}
@@ -0,0 +1,103 @@
+"""SQL pushdown: run selective report aggregates in InterBase instead of the in-memory cache"""
+
+from datetime import timedelta
+
+import pandas as pd
+
+from config.database import PUSHDOWN_MODE, PUSHDOWN_MAX_DAYS, PUSHDOWN_ACQUIRE_TIMEOUT_SECONDS
+from services.database_service import (
+    query_dataframe, get_dataframes, get_cache_timestamp, get_known_columns
+)
+
+
+def should_push_down(data, table_keys, window_start, window_end):
+    """Decide whether a report request runs as SQL in the database or on the cached tables.
+
+    A request can ask for it explicitly with "source": "database" or "cache". Otherwise,
+    PUSHDOWN_MODE=always pushes every supported report down, off never does, and auto
+    (default) pushes down when a table the report reads is not cached (low-RAM nodes), or
+    when a narrow date window (at most PUSHDOWN_MAX_DAYS) reaches the day of the last load,
+    whose later rows the cache does not have yet. Wide scans stay in memory.
+
+    Args:
+        data: request JSON
+        table_keys: cache keys of the transaction tables the report reads
+        window_start, window_end: date range the report covers (datetime-like)
+    """
+    if PUSHDOWN_MODE == 'off':
+        return False
+    source = (data or {}).get('source')
+    if source in ('database', 'cache'):
+        return source == 'database'
+    if PUSHDOWN_MODE == 'always':
+        return True
+
+    dataframes = get_dataframes()
+    if any(dataframes.get(key) is None for key in table_keys):
+        return True
+
+    cache_timestamp = get_cache_timestamp()
+    if cache_timestamp is None or window_start is None or window_end is None:
+        return False
+    window_days = (pd.Timestamp(window_end) - pd.Timestamp(window_start)).days + 1
+    return window_days <= PUSHDOWN_MAX_DAYS and pd.Timestamp(window_end).date() >= cache_timestamp.date()
+
+
+def _param_datetime(value):
+    """Timestamp/str -> datetime for driver parameters"""
+    return pd.Timestamp(value).to_pydatetime()
+
+
+def sales_report_aggregates(sid_prefix, selected_date, first_of_month):
+    """/api/sales-report aggregates from INVOICE.
+
+    Returns:
+        tuple: (period_sales [SID, SALES, DISCOUNT] for the selected day,
+                cumulative_sales [SID, CUMULATIVE_SALES] from first_of_month to selected_date)
+    """
+    base = "FROM INVOICE WHERE FTYPE = 1 AND CAST(SID AS VARCHAR(20)) LIKE ?"
+    day_start = _param_datetime(pd.Timestamp(selected_date).normalize())
+
+    period_sales = query_dataframe(
+        f"SELECT SID, SUM(NET), SUM(OTHER) {base} AND FDATE >= ? AND FDATE < ? GROUP BY SID",
+        [f"{sid_prefix}%", day_start, day_start + timedelta(days=1)], PUSHDOWN_ACQUIRE_TIMEOUT_SECONDS,
+    )
+    period_sales.columns = ['SID', 'SALES', 'DISCOUNT']
+
+    cumulative_sales = query_dataframe(
+        f"SELECT SID, SUM(NET) {base} AND FDATE >= ? AND FDATE <= ? GROUP BY SID",
+        [f"{sid_prefix}%", _param_datetime(first_of_month), _param_datetime(selected_date)],
+        PUSHDOWN_ACQUIRE_TIMEOUT_SECONDS,
+    )
+    cumulative_sales.columns = ['SID', 'CUMULATIVE_SALES']
+
+    # SUM over only-NULL values is NULL in SQL; the cache has NULL amounts filled as 0
+    for df in (period_sales, cumulative_sales):
+        for col in df.columns[1:]:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype('float64')
+    return period_sales, cumulative_sales
+
+
+def client_item_quantities(client_sid, from_date, to_date, site_ids=None):
+    """/api/kinshasa-bureau-client-items quantities from ITEMS, grouped by ITEM and FTYPE.
+
+    Returns:
+        tuple: (DataFrame [ITEM, FTYPE, <qty_col>] for FTYPE 1 and 2, qty_col)
+    """
+    columns = get_known_columns('ITEMS')
+    qty_col = 'QTY1' if columns and 'QTY' not in columns and 'QTY1' in columns else 'QTY'
+
+    query = (
+        f"SELECT ITEM, FTYPE, SUM({qty_col}) FROM ITEMS "
+        "WHERE CAST(SID AS VARCHAR(20)) = ? AND FDATE >= ? AND FDATE <= ? AND FTYPE IN (1, 2)"
+    )
+    params = [str(client_sid), _param_datetime(from_date), _param_datetime(to_date)]
+    if site_ids:
+        query += f" AND CAST(SITE AS VARCHAR(20)) IN ({', '.join('?' for _ in site_ids)})"
+        params.extend(str(site_id) for site_id in site_ids)
+    query += " GROUP BY ITEM, FTYPE"
+
+    sales_by_item = query_dataframe(query, params, PUSHDOWN_ACQUIRE_TIMEOUT_SECONDS)
+    sales_by_item.columns = ['ITEM', 'FTYPE', qty_col]
+    sales_by_item[qty_col] = pd.to_numeric(sales_by_item[qty_col], errors='coerce').fillna(0).astype('float64')
+    return sales_by_item, qty_col
@@ -0,0 +1,260 @@
+"""Cron-style job scheduler: sleeps until the next fire time and records every run"""
+
+import threading
+import time as time_module
+from collections import deque
+from datetime import datetime, timedelta
+
+# Five fields: minute hour day-of-month month day-of-week (0 or 7 = Sunday)
+_FIELDS = (
+    ('minute', 0, 59, None),
+    ('hour', 0, 23, None),
+    ('day', 1, 31, None),
+    ('month', 1, 12, {name: i + 1 for i, name in enumerate(
+        ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec'))}),
+    ('weekday', 0, 7, {name: i for i, name in enumerate(('sun', 'mon', 'tue', 'wed', 'thu', 'fri', 'sat'))}),
+)
+
+_MACROS = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@midnight': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+}
+
+# Longest sleep between checks, so a wall-clock change (DST, NTP step) is noticed
+MAX_SLEEP_SECONDS = 300
+
+# Runs kept per job for the status API
+RUN_HISTORY = 20
+
+
+def _parse_value(token, names):
+    token = token.strip().lower()
+    if names and token in names:
+        return names[token]
+    return int(token)
+
+
+def _parse_field(text, name, low, high, names):
+    """'*', '5', '1-5', '*/15', '10-40/10', 'mon-fri' and comma lists -> sorted values"""
+    values = set()
+    for part in text.split(','):
+        step = 1
+        if '/' in part:
+            part, step_text = part.split('/', 1)
+            step = int(step_text)
+            if step < 1:
+                raise ValueError(f"Invalid step in {name} field: {text}")
+        if part == '*':
+            start, end = low, high
+        elif '-' in part:
+            start_text, end_text = part.split('-', 1)
+            start, end = _parse_value(start_text, names), _parse_value(end_text, names)
+        else:
+            start = _parse_value(part, names)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"Value out of range in {name} field: {text}")
+        values.update(range(start, end + 1, step))
+    return sorted(values)
+
+
+class CronExpression:
+    """Parsed cron expression ('m h dom mon dow', @daily-style macros, or 'HH:MM' for daily)."""
+
+    def __init__(self, expression):
+        self.expression = expression.strip()
+        text = _MACROS.get(self.expression.lower(), self.expression)
+        if ':' in text and ' ' not in text:
+            hour, minute = map(int, text.split(':'))
+            text = f"{minute} {hour} * * *"
+        fields = text.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields (minute hour day month weekday): {expression}")
+
+        parsed = [_parse_field(field, *spec) for field, spec in zip(fields, _FIELDS)]
+        self.minutes, self.hours, self.days, self.months, weekdays = parsed
+        self.weekdays = {0 if d == 7 else d for d in weekdays}
+        # Classic cron: when both day fields are restricted, either one matching is enough.
+        # A field starting with '*' (also '*/2') counts as unrestricted, as in Vixie cron.
+        self._day_restricted = not fields[2].startswith('*')
+        self._weekday_restricted = not fields[4].startswith('*')
+
+    def __repr__(self):
+        return f"CronExpression({self.expression!r})"
+
+    def _day_matches(self, day):
+        if day.month not in self.months:
+            return False
+        in_days = day.day in self.days
+        in_weekdays = (day.weekday() + 1) % 7 in self.weekdays
+        if self._day_restricted and self._weekday_restricted:
+            return in_days or in_weekdays
+        return in_days and in_weekdays
+
+    def next_after(self, after):
+        """First fire time strictly after `after` (datetime, minute resolution)"""
+        start = after.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        day = start.date()
+        # Eight years covers the sparsest valid expression (29 February on a given weekday)
+        for _ in range(366 * 8):
+            if self._day_matches(day):
+                for hour in self.hours:
+                    for minute in self.minutes:
+                        candidate = datetime(day.year, day.month, day.day, hour, minute)
+                        if candidate >= start:
+                            return candidate
+            day += timedelta(days=1)
+        raise ValueError(f"Cron expression never fires: {self.expression}")
+
+
+class ScheduledJob:
+    """A callable on a cron schedule, with its next fire time and recent runs."""
+
+    def __init__(self, name, schedule, func, verbose=True):
+        self.name = name
+        self.verbose = verbose
+        self.schedule = schedule if isinstance(schedule, CronExpression) else CronExpression(schedule)
+        self.func = func
+        self.next_run = self.schedule.next_after(datetime.now())
+        self.running = False
+        self.history = deque(maxlen=RUN_HISTORY)
+
+    def status(self):
+        last = self.history[-1] if self.history else None
+        return {
+            'name': self.name,
+            'schedule': self.schedule.expression,
+            'next_run': self.next_run.isoformat(),
+            'running': self.running,
+            'last_run': last['started'] if last else None,
+            'last_duration_seconds': last['duration_seconds'] if last else None,
+            'last_status': last['status'] if last else None,
+            'last_error': last.get('error') if last else None,
+            'history': list(self.history),
+        }
+
+
+_jobs = {}
+_jobs_lock = threading.Lock()
+_wake = threading.Event()
+_worker_thread = None
+_stop_event = None  # set to stop the current worker thread
+
+
+def add_job(name, schedule, func, verbose=True):
+    """Register (or replace) a job.
+
+    Args:
+        name: unique job name
+        schedule: cron expression string or CronExpression
+        func: callable without arguments
+        verbose: log start and end of every run (off for frequent polling jobs)
+    """
+    job = ScheduledJob(name, schedule, func, verbose)
+    with _jobs_lock:
+        previous = _jobs.get(name)
+        if previous is not None:
+            job.history = previous.history
+        _jobs[name] = job
+    _wake.set()
+    return job
+
+
+def remove_job(name):
+    with _jobs_lock:
+        _jobs.pop(name, None)
+    _wake.set()
+
+
+def remove_jobs(prefix):
+    """Remove every job whose name starts with prefix"""
+    with _jobs_lock:
+        for name in [n for n in _jobs if n.startswith(prefix)]:
+            del _jobs[name]
+    _wake.set()
+
+
+def _run_job(job, scheduled_for):
+    started = datetime.now()
+    lateness = (started - scheduled_for).total_seconds()
+    if job.verbose:
+        print(f"🕐 Running scheduled job '{job.name}' (scheduled {scheduled_for.strftime('%H:%M')}, "
+              f"{lateness:.0f}s late)")
+    job.running = True
+    run = {'scheduled_for': scheduled_for.isoformat(), 'started': started.isoformat()}
+    clock = time_module.perf_counter()
+    try:
+        job.func()
+        run['status'] = 'ok'
+    except Exception as e:
+        run['status'] = 'error'
+        run['error'] = str(e)
+        print(f"❌ Scheduled job '{job.name}' failed: {e}")
+    finally:
+        job.running = False
+    run['duration_seconds'] = round(time_module.perf_counter() - clock, 3)
+    job.history.append(run)
+    if job.verbose and run['status'] == 'ok':
+        print(f"✅ Scheduled job '{job.name}' finished in {run['duration_seconds']:.1f}s")
+
+
+def _scheduler_worker(stop):
+    print("🕐 Scheduler started")
+    while not stop.is_set():
+        now = datetime.now()
+        due = []
+        with _jobs_lock:
+            for job in sorted(_jobs.values(), key=lambda j: j.next_run):
+                if job.next_run <= now:
+                    due.append((job, job.next_run))
+                    # Slots missed while a long job ran (or the host slept) are coalesced into this run
+                    job.next_run = job.schedule.next_after(now)
+
+        for job, scheduled_for in due:
+            if stop.is_set():
+                break
+            _run_job(job, scheduled_for)
+
+        with _jobs_lock:
+            upcoming = min((job.next_run for job in _jobs.values()), default=None)
+        delay = MAX_SLEEP_SECONDS if upcoming is None else (upcoming - datetime.now()).total_seconds()
+        _wake.wait(min(max(delay, 0), MAX_SLEEP_SECONDS))
+        _wake.clear()
+    print("🛑 Scheduler stopped")
+
+
+def start_scheduler():
+    """Start the scheduler thread (no-op when running)"""
+    global _worker_thread, _stop_event
+    if _stop_event is not None:
+        return
+    _stop_event = threading.Event()
+    _worker_thread = threading.Thread(target=_scheduler_worker, args=(_stop_event,), daemon=True,
+                                      name='scheduler')
+    _worker_thread.start()
+
+
+def stop_scheduler(timeout=5):
+    """Stop the scheduler thread; a job in progress finishes in the background"""
+    global _stop_event
+    if _stop_event is None:
+        return
+    _stop_event.set()
+    _stop_event = None
+    _wake.set()
+    if _worker_thread:
+        _worker_thread.join(timeout=timeout)
+
+
+def is_scheduler_running():
+    return _stop_event is not None
+
+
+def get_jobs():
+    """Status of every job: schedule, next run, last run duration/outcome and recent history"""
+    with _jobs_lock:
+        jobs = list(_jobs.values())
+    return [job.status() for job in sorted(jobs, key=lambda j: j.next_run)]
@@ -0,0 +1,137 @@
+"""On-disk snapshot of the dataframe cache (warm start after a restart)"""
+
+import json
+import os
+import shutil
+import threading
+import time as time_module
+from datetime import datetime
+
+import pandas as pd
+
+from config.database import SNAPSHOT_DIR
+
+# Parquet (columnar, compressed) when pyarrow is installed, compressed pickle otherwise
+try:
+    import pyarrow  # noqa: F401
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+SNAPSHOT_FORMAT_VERSION = 1
+MANIFEST_FILE = 'manifest.json'
+
+_snapshot_lock = threading.Lock()
+
+
+def _write_table(df, folder, key):
+    """Write one table, Parquet first; returns (file name, format)."""
+    if PYARROW_AVAILABLE:
+        file_name = f"{key}.parquet"
+        path = os.path.join(folder, file_name)
+        try:
+            df.to_parquet(path, engine='pyarrow', compression='zstd', index=False)
+            return file_name, 'parquet'
+        except Exception as e:
+            # Mixed-type object columns (e.g. Decimal next to str) cannot be written as Parquet
+            if os.path.exists(path):
+                os.remove(path)
+            print(f"⚠️ Snapshot: {key} not Parquet-compatible ({e}) — using pickle")
+    file_name = f"{key}.pkl.gz"
+    df.to_pickle(os.path.join(folder, file_name), compression='gzip')
+    return file_name, 'pickle'
+
+
+def _read_table(folder, entry):
+    path = os.path.join(folder, entry['file'])
+    if entry['format'] == 'parquet':
+        return pd.read_parquet(path, engine='pyarrow')
+    return pd.read_pickle(path, compression='gzip')
+
+
+def _read_manifest():
+    path = os.path.join(SNAPSHOT_DIR, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r') as f:
+        manifest = json.load(f)
+    if manifest.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+        print(f"⚠️ Snapshot format {manifest.get('format_version')} not supported, ignoring")
+        return None
+    return manifest
+
+
+def save_snapshot(tables, metadata=None):
+    """Write {cache_key: DataFrame} to SNAPSHOT_DIR.
+
+    Tables go into a fresh sub-directory; manifest.json is replaced atomically only once every
+    file is written, so a crash mid-write leaves the previous snapshot intact.
+
+    Returns:
+        bool: True if the snapshot was written
+    """
+    with _snapshot_lock:
+        started = time_module.time()
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        folder_name = f"snapshot-{stamp}"
+        folder = os.path.join(SNAPSHOT_DIR, folder_name)
+        try:
+            os.makedirs(folder, exist_ok=True)
+            entries = {}
+            for key, df in tables.items():
+                file_name, fmt = _write_table(df, folder, key)
+                entries[key] = {'file': file_name, 'format': fmt, 'rows': int(len(df))}
+
+            manifest = {
+                'format_version': SNAPSHOT_FORMAT_VERSION,
+                'created': datetime.now().isoformat(),
+                'folder': folder_name,
+                'tables': entries,
+                'metadata': metadata or {},
+            }
+            manifest_path = os.path.join(SNAPSHOT_DIR, MANIFEST_FILE)
+            tmp_path = manifest_path + '.tmp'
+            with open(tmp_path, 'w') as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_path, manifest_path)
+        except Exception as e:
+            print(f"❌ Failed to write cache snapshot: {e}")
+            shutil.rmtree(folder, ignore_errors=True)
+            return False
+
+        # Drop older snapshot folders now that the manifest points at the new one
+        for name in os.listdir(SNAPSHOT_DIR):
+            if name.startswith('snapshot-') and name != folder_name:
+                shutil.rmtree(os.path.join(SNAPSHOT_DIR, name), ignore_errors=True)
+
+        print(f"💾 Cache snapshot written to {folder} in {time_module.time() - started:.1f}s")
+        return True
+
+
+def load_snapshot():
+    """Read the latest snapshot.
+
+    Returns:
+        tuple: ({cache_key: DataFrame}, manifest) or (None, None) if there is no usable snapshot
+    """
+    with _snapshot_lock:
+        try:
+            manifest = _read_manifest()
+            if manifest is None:
+                return None, None
+            folder = os.path.join(SNAPSHOT_DIR, manifest['folder'])
+            started = time_module.time()
+            tables = {key: _read_table(folder, entry) for key, entry in manifest['tables'].items()}
+            print(f"💾 Cache snapshot from {manifest['created']} read in {time_module.time() - started:.1f}s")
+            return tables, manifest
+        except Exception as e:
+            print(f"⚠️ Failed to read cache snapshot: {e}")
+            return None, None
+
+
+def get_snapshot_info():
+    """Manifest of the latest snapshot without the table data, or None"""
+    try:
+        return _read_manifest()
+    except Exception:
+        return None
@@ -0,0 +1,134 @@
+"""Loader telemetry: one JSON line per table load (phase timings, rows, bytes, backend)"""
+
+import json
+import os
+import threading
+from collections import defaultdict, deque
+from datetime import datetime, timedelta
+from statistics import median
+
+from config.database import LOAD_TELEMETRY_FILE
+
+# The file is rotated to <file>.1 beyond this size (one previous file is kept)
+TELEMETRY_MAX_BYTES = 20 * 2 ** 20
+
+# Records kept in memory for the API (older ones are read from the file on demand)
+RECENT_RECORDS = 500
+
+# Loads compared by the trend: the latest TREND_WINDOW against the ones before them
+TREND_WINDOW = 5
+
+PHASES = ('connect_seconds', 'query_seconds', 'fetch_seconds', 'frame_seconds', 'bytes_seconds')
+
+_recent = deque(maxlen=RECENT_RECORDS)
+_file_lock = threading.Lock()
+
+
+def record_table_load(record):
+    """Append one table load ({'table', 'backend', 'status', phase seconds, 'rows', ...})."""
+    record = {'timestamp': datetime.now().isoformat(timespec='seconds'), **record}
+    _recent.append(record)
+    with _file_lock:
+        try:
+            if os.path.exists(LOAD_TELEMETRY_FILE) and os.path.getsize(LOAD_TELEMETRY_FILE) > TELEMETRY_MAX_BYTES:
+                os.replace(LOAD_TELEMETRY_FILE, LOAD_TELEMETRY_FILE + '.1')
+            with open(LOAD_TELEMETRY_FILE, 'a') as f:
+                f.write(json.dumps(record, default=str) + '\n')
+        except Exception as e:
+            print(f"⚠️ Could not write load telemetry: {e}")
+
+
+def _read_records(since):
+    """Records newer than since, oldest first (rotated file included)"""
+    records = []
+    with _file_lock:
+        for path in (LOAD_TELEMETRY_FILE + '.1', LOAD_TELEMETRY_FILE):
+            if not os.path.exists(path):
+                continue
+            with open(path, 'r') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # partial line from a crash mid-write
+                    if record.get('timestamp', '') >= since:
+                        records.append(record)
+    return records
+
+
+def _summarize_table(records):
+    ok = [r for r in records if r.get('status') == 'ok']
+    rates = [r['rows_per_sec'] for r in ok if r.get('rows_per_sec')]
+    summary = {
+        'loads': len(records),
+        'failures': len(records) - len(ok),
+        'last': records[-1],
+        'median_total_seconds': round(median(r['total_seconds'] for r in ok), 3) if ok else None,
+        'median_rows_per_sec': round(median(rates)) if rates else None,
+        'median_phases': {
+            phase: round(median(r.get(phase) or 0 for r in ok), 3) for phase in PHASES
+        } if ok else None,
+        'backends': sorted({r.get('backend') for r in records if r.get('backend')}),
+        'trend_pct': None,
+    }
+    # Full loads only: a delta fetches a handful of rows at a very different rate
+    full_rates = [r['rows_per_sec'] for r in ok if r.get('rows_per_sec') and not r.get('delta')]
+    if len(full_rates) > TREND_WINDOW:
+        before = median(full_rates[:-TREND_WINDOW])
+        latest = median(full_rates[-TREND_WINDOW:])
+        if before:
+            summary['trend_pct'] = round((latest - before) / before * 100, 1)
+    return summary
+
+
+def _summarize_loads(records):
+    """Per load run: duration of each table and the table that dominated it"""
+    runs = defaultdict(list)
+    for record in records:
+        if record.get('load_id'):
+            runs[record['load_id']].append(record)
+    loads = []
+    for load_id, run in runs.items():
+        tables = {r['table']: r.get('total_seconds') or 0 for r in run}
+        slowest = max(tables, key=tables.get)
+        loads.append({
+            'load_id': load_id,
+            'started': run[0]['timestamp'],
+            'tables': len(tables),
+            'table_seconds': round(sum(tables.values()), 3),
+            'slowest_table': slowest,
+            'slowest_share_pct': round(tables[slowest] / sum(tables.values()) * 100, 1) if sum(tables.values()) else None,
+            'rows': sum(r.get('rows') or 0 for r in run),
+            'failures': sum(1 for r in run if r.get('status') != 'ok'),
+        })
+    return loads
+
+
+def get_load_telemetry(table_name=None, days=30, limit=200):
+    """Recorded table loads of the last `days` days, summarised per table and per load run.
+
+    Returns:
+        dict: tables {name: loads, failures, medians (seconds, rows/sec, phases), backends,
+              trend_pct of rows/sec (latest loads vs earlier ones), last record},
+              loads (most recent first) and the newest `limit` raw records
+    """
+    since = (datetime.now() - timedelta(days=days)).isoformat(timespec='seconds')
+    try:
+        records = _read_records(since)
+    except Exception as e:
+        print(f"⚠️ Could not read load telemetry ({e}), using recent records only")
+        records = [r for r in _recent if r['timestamp'] >= since]
+    if table_name:
+        records = [r for r in records if r.get('table') == table_name]
+
+    by_table = defaultdict(list)
+    for record in records:
+        by_table[record['table']].append(record)
+    loads = _summarize_loads(records)
+    loads.sort(key=lambda run: run['started'], reverse=True)
+    return {
+        'since': since,
+        'tables': {name: _summarize_table(table_records) for name, table_records in sorted(by_table.items())},
+        'loads': loads[:limit],
+        'records': records[-limit:] if limit else records,
+    }
@@ -0,0 +1,24 @@
+"""Tests run against a small synthetic stand-in database (bench.synthetic), never InterBase.
+
+Configuration is read from the environment when config.database is imported, so the stand-in
+backend and throwaway side-effect files are set up here, before any test module imports the app.
+"""
+
+import os
+import sys
+import tempfile
+
+WEBAPP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, WEBAPP_DIR)
+
+_work_dir = tempfile.mkdtemp(prefix='dustreports-tests-')
+os.environ.update({
+    'DB_BACKEND': 'sqlite',
+    'SQLITE_DATABASE': os.path.join(_work_dir, 'standin.db'),
+    'CACHE_SNAPSHOT': '0',
+    'CHANGE_DETECTION': '0',
+    'EAGER_TABLES': '*',
+    'LOAD_TELEMETRY_FILE': os.path.join(_work_dir, 'load_telemetry.jsonl'),
+    'MEMORY_HISTORY_FILE': os.path.join(_work_dir, 'cache_memory_history.json'),
+    'REQUEST_JOURNAL': '0',
+})
@@ -0,0 +1,84 @@
+"""CronExpression parsing and next_after"""
+
+from datetime import datetime
+
+import pytest
+
+from services.scheduler_service import CronExpression
+
+
+def _next(expression, after):
+    return CronExpression(expression).next_after(after)
+
+
+def test_macros_and_daily_time():
+    after = datetime(2025, 6, 30, 10, 15)
+    assert _next('@hourly', after) == datetime(2025, 6, 30, 11, 0)
+    assert _next('@daily', after) == datetime(2025, 7, 1, 0, 0)
+    assert _next('@midnight', after) == datetime(2025, 7, 1, 0, 0)
+    assert _next('@weekly', after) == datetime(2025, 7, 6, 0, 0)  # next Sunday
+    assert _next('@monthly', after) == datetime(2025, 7, 1, 0, 0)
+    assert _next('06:30', after) == datetime(2025, 7, 1, 6, 30)
+    assert _next('10:30', after) == datetime(2025, 6, 30, 10, 30)
+
+
+def test_next_after_is_strictly_later():
+    assert _next('15 10 * * *', datetime(2025, 6, 30, 10, 15)) == datetime(2025, 7, 1, 10, 15)
+    assert _next('15 10 * * *', datetime(2025, 6, 30, 10, 14, 59)) == datetime(2025, 6, 30, 10, 15)
+
+
+def test_steps_ranges_lists_and_names():
+    cron = CronExpression('*/15 8-17/3 * jan,jul mon-fri')
+    assert cron.minutes == [0, 15, 30, 45]
+    assert cron.hours == [8, 11, 14, 17]
+    assert cron.months == [1, 7]
+    assert cron.weekdays == {1, 2, 3, 4, 5}
+    assert CronExpression('5/20 * * * *').minutes == [5, 25, 45]
+    assert CronExpression('0 0 * * 7').weekdays == {0}
+    # Saturday 5 July 2025 -> Monday 7 July, 08:00
+    assert cron.next_after(datetime(2025, 7, 5, 12, 0)) == datetime(2025, 7, 7, 8, 0)
+
+
+def test_day_of_month_or_day_of_week():
+    # Both restricted: the 1st of the month or any Monday
+    assert _next('0 3 1 * mon', datetime(2025, 6, 25)) == datetime(2025, 6, 30, 3, 0)
+    assert _next('0 3 1 * mon', datetime(2025, 6, 30, 4)) == datetime(2025, 7, 1, 3, 0)
+    # Only one restricted: that one alone decides
+    assert _next('0 3 * * mon', datetime(2025, 7, 1)) == datetime(2025, 7, 7, 3, 0)
+    assert _next('0 3 15 * *', datetime(2025, 7, 1)) == datetime(2025, 7, 15, 3, 0)
+
+
+def test_star_step_day_field_is_unrestricted():
+    # Odd days that are Mondays (not odd days or Mondays): 2025-06-30 is an even Monday,
+    # 2025-07-01 an odd Tuesday, 2025-07-07 the next odd Monday
+    assert _next('0 3 */2 * mon', datetime(2025, 6, 29, 4)) == datetime(2025, 7, 7, 3, 0)
+    # The 1st when it falls on every other weekday from Sunday (sun, tue, thu, sat)
+    assert _next('0 3 1 * */2', datetime(2025, 7, 2)) == datetime(2025, 11, 1, 3, 0)
+
+
+def test_29_february():
+    assert _next('0 0 29 2 *', datetime(2025, 3, 1)) == datetime(2028, 2, 29, 0, 0)
+    # 29 February that is also a Monday (either day field restricted -> OR): first Monday wins
+    assert _next('0 0 29 feb mon', datetime(2025, 2, 1)) == datetime(2025, 2, 3, 0, 0)
+
+
+@pytest.mark.parametrize('expression', [
+    '60 * * * *', '* 24 * * *', '* * 0 * *', '* * 32 * *', '* * * 13 *', '* * * * 8',
+    '5-1 * * * *', '25:00', '* * * foo *',
+])
+def test_out_of_range_values(expression):
+    with pytest.raises(ValueError):
+        CronExpression(expression)
+
+
+@pytest.mark.parametrize('expression', ['*/0 * * * *', '1-5/0 * * * *', '* * * * mon-fri/0'])
+def test_zero_step(expression):
+    with pytest.raises(ValueError, match='Invalid step'):
+        CronExpression(expression)
+
+
+def test_field_count_and_never_firing():
+    with pytest.raises(ValueError, match='5 fields'):
+        CronExpression('0 0 * *')
+    with pytest.raises(ValueError, match='never fires'):
+        _next('0 0 30 2 *', datetime(2025, 1, 1))
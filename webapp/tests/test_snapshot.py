@@ -0,0 +1,54 @@
+"""Warm start from a snapshot written before a report declared new columns"""
+
+import threading
+from datetime import date
+
+END_DATE = date(2025, 6, 30)
+
+
+def test_restore_reloads_tables_with_new_columns(tmp_path, monkeypatch):
+    import app  # noqa: F401  (registers every report's required columns before the load)
+    from bench.runner import wait_for_hooks
+    from bench.synthetic import ensure_database
+    from config.database import SQLITE_DATABASE
+    from services import database_service as ds
+    from services import snapshot_service
+
+    ensure_database(SQLITE_DATABASE, 20_000, seed=7, end_date=END_DATE)
+    monkeypatch.setattr(snapshot_service, 'SNAPSHOT_DIR', str(tmp_path))
+    monkeypatch.setattr(ds, 'CACHE_SNAPSHOT', True)
+    monkeypatch.setattr(ds, 'CHANGE_DETECTION', True)
+    written = threading.Event()
+
+    def save_snapshot(tables, metadata):
+        snapshot_service.save_snapshot(tables, metadata)
+        written.set()
+    monkeypatch.setattr(ds, 'save_snapshot', save_snapshot)
+    for name in ('_fingerprints', '_watermarks', '_table_refreshed_at', '_table_full_loaded_at'):
+        monkeypatch.setattr(ds, name, {})
+    monkeypatch.setattr(ds, '_required_columns', {t: set(c) for t, c in ds._required_columns.items()})
+
+    # First process: load and write the snapshot
+    ds.load_dataframes(force=True)
+    assert written.wait(60)
+    assert 'CITY' not in ds.get_dataframes()['accounts'].columns
+
+    # Second process: a report now reads SUB.CITY and INVOICE.SALESMAN
+    for name in ('_fingerprints', '_watermarks', '_table_refreshed_at', '_table_full_loaded_at'):
+        monkeypatch.setattr(ds, name, {})
+    ds.require_columns('accounts', ['CITY'])
+    ds.require_columns('invoice_headers', ['SALESMAN'])
+    assert ds.restore_snapshot()
+    restored = ds.get_dataframes()
+    assert 'accounts' not in restored and 'invoice_headers' not in restored
+    assert 'SUB' not in ds._fingerprints and 'INVOICE' not in ds._watermarks
+    assert 'sales_details' in restored and 'ITEMS' in ds._fingerprints
+
+    ds.refresh_dataframes_incremental()
+    tables = ds.get_dataframes()
+    assert 'CITY' in tables['accounts'].columns
+    assert 'SALESMAN' in tables['invoice_headers'].columns
+    assert tables['invoice_headers']['SALESMAN'].notna().all()
+    assert 'SUB' not in ds._last_skipped_tables and 'INVOICE' not in ds._last_skipped_tables
+    wait_for_hooks()
+